@@ -1,5 +1,15 @@
 """Audio lab exports."""
 
-from . import lab
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
 
 __all__ = ["lab"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved lazily so presets and generators import without the menu layer.
+    if name == "lab":
+        return import_module(f"{__name__}.lab")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
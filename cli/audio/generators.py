@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
 import math
+import os
+import shutil
+import sys
+import threading
 import wave
+from array import array
 from io import BytesIO
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
+
+from ..profiling import count, traced
 
 SAMPLE_RATE = 44100
+CACHE_DIRECTORY = "cache"
+CACHE_LIMIT_BYTES = 384 * 1024 * 1024  # holds every default preset; least recently used go first
 
 try:  # optional playback
     import simpleaudio  # type: ignore
@@ -16,17 +26,99 @@ except Exception:  # pragma: no cover - optional dependency
     simpleaudio = None  # type: ignore
 
 
-def _render_waveform(frequencies: Tuple[float, ...], duration: float, volume: float) -> bytes:
+class RenderCancelled(Exception):
+    """Raised when a render is abandoned through its cancel event."""
+
+
+@traced("_render_waveform")
+def _render_waveform(
+    frequencies: Tuple[float, ...], duration: float, volume: float, *, cancel: Optional[threading.Event] = None
+) -> bytes:
     total_samples = int(SAMPLE_RATE * duration)
-    frames = bytearray()
+    samples = array("h")
+    append = samples.append
+    steps = [2.0 * math.pi * frequency / SAMPLE_RATE for frequency in frequencies]
+    count = max(1, len(frequencies))
+    sin = math.sin
     for index in range(total_samples):
-        sample_time = index / SAMPLE_RATE
-        values = [math.sin(2.0 * math.pi * frequency * sample_time) for frequency in frequencies]
-        value = sum(values) / max(1, len(values))
-        amplitude = int(volume * 32767 * value)
-        for _ in frequencies:
-            frames.extend(int(amplitude).to_bytes(2, byteorder="little", signed=True))
-    return bytes(frames)
+        if cancel is not None and not index % SAMPLE_RATE and cancel.is_set():
+            raise RenderCancelled()
+        amplitude = int(volume * 32767 * (sum(sin(step * index) for step in steps) / count))
+        for _ in steps:
+            append(amplitude)
+    if sys.byteorder == "big":
+        samples.byteswap()  # WAV samples are little-endian
+    return samples.tobytes()
+
+
+def cache_directory() -> Path:
+    directory = ensure_output_directory() / CACHE_DIRECTORY
+    directory.mkdir(exist_ok=True)
+    return directory
+
+
+def _cache_path(frequencies: Tuple[float, ...], duration: float, volume: float) -> Path:
+    key = hashlib.sha1(repr((SAMPLE_RATE, tuple(frequencies), duration, volume)).encode("utf-8")).hexdigest()[:20]
+    return cache_directory() / f"{key}.wav"
+
+
+def cached_tone(frequencies: Tuple[float, ...], duration: float, volume: float) -> Optional[Path]:
+    """The cached WAV file for the tone, if one was rendered; marks it recently used."""
+    path = _cache_path(frequencies, duration, volume)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        count("audio.cache_misses")
+        return None
+    count("audio.cache_hits")
+    return path
+
+
+def evict_tone_cache(limit: int = CACHE_LIMIT_BYTES) -> None:
+    """Delete least recently used cached tones until the cache fits in ``limit`` bytes."""
+    entries = []
+    for path in cache_directory().glob("*.wav"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def render_tone_file(
+    frequencies: Tuple[float, ...], duration: float, volume: float, *, cancel: Optional[threading.Event] = None
+) -> Path:
+    """Return the cached WAV file for the tone, rendering it into the cache on first use.
+
+    Only the default presets are cached this way; other tones are rendered
+    straight to their destination.
+    """
+    path = cached_tone(frequencies, duration, volume)
+    if path is not None:
+        return path
+    path = _cache_path(frequencies, duration, volume)
+    frames = _render_waveform(frequencies, duration, volume, cancel=cancel)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+    _write_wave(frames, len(frequencies), tmp)
+    os.replace(tmp, path)
+    evict_tone_cache()
+    return path
+
+
+def _tone(frequencies: Tuple[float, ...], duration: float, volume: float, path: Path | None) -> Path | BytesIO:
+    cached = cached_tone(frequencies, duration, volume)
+    if cached is None:
+        return _write_wave(_render_waveform(frequencies, duration, volume), len(frequencies), path)
+    if path is None:
+        return BytesIO(cached.read_bytes())
+    shutil.copyfile(cached, path)
+    return path
 
 
 def _write_wave(frames: bytes, channels: int, path: Path | None = None) -> Path | BytesIO:
@@ -48,16 +140,16 @@ def _write_wave(frames: bytes, channels: int, path: Path | None = None) -> Path
     return path
 
 
+def binaural_pair(carrier: float, beat: float) -> Tuple[float, float]:
+    return carrier - beat / 2, carrier + beat / 2
+
+
 def generate_single_tone(frequency: float, duration: float, *, volume: float = 0.4, path: Path | None = None) -> Path | BytesIO:
-    frames = _render_waveform((frequency,), duration, volume)
-    return _write_wave(frames, 1, path)
+    return _tone((frequency,), duration, volume, path)
 
 
 def generate_binaural_tone(carrier: float, beat: float, duration: float, *, volume: float = 0.4, path: Path | None = None) -> Path | BytesIO:
-    left = carrier - beat / 2
-    right = carrier + beat / 2
-    frames = _render_waveform((left, right), duration, volume)
-    return _write_wave(frames, 2, path)
+    return _tone(binaural_pair(carrier, beat), duration, volume, path)
 
 
 def play_audio(buffer: Path | BytesIO) -> None:
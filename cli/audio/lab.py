@@ -2,19 +2,36 @@
 
 from __future__ import annotations
 
+import threading
 import time
 from datetime import datetime
+from pathlib import Path
+from typing import Optional
 
-from ..menu import Menu, MenuItem
+from ..menu import Menu, MenuItem, SelectionHandler
 from ..utils.text import format_table
 from .generators import (
+    binaural_pair,
     ensure_output_directory,
     generate_binaural_tone,
     generate_single_tone,
     play_audio,
+    render_tone_file,
 )
 from .presets import FrequencyPreset, iter_presets
 
+DEFAULT_VOLUME = 0.4
+
+
+def default_duration(preset: FrequencyPreset) -> float:
+    return 300.0 if preset.beat_hz else 120.0
+
+
+def prerender_preset(preset: FrequencyPreset, *, cancel: Optional[threading.Event] = None) -> Path:
+    """Render the preset at its default duration and volume into the tone cache."""
+    frequencies = binaural_pair(preset.carrier_hz, preset.beat_hz) if preset.beat_hz else (preset.carrier_hz,)
+    return render_tone_file(frequencies, default_duration(preset), DEFAULT_VOLUME, cancel=cancel)
+
 
 def _list_presets() -> None:
     rows = [
@@ -71,10 +88,18 @@ def _render_visual(frequency: float, duration: float = 5.0) -> None:
 
 def _play_preset() -> None:
     preset = _select_preset()
-    if preset is None:
-        return
-    duration = _prompt_float("Duration (seconds)", 300.0 if preset.beat_hz else 120.0)
-    volume = _prompt_float("Volume (0.0 – 1.0)", 0.4)
+    if preset is not None:
+        _play(preset)
+
+
+def play_preset(name: str) -> None:
+    """Play the preset called ``name``, prompting for duration and volume."""
+    _play(next(preset for preset in iter_presets() if preset.name == name))
+
+
+def _play(preset: FrequencyPreset) -> None:
+    duration = _prompt_float("Duration (seconds)", default_duration(preset))
+    volume = _prompt_float("Volume (0.0 – 1.0)", DEFAULT_VOLUME)
     output_dir = ensure_output_directory()
     filename = f"{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}-{preset.name.replace(' ', '-').lower()}.wav"
     path = output_dir / filename
@@ -90,7 +115,7 @@ def _custom_tone() -> None:
     frequency = _prompt_float("Carrier frequency (Hz)", 220.0)
     beat = _prompt_float("Binaural beat (Hz, 0 for single tone)", 0.0)
     duration = _prompt_float("Duration (seconds)", 180.0)
-    volume = _prompt_float("Volume (0.0 – 1.0)", 0.4)
+    volume = _prompt_float("Volume (0.0 – 1.0)", DEFAULT_VOLUME)
     output_dir = ensure_output_directory()
     filename = f"custom-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.wav"
     path = output_dir / filename
@@ -102,12 +127,18 @@ def _custom_tone() -> None:
     play_audio(buffer)
 
 
-def run() -> None:
-    actions = [
-        MenuItem("List frequency presets", _list_presets),
-        MenuItem("Play preset", _play_preset),
-        MenuItem("Design custom tone", _custom_tone),
-        MenuItem("Visualise frequency", lambda: _render_visual(_prompt_float("Frequency (Hz)", 8.0))),
-    ]
-    menu = Menu("Audio Frequency Lab", actions)
-    menu.show()
+def _visualise() -> None:
+    _render_visual(_prompt_float("Frequency (Hz)", 8.0))
+
+
+ACTIONS: tuple[tuple[str, SelectionHandler], ...] = (
+    ("List frequency presets", _list_presets),
+    ("Play preset", _play_preset),
+    ("Design custom tone", _custom_tone),
+    ("Visualise frequency", _visualise),
+)
+
+
+def run(action: Optional[str] = None) -> None:
+    menu = Menu("Audio Frequency Lab", [MenuItem(label, handler) for label, handler in ACTIONS])
+    menu.show(action)
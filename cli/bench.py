@@ -0,0 +1,409 @@
+"""Scale benchmark over synthetic data.
+
+``shadowops bench`` generates corpora far larger than the bundled data and
+drives the real code paths with them:
+
+* ``archive`` — a 100k-document pack, the facet index and filter queries
+* ``format_table`` — rendering archive listings as tables
+* ``history`` — a 1M-session store: batched writes, loading and summaries
+* ``rv`` — a large external target catalog and scripted sessions run
+  through :func:`cli.rv.batch.run_batch`
+* ``audio`` — hour-long single and binaural tone renders
+
+``--scale`` multiplies every size. Each case runs in a fresh interpreter
+whose home directory is a scratch directory, so caches start cold, user data
+is never touched and peak RSS is measured per case. A saved report can serve
+as the baseline for later runs; :func:`compare` lists the metrics that moved
+the wrong way by more than the tolerance.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+
+from .profiling import percentile
+
+SIZES: dict[str, int] = {
+    "documents": 100_000,
+    "queries": 200,
+    "table_rows": 10_000,
+    "tables": 20,
+    "sessions": 1_000_000,
+    "targets": 20_000,
+    "scripted_sessions": 50_000,
+    "audio_seconds": 3_600,  # per render job
+}
+WRITE_BATCH = 5_000
+OPERATORS = 8
+TOLERANCE = 0.2
+
+_WORDS = (
+    "signal", "stone", "ocean", "tower", "bridge", "cipher", "archive", "vector", "harbor", "canyon",
+    "lattice", "beacon", "summit", "river", "glacier", "forest", "engine", "market", "temple", "desert",
+    "orbit", "vault", "garden", "circuit", "island", "meadow", "spire", "tunnel", "crater", "station",
+    "pattern", "mirror", "anchor", "field", "falcon", "ember", "granite", "copper", "thunder", "velvet",
+)
+_TAGS = tuple(f"{first}-{second}" for first in _WORDS[:20] for second in _WORDS[20:30])
+_DOCUMENT_CATEGORIES = ("research", "operational", "training", "general")
+_TARGET_CATEGORIES = ("geographic", "structure", "object", "symbol")
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def sizes(scale: float) -> dict[str, int]:
+    return {name: max(1, int(value * scale)) for name, value in SIZES.items()}
+
+
+def latency_summary(samples: Iterable[float]) -> dict[str, float]:
+    """Percentiles in milliseconds of per-operation ``samples`` in seconds."""
+    ordered = sorted(samples)
+    return {
+        name: round(percentile(ordered, fraction) * 1000, 3)
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+    }
+
+
+def _rate(count: float, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds else 0.0
+
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)  # bytes on macOS, KiB elsewhere
+
+
+def _title(rng: random.Random, words: int) -> str:
+    return " ".join(rng.sample(_WORDS, words)).title()
+
+
+def synthetic_documents(count: int, rng: random.Random) -> Iterator[tuple[dict[str, Any], str]]:
+    """``(metadata, body)`` pairs in the shape :func:`cli.data.pack.write_pack` takes."""
+    from .data.user import TIER_ORDER
+
+    tiers = tuple(TIER_ORDER)
+    for index in range(count):
+        identifier = f"bench-{index:07d}"
+        yield (
+            {
+                "id": identifier,
+                "document_id": identifier,
+                "title": _title(rng, 4),
+                "classification": "RESEARCH ARCHIVE",
+                "access_level": rng.choice(tiers),
+                "file_type": "md",
+                "file_size": rng.randrange(1_000, 50_000),
+                "category": rng.choice(_DOCUMENT_CATEGORIES),
+                "tags": rng.sample(_TAGS, 3),
+                "author": f"Analyst {index % 97}",
+                "summary": " ".join(rng.choices(_WORDS, k=16)),
+                "created_at": (_START + timedelta(minutes=index)).isoformat(),
+            },
+            " ".join(rng.choices(_WORDS, k=120)),
+        )
+
+
+def synthetic_targets(count: int, rng: random.Random) -> Iterator[dict[str, Any]]:
+    from .data.rv_targets import DIFFICULTIES
+
+    for index in range(count):
+        elements = rng.sample(_WORDS, 5) + [" ".join(rng.sample(_WORDS, 2))]
+        yield {
+            "target_id": f"BENCH-{index:06d}",
+            "name": _title(rng, 2),
+            "description": " ".join(rng.choices(_WORDS, k=12)),
+            "category": rng.choice(_TARGET_CATEGORIES),
+            "difficulty": rng.choice(DIFFICULTIES),
+            "correct_elements": elements,
+        }
+
+
+def _perceptions(rng: random.Random) -> list[list[str]]:
+    return [[" ".join(rng.choices(_WORDS, k=3)) for _ in range(rng.randint(1, 3))] for _ in range(3)]
+
+
+def synthetic_sessions(count: int, rng: random.Random) -> Iterator[dict[str, Any]]:
+    """Stored session records against the bundled targets, oldest first."""
+    from .data.rv_targets import TARGETS
+    from .rv.session import STAGES
+
+    stages = [stage for stage, _ in STAGES]
+    for index in range(count):
+        target = TARGETS[index % len(TARGETS)]
+        completed = _START + timedelta(seconds=index * 30)
+        yield {
+            "target_id": target.target_id,
+            "target_name": target.name,
+            "started_at": (completed - timedelta(minutes=10)).isoformat(),
+            "completed_at": completed.isoformat(),
+            "perceptions": dict(zip(stages, _perceptions(rng))),
+            "matches": rng.sample(target.correct_elements, rng.randint(0, 2)),
+            "accuracy": round(rng.uniform(0, 100), 2),
+            "difficulty": target.difficulty,
+            "score_key": None,
+            "operator": f"operator-{index % OPERATORS}",
+            "session_id": f"{index:032x}",
+        }
+
+
+def _bench_archive(size: Mapping[str, int], rng: random.Random, workdir: Path) -> dict[str, Any]:
+    from .data.pack import write_pack
+    from .data.research_documents import PACK_ENV
+    from .data.user import DEMO_USER
+
+    path = workdir / "archive.pack"
+    started = time.perf_counter()
+    write_pack(path, synthetic_documents(size["documents"], rng), fingerprint="bench")
+    pack_seconds = time.perf_counter() - started
+    os.environ[PACK_ENV] = str(path)
+
+    from .research.archive import FilterState, _filter_documents
+    from .research.index import get_index
+
+    started = time.perf_counter()
+    index = get_index()
+    index_seconds = time.perf_counter() - started
+    categories: list[Optional[str]] = [*index.categories(), None]
+    tags = sorted(index.by_tag)
+    latencies = []
+    matched = 0
+    for query in range(size["queries"]):
+        state = FilterState(
+            search=rng.choice(_WORDS) if query % 2 else "",
+            category=rng.choice(categories),
+            tag=rng.choice(tags) if query % 3 == 0 else None,
+        )
+        began = time.perf_counter()
+        matched += len(_filter_documents(index, state, DEMO_USER.subscription_tier))
+        latencies.append(time.perf_counter() - began)
+    return {
+        "documents": len(index.documents),
+        "pack_build_seconds": round(pack_seconds, 3),
+        "index_build_seconds": round(index_seconds, 3),
+        "queries": len(latencies),
+        "queries_per_second": _rate(len(latencies), sum(latencies)),
+        "latency_ms": latency_summary(latencies),
+        "mean_matches": round(matched / len(latencies), 1),
+    }
+
+
+def _bench_format_table(size: Mapping[str, int], rng: random.Random, workdir: Path) -> dict[str, Any]:
+    from .utils.text import format_table
+
+    rows = [
+        (metadata["title"], metadata["category"].title(), metadata["access_level"].upper(), metadata["created_at"][:10])
+        for metadata, _ in synthetic_documents(size["table_rows"], rng)
+    ]
+    latencies = []
+    for _ in range(size["tables"]):
+        began = time.perf_counter()
+        format_table([("Title", "Category", "Tier", "Date")] + rows)
+        latencies.append(time.perf_counter() - began)
+    return {
+        "rows": len(rows),
+        "tables": len(latencies),
+        "rows_per_second": _rate(len(rows) * len(latencies), sum(latencies)),
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def _bench_history(size: Mapping[str, int], rng: random.Random, workdir: Path) -> dict[str, Any]:
+    from .rv.history import STORAGE, iter_pages, iter_sessions, open_store, summarize
+    from .utils.io import ensure_directory
+
+    store = open_store(ensure_directory(STORAGE))
+    writes: list[float] = []
+    batch: list[dict[str, Any]] = []
+
+    def flush() -> None:
+        began = time.perf_counter()
+        store.append_many(batch)
+        writes.append(time.perf_counter() - began)
+        batch.clear()
+
+    for record in synthetic_sessions(size["sessions"], rng):
+        batch.append(record)
+        if len(batch) >= WRITE_BATCH:
+            flush()
+    if batch:
+        flush()
+
+    timings = {}
+    for name, run in (
+        ("load_cold", lambda: sum(1 for _ in iter_sessions(STORAGE))),
+        ("load_warm", lambda: sum(1 for _ in iter_sessions(STORAGE))),
+        ("summary", lambda: summarize(STORAGE).sessions),
+        ("first_page", lambda: len(next(iter_pages(STORAGE, 20), []))),
+    ):
+        began = time.perf_counter()
+        timings[name] = (run(), time.perf_counter() - began)
+    return {
+        "sessions": timings["load_cold"][0],
+        "write_batches": len(writes),
+        "writes_per_second": _rate(size["sessions"], sum(writes)),
+        "write_ms": latency_summary(writes),
+        "load_cold_seconds": round(timings["load_cold"][1], 3),
+        "load_warm_seconds": round(timings["load_warm"][1], 3),
+        "summary_seconds": round(timings["summary"][1], 3),
+        "first_page_ms": round(timings["first_page"][1] * 1000, 3),
+    }
+
+
+def _bench_rv(size: Mapping[str, int], rng: random.Random, workdir: Path) -> dict[str, Any]:
+    from .data.rv_targets import CATALOG_ENV
+
+    path = workdir / "targets.jsonl"
+    targets = list(synthetic_targets(size["targets"], rng))
+    with path.open("w", encoding="utf-8") as handle:
+        handle.writelines(json.dumps(target) + "\n" for target in targets)
+    os.environ[CATALOG_ENV] = str(path)
+
+    from .data.rv_targets import get_catalog
+    from .rv.batch import run_batch
+    from .rv.history import STORAGE
+    from .rv.scoring import compile_scorer
+
+    started = time.perf_counter()
+    catalog = get_catalog()
+    load_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    compile_scorer(catalog)
+    compile_seconds = time.perf_counter() - started
+    lines = [
+        json.dumps({"target_id": rng.choice(targets)["target_id"], "perceptions": _perceptions(rng)})
+        for _ in range(size["scripted_sessions"])
+    ]
+    report = run_batch(lines, STORAGE, seed=rng.randrange(1 << 30)).as_dict()
+    return {
+        "targets": len(catalog),
+        "catalog_load_seconds": round(load_seconds, 3),
+        "scorer_compile_seconds": round(compile_seconds, 3),
+        "sessions": report["sessions"],
+        "rejected": report["rejected"],
+        "sessions_per_second": report["sessions_per_second"],
+        "latency_ms": report["latency_ms"],
+        "write_ms": report["write_ms"],
+    }
+
+
+def _bench_audio(size: Mapping[str, int], rng: random.Random, workdir: Path) -> dict[str, Any]:
+    from .audio.generators import generate_binaural_tone, generate_single_tone
+
+    seconds = size["audio_seconds"]
+    jobs: tuple[tuple[str, Callable[[Path], Any]], ...] = (
+        ("single_tone", lambda path: generate_single_tone(432.0, seconds, path=path)),
+        ("binaural", lambda path: generate_binaural_tone(200.0, 10.0, seconds, path=path)),
+    )
+    job_ms = {}
+    total = 0.0
+    for name, job in jobs:
+        began = time.perf_counter()
+        job(workdir / f"{name}.wav")
+        elapsed = time.perf_counter() - began
+        job_ms[name] = round(elapsed * 1000, 1)
+        total += elapsed
+    return {
+        "jobs": len(jobs),
+        "rendered_minutes": round(seconds * len(jobs) / 60, 1),
+        "audio_seconds_per_second": _rate(seconds * len(jobs), total),
+        "job_ms": job_ms,
+    }
+
+
+_CASES: dict[str, Callable[[Mapping[str, int], random.Random, Path], dict[str, Any]]] = {
+    "archive": _bench_archive,
+    "format_table": _bench_format_table,
+    "history": _bench_history,
+    "rv": _bench_rv,
+    "audio": _bench_audio,
+}
+CASES = tuple(_CASES)
+# Every setting with this prefix is cleared in the child: any of them could point
+# a case at the user's own data (archive pack, target catalogs, operator, store
+# backend) or change what is measured (profiling, fsync, the daemon).
+_ISOLATED_PREFIX = "SHADOWOPS_"
+
+
+def _run_case(name: str, scale: float, seed: int) -> dict[str, Any]:
+    """Child-process entry point: run one case in a scratch home directory."""
+    workdir = Path(tempfile.mkdtemp(prefix=f"shadowops-bench-{name}-"))
+    try:
+        os.environ["HOME"] = str(workdir)
+        for variable in [name for name in os.environ if name.startswith(_ISOLATED_PREFIX)]:
+            del os.environ[variable]
+        started = time.perf_counter()
+        metrics = _CASES[name](sizes(scale), random.Random(seed), workdir)
+        metrics["wall_seconds"] = round(time.perf_counter() - started, 3)
+        metrics["peak_rss_mb"] = peak_rss_mb()
+        return metrics
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_bench(cases: Iterable[str] = CASES, *, scale: float = 1.0, seed: int = 0) -> dict[str, Any]:
+    """Run ``cases`` one after another, each in a freshly spawned interpreter."""
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[name] = pool.submit(_run_case, name, scale, seed).result()
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "seed": seed,
+        "sizes": sizes(scale),
+        "cases": results,
+    }
+
+
+def _flatten(metrics: Mapping[str, Any], prefix: str = "") -> Iterator[tuple[str, float]]:
+    for key, value in metrics.items():
+        if isinstance(value, Mapping):
+            yield from _flatten(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{key}", float(value)
+
+
+def _direction(metric: str) -> int:
+    """+1 when higher is better, -1 when lower is better, 0 for plain counts."""
+    if metric.endswith("_per_second"):
+        return 1
+    if metric.endswith(("_seconds", "_ms", "peak_rss_mb")) or "_ms." in metric:
+        return -1
+    return 0
+
+
+def compare(report: Mapping[str, Any], baseline: Mapping[str, Any], tolerance: float = TOLERANCE) -> list[dict[str, Any]]:
+    """Metrics of ``report`` that are worse than ``baseline`` by more than ``tolerance``."""
+    if report.get("scale") != baseline.get("scale"):
+        raise ValueError(f"baseline was taken at scale {baseline.get('scale')}, this run used {report.get('scale')}")
+    regressions = []
+    for case, metrics in report["cases"].items():
+        previous = dict(_flatten(baseline.get("cases", {}).get(case, {})))
+        for metric, value in _flatten(metrics):
+            direction = _direction(metric)
+            before = previous.get(metric)
+            if not direction or not before:
+                continue
+            change = (value - before) / before
+            if change * direction < -tolerance:
+                regressions.append(
+                    {"case": case, "metric": metric, "baseline": before, "current": value, "change": round(change, 3)}
+                )
+    return regressions
@@ -0,0 +1,419 @@
+"""Non-interactive subcommands emitting JSON for scripting.
+
+Nothing here imports the terminal menu layer; every command reuses the same
+indexes and storage helpers as the interactive flows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from typing import Any, Iterable, Mapping, Sequence, TextIO
+
+from .data.user import DEMO_USER, TIER_ORDER
+
+
+class CommandError(Exception):
+    """Raised by a subcommand to report a message and exit status."""
+
+    def __init__(self, message: str, status: int = 1) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _Parser(argparse.ArgumentParser):
+    def error(self, message: str):  # type: ignore[override]
+        raise CommandError(f"{self.format_usage()}{self.prog}: error: {message}", 2)
+
+
+def _document_payload(document: Any, *, content: bool = False) -> dict[str, Any]:
+    payload = {
+        "id": document.id,
+        "document_id": document.document_id,
+        "title": document.title,
+        "classification": document.classification,
+        "access_level": document.access_level,
+        "category": document.category,
+        "tags": list(document.tags),
+        "author": document.author,
+        "summary": document.summary,
+        "file_type": document.file_type,
+        "file_size": document.file_size,
+        "created_at": document.created_at.isoformat(),
+    }
+    if content:
+        payload["content"] = document.content
+    return payload
+
+
+def _emit(rows: Iterable[Mapping[str, Any]], fmt: str, out: TextIO) -> None:
+    if fmt == "ndjson":
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return
+    json.dump(list(rows), out, ensure_ascii=False)
+    out.write("\n")
+
+
+def _archive_search(args: argparse.Namespace, out: TextIO) -> int:
+    from .research.index import get_index
+
+    index = get_index()
+    selection = index.select(tier=args.tier, category=args.category, tags=args.tag or ())
+    positions = index.search(selection, args.query or "")
+    if args.limit is not None:
+        positions = positions[: args.limit]
+    _emit((_document_payload(document) for document in index.resolve(positions)), args.format, out)
+    return 0
+
+
+def _archive_show(args: argparse.Namespace, out: TextIO) -> int:
+    from .research.index import get_index
+
+    index = get_index()
+    found = [index.find(document_id) for document_id in args.document_ids]
+    missing = [document_id for document_id, document in zip(args.document_ids, found) if document is None]
+    if missing:
+        raise CommandError(f"Unknown document id: {', '.join(missing)}")
+    _emit((_document_payload(document, content=True) for document in found), args.format, out)
+    return 0
+
+
+def _archive_related(args: argparse.Namespace, out: TextIO) -> int:
+    from .research.index import get_index
+    from .research.related import get_related_index
+
+    index = get_index()
+    document = index.find(args.document_id)
+    if document is None:
+        raise CommandError(f"Unknown document id: {args.document_id}")
+    visible = index.by_tier.get(args.tier, frozenset())
+    rows = []
+    for doc_id, score in get_related_index().related(document.id):
+        position = index.positions.get(doc_id)
+        if position in visible:
+            rows.append(dict(_document_payload(index.documents[position]), score=score))
+    _emit(rows, args.format, out)
+    return 0
+
+
+def _archive_tags(args: argparse.Namespace, out: TextIO) -> int:
+    from .research.index import TagTally, get_index
+
+    index = get_index()
+    selection = index.select(tier=args.tier, category=args.category)
+    if args.query:
+        selection = frozenset(index.search(selection, args.query))
+    tally = TagTally(index)
+    tally.update(selection)
+    _emit(({"tag": tag, "count": count} for tag, count in tally.rows()), args.format, out)
+    return 0
+
+
+def _rv_targets(args: argparse.Namespace, out: TextIO) -> int:
+    from .data.rv_targets import filter_targets
+
+    rows = (
+        {
+            "id": target.id,
+            "target_id": target.target_id,
+            "name": target.name,
+            "category": target.category,
+            "difficulty": target.difficulty,
+            "correct_elements": list(target.correct_elements),
+        }
+        for target in filter_targets(difficulty=args.difficulty, category=args.category)
+    )
+    _emit(rows, args.format, out)
+    return 0
+
+
+def _rv_history(args: argparse.Namespace, out: TextIO) -> int:
+    from .rv.history import iter_sessions
+
+    since = None
+    if args.since:
+        try:
+            since = datetime.fromisoformat(args.since).isoformat()
+        except ValueError as exc:
+            raise CommandError(f"Invalid --since value '{args.since}'; expected an ISO 8601 date.", 2) from exc
+    sessions: Iterable[Mapping[str, Any]] = iter_sessions(since=since, target_id=args.target)
+    if args.limit is not None:
+        sessions = (session for _, session in zip(range(args.limit), sessions))
+    _emit(sessions, args.format, out)
+    return 0
+
+
+def _rv_rescore(args: argparse.Namespace, out: TextIO) -> int:
+    from .rv.rescore import rescore
+
+    report = rescore(workers=args.workers, force=args.force, dry_run=args.dry_run)
+    _emit([report.as_dict()], args.format, out)
+    return 0
+
+
+def _rv_batch(args: argparse.Namespace, out: TextIO) -> int:
+    from .rv.batch import run_batch
+
+    if args.script == "-":
+        report = run_batch(sys.stdin, batch_size=args.batch_size, seed=args.seed, dry_run=args.dry_run)
+    else:
+        try:
+            with open(args.script, "r", encoding="utf-8") as handle:
+                report = run_batch(handle, batch_size=args.batch_size, seed=args.seed, dry_run=args.dry_run)
+        except OSError as exc:
+            raise CommandError(f"Cannot read session script: {exc}") from exc
+    _emit([report.as_dict()], args.format, out)
+    return 0 if not report.rejected else 1
+
+
+def _content_list(args: argparse.Namespace, out: TextIO) -> int:
+    from .content import content_catalog
+
+    _emit(({"name": name, "path": str(path)} for name, path in content_catalog().items()), args.format, out)
+    return 0
+
+
+def _content_show(args: argparse.Namespace, out: TextIO) -> int:
+    from .content import ContentNotFoundError, content_catalog, load_markdown_document
+
+    unknown = [name for name in args.names if name not in content_catalog()]
+    if unknown:
+        raise CommandError(f"Unknown content document: {', '.join(unknown)}")
+    try:
+        rows = [{"name": name, "text": load_markdown_document(name)} for name in args.names]
+    except ContentNotFoundError as exc:
+        raise CommandError(str(exc)) from exc
+    _emit(rows, args.format, out)
+    return 0
+
+
+def _audio_presets(args: argparse.Namespace, out: TextIO) -> int:
+    from .audio.presets import iter_presets
+
+    rows = (
+        {
+            "name": preset.name,
+            "description": preset.description,
+            "carrier_hz": preset.carrier_hz,
+            "beat_hz": preset.beat_hz,
+        }
+        for preset in iter_presets()
+    )
+    _emit(rows, args.format, out)
+    return 0
+
+
+def _daemon_serve(args: argparse.Namespace, out: TextIO) -> int:
+    from .daemon import serve, socket_path
+
+    path = socket_path()
+    print(f"Serving on {path}", file=out, flush=True)
+    try:
+        serve(path, workers=args.workers)
+    except RuntimeError as exc:
+        raise CommandError(str(exc)) from exc
+    return 0
+
+
+def _daemon_status(args: argparse.Namespace, out: TextIO) -> int:
+    from .daemon import ping, socket_path
+
+    path = socket_path()
+    reply = ping(path)
+    _emit([{"socket": str(path), "running": reply is not None, "pid": (reply or {}).get("pid")}], "ndjson", out)
+    return 0 if reply is not None else 1
+
+
+def _daemon_stop(args: argparse.Namespace, out: TextIO) -> int:
+    from .daemon import shutdown
+
+    if not shutdown():
+        raise CommandError("No daemon is running.")
+    return 0
+
+
+def _startup(args: argparse.Namespace, out: TextIO) -> int:
+    from .startup import MENU_BUDGET_MS, PROCESS_BUDGET_MS, measure
+
+    report = measure(
+        args.runs,
+        menu_budget_ms=MENU_BUDGET_MS if args.menu_budget_ms is None else args.menu_budget_ms,
+        process_budget_ms=PROCESS_BUDGET_MS if args.process_budget_ms is None else args.process_budget_ms,
+    )
+    _emit([report.as_dict()], args.format, out)
+    return 0 if report.within_budget else 1
+
+
+def _warmup(args: argparse.Namespace, out: TextIO) -> int:
+    from .warmup import start_warmup
+
+    warmup = start_warmup(workers=args.workers)
+    try:
+        finished = warmup.wait(args.timeout)
+    finally:
+        warmup.cancel()
+        warmup.wait(1.0)  # let interrupted renders settle before reporting
+    _emit(warmup.report(), args.format, out)
+    return 0 if finished else 1
+
+
+def _palette(args: argparse.Namespace, out: TextIO) -> int:
+    import time
+
+    from .palette import get_palette
+
+    palette = get_palette()
+    started = time.perf_counter()
+    matches = palette.search(args.query, args.limit)
+    elapsed = time.perf_counter() - started
+    rows = [{"label": entry.label, "kind": entry.kind, "target": entry.target, "args": list(entry.args)} for entry in matches]
+    print(f"{len(matches)} of {len(palette)} entries in {elapsed * 1000:.3f} ms", file=sys.stderr)
+    _emit(rows, args.format, out)
+    return 0 if matches else 1
+
+
+def _bench(args: argparse.Namespace, out: TextIO) -> int:
+    from pathlib import Path
+
+    from .bench import CASES, TOLERANCE, compare, run_bench
+
+    cases = args.case or list(CASES)
+    unknown = sorted(set(cases) - set(CASES))
+    if unknown:
+        raise CommandError(f"Unknown benchmark case(s): {', '.join(unknown)}. Choose from: {', '.join(CASES)}.", 2)
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read baseline {args.baseline}: {exc}", 2) from exc
+        if baseline.get("scale") != args.scale:
+            raise CommandError(f"Baseline was taken at scale {baseline.get('scale')}; rerun with --scale to match.", 2)
+    report = run_bench(cases, scale=args.scale, seed=args.seed)
+    if baseline is not None:
+        try:
+            report["regressions"] = compare(report, baseline, TOLERANCE if args.tolerance is None else args.tolerance)
+        except ValueError as exc:
+            raise CommandError(str(exc), 2) from exc
+    if args.save_baseline:
+        path = Path(args.save_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    _emit([report], args.format, out)
+    return 1 if report.get("regressions") else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--format", choices=("json", "ndjson"), default="json", help="output encoding (default: json)")
+
+    parser = _Parser(prog="shadowops", description="ShadowOps offline toolkit")
+    groups = parser.add_subparsers(dest="group", metavar="COMMAND")
+    groups.required = True
+
+    archive = groups.add_parser("archive", help="query the research archive").add_subparsers(dest="command")
+    archive.required = True
+    search = archive.add_parser("search", parents=[output], help="filter and search documents")
+    search.add_argument("query", nargs="?", default="", help="substring matched against title, summary and tags")
+    search.add_argument("--category")
+    search.add_argument("--tag", action="append", help="require a tag (repeatable)")
+    search.add_argument("--tier", choices=tuple(TIER_ORDER), default=DEMO_USER.subscription_tier)
+    search.add_argument("--limit", type=int)
+    search.set_defaults(func=_archive_search)
+    show = archive.add_parser("show", parents=[output], help="print documents including their body")
+    show.add_argument("document_ids", nargs="+", metavar="ID")
+    show.set_defaults(func=_archive_show)
+    related = archive.add_parser("related", parents=[output], help="documents similar to a document")
+    related.add_argument("document_id", metavar="ID")
+    related.add_argument("--tier", choices=tuple(TIER_ORDER), default=DEMO_USER.subscription_tier)
+    related.set_defaults(func=_archive_related)
+    tags = archive.add_parser("tags", parents=[output], help="tag counts for a selection")
+    tags.add_argument("query", nargs="?", default="")
+    tags.add_argument("--category")
+    tags.add_argument("--tier", choices=tuple(TIER_ORDER), default=DEMO_USER.subscription_tier)
+    tags.set_defaults(func=_archive_tags)
+
+    rv = groups.add_parser("rv", help="remote viewing targets and history").add_subparsers(dest="command")
+    rv.required = True
+    targets = rv.add_parser("targets", parents=[output], help="list targets")
+    targets.add_argument("--difficulty", choices=("novice", "intermediate", "advanced"))
+    targets.add_argument("--category")
+    targets.set_defaults(func=_rv_targets)
+    history = rv.add_parser("history", parents=[output], help="list recorded sessions")
+    history.add_argument("--since", help="only sessions completed at or after this ISO 8601 date")
+    history.add_argument("--target", help="only sessions for this target id")
+    history.add_argument("--limit", type=int)
+    history.set_defaults(func=_rv_history)
+    rescore = rv.add_parser("rescore", parents=[output], help="re-score stored sessions with the current scorer")
+    rescore.add_argument("--workers", type=int, help="scoring processes (1 scores in-process; default: CPU count)")
+    rescore.add_argument("--force", action="store_true", help="re-score sessions already scored by the current rules")
+    rescore.add_argument("--dry-run", action="store_true", help="report distributions without writing results back")
+    rescore.set_defaults(func=_rv_rescore)
+    batch = rv.add_parser("batch", parents=[output], help="run scripted sessions from NDJSON")
+    batch.add_argument("script", nargs="?", default="-", help="NDJSON session script (default: stdin)")
+    batch.add_argument("--batch-size", type=int, default=500, help="sessions per storage write (default: 500)")
+    batch.add_argument("--seed", type=int, help="seed for random target selection")
+    batch.add_argument("--dry-run", action="store_true", help="score sessions without storing them")
+    batch.set_defaults(func=_rv_batch)
+
+    content = groups.add_parser("content", help="bundled Markdown content").add_subparsers(dest="command")
+    content.required = True
+    content_list = content.add_parser("list", parents=[output], help="list content documents")
+    content_list.set_defaults(func=_content_list)
+    content_show = content.add_parser("show", parents=[output], help="render content documents as text")
+    content_show.add_argument("names", nargs="+", metavar="NAME")
+    content_show.set_defaults(func=_content_show)
+
+    audio = groups.add_parser("audio", help="audio lab presets").add_subparsers(dest="command")
+    audio.required = True
+    presets = audio.add_parser("presets", parents=[output], help="list frequency presets")
+    presets.set_defaults(func=_audio_presets)
+
+    daemon = groups.add_parser("daemon", help="resident query daemon").add_subparsers(dest="command")
+    daemon.required = True
+    serve = daemon.add_parser("serve", help="run the daemon in the foreground")
+    serve.add_argument("--workers", type=int, help="worker threads for concurrent requests")
+    serve.set_defaults(func=_daemon_serve)
+    daemon.add_parser("status", help="report whether a daemon is running").set_defaults(func=_daemon_status)
+    daemon.add_parser("stop", help="ask a running daemon to exit").set_defaults(func=_daemon_stop)
+
+    startup = groups.add_parser("startup", parents=[output], help="check cold-start time against its budget")
+    startup.add_argument("--runs", type=int, default=5, help="cold starts to take the median of (default: 5)")
+    startup.add_argument("--menu-budget-ms", type=float, help="entry point import to built menu (default: 150)")
+    startup.add_argument("--process-budget-ms", type=float, help="interpreter start to menu (default: 400)")
+    startup.set_defaults(func=_startup)
+    warmup = groups.add_parser("warmup", parents=[output], help="run the launch warm-up and report task timings")
+    warmup.add_argument("--workers", type=int, help="warm-up threads")
+    warmup.add_argument("--timeout", type=float, help="seconds to wait before cancelling the remaining tasks")
+    warmup.set_defaults(func=_warmup)
+    palette = groups.add_parser("palette", parents=[output], help="look up menu actions and content by prefix")
+    palette.add_argument("query", help="word prefixes, e.g. 'gam bur' for the Gamma Burst preset")
+    palette.add_argument("--limit", type=int, default=20, help="maximum matches (default: 20)")
+    palette.set_defaults(func=_palette)
+    bench = groups.add_parser("bench", parents=[output], help="benchmark real code paths against synthetic data")
+    bench.add_argument("--case", action="append", help="run only this case (repeatable; default: all)")
+    bench.add_argument("--scale", type=float, default=1.0, help="multiplier for every synthetic data size (default: 1.0)")
+    bench.add_argument("--seed", type=int, default=0, help="seed for the data generators (default: 0)")
+    bench.add_argument("--baseline", help="report to compare against; exits 1 on regressions")
+    bench.add_argument("--tolerance", type=float, help="allowed relative slowdown before flagging (default: 0.2)")
+    bench.add_argument("--save-baseline", metavar="PATH", help="also write this run's report to PATH")
+    bench.set_defaults(func=_bench)
+
+    return parser
+
+
+def run_command(argv: Sequence[str], out: TextIO | None = None, err: TextIO | None = None) -> int:
+    """Parse ``argv`` and run the matching subcommand, returning an exit code."""
+    try:
+        args = build_parser().parse_args(list(argv))
+        from .profiling import span
+
+        name = " ".join(part for part in (args.group, getattr(args, "command", None)) if part)
+        with span(f"command {name}", "command"):
+            return args.func(args, out or sys.stdout)
+    except CommandError as exc:
+        print(str(exc), file=err or sys.stderr)
+        return exc.status
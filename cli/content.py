@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
 from . import get_content_path
-from .utils.text import render_markdown
+from .utils.text import get_terminal_width, render_markdown, render_markdown_lines
 
 
 class ContentNotFoundError(FileNotFoundError):
@@ -22,8 +23,65 @@ def load_markdown_document(name: str) -> str:
         addressed via ``"ops-manual"`` (maps to ``content/ops-manual.md``).
     """
 
-    root = get_content_path()
-    path = root / f"{name}.md"
+    path = _document_path(name)
+    return _rendered(path, path.stat().st_mtime_ns, get_terminal_width())
+
+
+def _document_path(name: str) -> Path:
+    path = get_content_path() / f"{name}.md"
     if not path.exists():
         raise ContentNotFoundError(f"Content document '{name}' not found at {path}")
+    return path
+
+
+def _heading(line: str) -> tuple[int, str] | None:
+    stripped = line.strip()
+    if not stripped.startswith("#"):
+        return None
+    return len(stripped) - len(stripped.lstrip("#")), stripped.lstrip("# ")
+
+
+def markdown_headings(name: str) -> list[str]:
+    """Headings of the content document ``name`` in order of appearance."""
+    lines = _document_path(name).read_text(encoding="utf-8").splitlines()
+    return [found[1] for found in map(_heading, lines) if found is not None and found[1]]
+
+
+def load_markdown_section(name: str, heading: str) -> str:
+    """Render ``heading`` of document ``name`` up to the next heading of the same or a higher level."""
+    lines = _document_path(name).read_text(encoding="utf-8").splitlines()
+    for start, line in enumerate(lines):
+        found = _heading(line)
+        if found is not None and found[1] == heading:
+            break
+    else:
+        raise ContentNotFoundError(f"Section '{heading}' not found in content document '{name}'")
+    end = start + 1
+    while end < len(lines):
+        following = _heading(lines[end])
+        if following is not None and following[0] <= found[0]:
+            break
+        end += 1
+    return render_markdown_lines(lines[start:end])
+
+
+def show_document(name: str) -> None:
+    print(load_markdown_document(name) + "\n")
+
+
+def show_section(name: str, heading: str) -> None:
+    print(load_markdown_section(name, heading) + "\n")
+
+
+@lru_cache(maxsize=64)
+def _rendered(path: Path, mtime_ns: int, width: int) -> str:
+    # Keyed by modification time and terminal width, which both change the output.
     return render_markdown(path)
+
+
+@lru_cache(maxsize=None)
+def content_catalog() -> dict[str, Path]:
+    """Map every document name under ``content`` to its Markdown file."""
+
+    root = get_content_path()
+    return {path.relative_to(root).with_suffix("").as_posix(): path for path in sorted(root.rglob("*.md"))}
@@ -0,0 +1,208 @@
+"""Resident query daemon and thin client over a Unix domain socket.
+
+The daemon keeps the archive index, content catalog and RV history loaded and
+answers subcommand requests concurrently. Each connection carries one JSON
+request line (``{"argv": [...], "cwd": str, "env": {...}}``) and receives one
+JSON response (``{"status": int, "stdout": str, "stderr": str}``) before the
+server closes it. The daemon only answers clients whose working directory and
+:data:`CONTEXT_ENV` variables match its own; anything else gets
+``{"refused": [...]}`` and the client runs the command in-process instead.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Optional, Sequence, TextIO
+
+SOCKET_ENV = "SHADOWOPS_DAEMON_SOCKET"
+DISABLE_ENV = "SHADOWOPS_NO_DAEMON"
+CONNECT_TIMEOUT = 0.5
+REQUEST_LIMIT = 1 << 20
+# Commands that manage the daemon itself, measure this process, read stdin or
+# run long batch jobs always run in-process, matched by subcommand position.
+LOCAL_ONLY = frozenset({("daemon",), ("bench",), ("startup",), ("warmup",), ("rv", "rescore"), ("rv", "batch")})
+# argparse prints help to the daemon's own stdout, so help always runs locally.
+HELP_FLAGS = frozenset({"-h", "--help"})
+# Environment that decides which data a command sees.
+CONTEXT_ENV = (
+    "HOME",
+    "SHADOWOPS_OPERATOR",
+    "SHADOWOPS_RV_STORE",
+    "SHADOWOPS_RV_FSYNC",
+    "SHADOWOPS_RV_TARGETS",
+    "SHADOWOPS_ARCHIVE_PACK",
+)
+
+
+def socket_path() -> Path:
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / ".shadowops" / "cli" / "daemon.sock"
+
+
+def runs_locally(argv: Sequence[str]) -> bool:
+    return not argv or tuple(argv[:1]) in LOCAL_ONLY or tuple(argv[:2]) in LOCAL_ONLY or not HELP_FLAGS.isdisjoint(argv)
+
+
+def context() -> dict[str, Any]:
+    """Working directory and environment a forwarded command must run under."""
+    return {"cwd": os.getcwd(), "env": {name: os.environ.get(name) for name in CONTEXT_ENV}}
+
+
+def context_mismatch(request: dict[str, Any]) -> list[str]:
+    """Names of the parts of ``request``'s context that differ from this process."""
+    own = context()
+    env = request.get("env")
+    if not isinstance(env, dict):
+        return ["env"]
+    mismatched = [name for name in CONTEXT_ENV if env.get(name) != own["env"][name]]
+    if request.get("cwd") != own["cwd"]:
+        mismatched.insert(0, "cwd")
+    return mismatched
+
+
+def _request(payload: dict[str, Any], path: Path, timeout: Optional[float] = None) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(CONNECT_TIMEOUT)
+        client.connect(str(path))
+        client.settimeout(timeout)
+        client.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = client.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def forward(argv: Sequence[str], out: TextIO, err: TextIO, path: Optional[Path] = None) -> Optional[int]:
+    """Run ``argv`` on a running daemon and return its exit status.
+
+    Returns ``None`` when no daemon is reachable, or the daemon refuses because
+    it runs in a different directory or environment, so the caller can fall
+    back to in-process execution.
+    """
+
+    if os.environ.get(DISABLE_ENV) or runs_locally(argv):
+        return None
+    path = path or socket_path()
+    if not path.exists():
+        return None
+    try:
+        response = _request({"argv": list(argv), **context()}, path)
+    except (OSError, ValueError):
+        return None
+    if response.get("refused"):
+        return None
+    out.write(response.get("stdout", ""))
+    err.write(response.get("stderr", ""))
+    return int(response.get("status", 1))
+
+
+def ping(path: Optional[Path] = None) -> Optional[dict[str, Any]]:
+    try:
+        return _request({"op": "ping"}, path or socket_path(), timeout=CONNECT_TIMEOUT)
+    except (OSError, ValueError):
+        return None
+
+
+def shutdown(path: Optional[Path] = None) -> bool:
+    try:
+        _request({"op": "shutdown"}, path or socket_path(), timeout=CONNECT_TIMEOUT)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def warm() -> None:
+    """Load the state the daemon keeps resident."""
+    from .content import content_catalog
+    from .data.rv_targets import get_catalog
+    from .research.index import get_index
+    from .research.related import get_related_index
+    from .rv.history import load_sessions, open_store, using_sqlite
+
+    get_index()
+    get_related_index()
+    content_catalog()
+    get_catalog()
+    if using_sqlite():
+        open_store()
+    else:
+        load_sessions()
+
+
+def serve(path: Optional[Path] = None, *, workers: Optional[int] = None) -> None:
+    """Serve requests on ``path`` until a shutdown request or interrupt."""
+    import asyncio
+    import io
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .commands import run_command
+
+    path = path or socket_path()
+    if path.exists():
+        if ping(path) is not None:
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    warm()
+    executor = ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4))
+
+    def execute(argv: list[str]) -> dict[str, Any]:
+        out, err = io.StringIO(), io.StringIO()
+        try:
+            status = run_command(argv, out, err)
+        except SystemExit as exc:  # --help and friends
+            status = exc.code if isinstance(exc.code, int) else 0
+        except Exception as exc:  # keep serving other clients
+            err.write(f"{type(exc).__name__}: {exc}\n")
+            status = 1
+        return {"status": status, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+    async def main() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                request = json.loads(await reader.readline())
+                op = request.get("op", "run")
+                if op == "ping":
+                    response: dict[str, Any] = {"status": 0, "pid": os.getpid()}
+                elif op == "shutdown":
+                    response = {"status": 0}
+                    stop.set()
+                else:
+                    refused = context_mismatch(request)
+                    if refused:
+                        response = {"status": 2, "refused": refused}
+                    else:
+                        response = await loop.run_in_executor(executor, execute, [str(arg) for arg in request["argv"]])
+            except (ValueError, KeyError, TypeError) as exc:
+                response = {"status": 2, "stdout": "", "stderr": f"Malformed request: {exc}\n"}
+            writer.write(json.dumps(response).encode("utf-8"))
+            try:
+                await writer.drain()
+            finally:
+                writer.close()
+
+        server = await asyncio.start_unix_server(handle, path=str(path), limit=REQUEST_LIMIT)
+        os.chmod(path, 0o600)
+        async with server:
+            await stop.wait()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(wait=False)
+        if path.exists():
+            path.unlink()
@@ -0,0 +1,148 @@
+"""Single-file pack format for lazily loaded document bodies.
+
+Layout::
+
+    header | body 0 | body 1 | ... | offset index | metadata (NDJSON)
+
+The header records where the offset index and metadata live. The index holds
+one little-endian ``(offset, length)`` pair per document, so a body is located
+in O(1) and decoded only when requested. Metadata is one JSON object per line
+in document order.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Tuple
+
+MAGIC = b"SHADOWPK"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQQQ32s")
+INDEX_ENTRY = struct.Struct("<QQ")
+
+
+class PackFormatError(ValueError):
+    """Raised when a file is not a readable pack."""
+
+
+def write_pack(path: Path, entries: Iterable[Tuple[Mapping[str, Any], str]], *, fingerprint: str = "") -> Path:
+    """Write ``(metadata, body)`` pairs to ``path`` atomically.
+
+    Bodies are streamed straight to disk and metadata is spooled to a temporary
+    file, so building a pack never holds the corpus in memory.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    offsets = array("Q")
+    count = 0
+    fd, tmp_name = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as handle, tempfile.TemporaryFile() as metadata:
+            handle.write(b"\0" * HEADER.size)
+            position = HEADER.size
+            for meta, body in entries:
+                encoded = body.encode("utf-8")
+                handle.write(encoded)
+                offsets.extend((position, len(encoded)))
+                position += len(encoded)
+                metadata.write(json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+                count += 1
+            index_offset = position
+            for offset, length in zip(offsets[::2], offsets[1::2]):
+                handle.write(INDEX_ENTRY.pack(offset, length))
+            meta_offset = index_offset + INDEX_ENTRY.size * count
+            meta_length = metadata.tell()
+            metadata.seek(0)
+            shutil.copyfileobj(metadata, handle)
+            handle.seek(0)
+            handle.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    0,
+                    count,
+                    index_offset,
+                    meta_offset,
+                    meta_length,
+                    fingerprint.encode("ascii")[:32],
+                )
+            )
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return path
+
+
+class PackFile:
+    """Read-only, memory-mapped view over a pack written by :func:`write_pack`."""
+
+    __slots__ = ("path", "count", "fingerprint", "_handle", "_map", "_index_offset", "_meta_offset", "_meta_length")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._handle = path.open("rb")
+        try:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            self._handle.close()
+            raise PackFormatError(f"Pack file '{path}' is empty") from exc
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise PackFormatError(f"Pack file '{path}' is truncated")
+        magic, version, _, count, index_offset, meta_offset, meta_length, fingerprint = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise PackFormatError(f"'{path}' is not a version {VERSION} pack file")
+        self.count = count
+        self.fingerprint = fingerprint.rstrip(b"\0").decode("ascii")
+        self._index_offset = index_offset
+        self._meta_offset = meta_offset
+        self._meta_length = meta_length
+
+    def __len__(self) -> int:
+        return self.count
+
+    def body(self, position: int) -> str:
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        offset, length = INDEX_ENTRY.unpack_from(self._map, self._index_offset + INDEX_ENTRY.size * position)
+        return self._map[offset : offset + length].decode("utf-8")
+
+    def iter_metadata(self) -> Iterator[dict[str, Any]]:
+        end = self._meta_offset + self._meta_length
+        start = self._meta_offset
+        while start < end:
+            stop = self._map.find(b"\n", start, end)
+            if stop == -1:
+                stop = end
+            yield json.loads(self._map[start:stop])
+            start = stop + 1
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+        self._handle.close()
+
+
+def read_fingerprint(path: Path) -> str | None:
+    """Return the fingerprint stored in ``path`` without mapping the file."""
+    try:
+        with path.open("rb") as handle:
+            raw = handle.read(HEADER.size)
+    except OSError:
+        return None
+    if len(raw) < HEADER.size:
+        return None
+    magic, version, *_, fingerprint = HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return fingerprint.rstrip(b"\0").decode("ascii")
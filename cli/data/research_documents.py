@@ -1,35 +1,31 @@
-"""Static research archive content."""
+"""Research archive content.
+
+Document metadata is held in a columnar :class:`DocumentTable` while bodies
+live in a memory-mapped pack file (see :mod:`cli.data.pack`) and are decoded
+only when a document is actually opened.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import os
+import sys
+import tempfile
 from datetime import datetime
-from typing import Iterable, Literal
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal, Optional, Sequence
 
-from .user import TierLevel
+from .pack import PackFile, read_fingerprint, write_pack
+from .user import TIER_ORDER, TierLevel
 
 Category = Literal["research", "operational", "training", "general"]
 
+PACK_ENV = "SHADOWOPS_ARCHIVE_PACK"
 
-@dataclass(frozen=True)
-class ResearchDocument:
-    id: str
-    document_id: str
-    title: str
-    content: str
-    classification: str
-    access_level: TierLevel
-    file_type: str
-    file_size: int
-    category: Category
-    tags: tuple[str, ...]
-    author: str
-    summary: str
-    created_at: datetime
-
-
-DOCUMENTS: tuple[ResearchDocument, ...] = (
-    ResearchDocument(
+_SEED: tuple[dict[str, Any], ...] = (
+    dict(
         id="cc-defensive-strategies-001",
         document_id="cc-defensive-strategies-001",
         title="Analyzing Citizen Cipher's Defensive Strategies",
@@ -42,12 +38,12 @@ DOCUMENTS: tuple[ResearchDocument, ...] = (
         file_type="md",
         file_size=18_432,
         category="research",
-        tags=("cognitive-biases", "defensive-strategies", "verification"),
+        tags=["cognitive-biases", "defensive-strategies", "verification"],
         author="Citizen Cipher Research Team",
         summary="Deep-dive analysis of defensive countermeasures that harden perception, decision-making, and verification workflows.",
-        created_at=datetime.fromisoformat("2024-01-05T00:00:00+00:00"),
+        created_at="2024-01-05T00:00:00+00:00",
     ),
-    ResearchDocument(
+    dict(
         id="cc-brand-identity-001",
         document_id="cc-brand-identity-001",
         title="Designing Brand Identity and PR Kit for Citizen Cipher",
@@ -60,12 +56,12 @@ DOCUMENTS: tuple[ResearchDocument, ...] = (
         file_type="md",
         file_size=14_208,
         category="operational",
-        tags=("branding", "marketing", "psychology"),
+        tags=["branding", "marketing", "psychology"],
         author="Citizen Cipher Marketing Division",
         summary="Launch playbook covering narrative framing, trust scaffolding, and psychological signaling for the Citizen Cipher platform.",
-        created_at=datetime.fromisoformat("2024-01-10T00:00:00+00:00"),
+        created_at="2024-01-10T00:00:00+00:00",
     ),
-    ResearchDocument(
+    dict(
         id="cc-historic-heists-001",
         document_id="cc-historic-heists-001",
         title="Historic Heists: Psychological Breakdown",
@@ -78,12 +74,12 @@ DOCUMENTS: tuple[ResearchDocument, ...] = (
         file_type="md",
         file_size=20_992,
         category="research",
-        tags=("case-studies", "social-engineering", "analysis"),
+        tags=["case-studies", "social-engineering", "analysis"],
         author="Citizen Cipher Research Team",
         summary="Forensic profiles of high-yield attacks mapped to defensive countermeasures and verification protocols.",
-        created_at=datetime.fromisoformat("2024-01-18T00:00:00+00:00"),
+        created_at="2024-01-18T00:00:00+00:00",
     ),
-    ResearchDocument(
+    dict(
         id="cc-persuasive-heuristics-001",
         document_id="cc-persuasive-heuristics-001",
         title="Persuasion, Biases, and Game Theory",
@@ -95,12 +91,12 @@ DOCUMENTS: tuple[ResearchDocument, ...] = (
         file_type="md",
         file_size=17_664,
         category="research",
-        tags=("persuasion", "game-theory", "heuristics"),
+        tags=["persuasion", "game-theory", "heuristics"],
         author="Citizen Cipher Research Team",
         summary="Extended exploration of bias exploitation patterns with counter-bias conditioning exercises.",
-        created_at=datetime.fromisoformat("2024-01-22T00:00:00+00:00"),
+        created_at="2024-01-22T00:00:00+00:00",
     ),
-    ResearchDocument(
+    dict(
         id="cc-podcast-offensive-001",
         document_id="cc-podcast-offensive-001",
         title="Podcast Scripting for Offensive Defense",
@@ -112,12 +108,12 @@ DOCUMENTS: tuple[ResearchDocument, ...] = (
         file_type="md",
         file_size=12_256,
         category="operational",
-        tags=("audio", "content", "pedagogy"),
+        tags=["audio", "content", "pedagogy"],
         author="Citizen Cipher Media Division",
         summary="Script architecture for mission briefings, cadence patterns, and mental imagery reinforcement.",
-        created_at=datetime.fromisoformat("2024-01-28T00:00:00+00:00"),
+        created_at="2024-01-28T00:00:00+00:00",
     ),
-    ResearchDocument(
+    dict(
         id="cc-project-blueprint-ii-001",
         document_id="cc-project-blueprint-ii-001",
         title="Project Blueprint II: Grid Expansion & Systemic Resilience",
@@ -129,17 +125,227 @@ DOCUMENTS: tuple[ResearchDocument, ...] = (
         file_type="md",
         file_size=24_576,
         category="operational",
-        tags=("opsec", "resilience", "shadow-state"),
+        tags=["opsec", "resilience", "shadow-state"],
         author="Omega Integration Protocol",
         summary="High-tier operational blueprint for maintaining continuity under contested environments.",
-        created_at=datetime.fromisoformat("2024-02-02T00:00:00+00:00"),
+        created_at="2024-02-02T00:00:00+00:00",
     ),
 )
 
 
+class DocumentTable(Sequence["ResearchDocument"]):
+    """Columnar metadata for every archived document plus its body store."""
+
+    __slots__ = (
+        "bodies",
+        "ids",
+        "document_ids",
+        "titles",
+        "classifications",
+        "access_levels",
+        "file_types",
+        "file_sizes",
+        "categories",
+        "tags",
+        "authors",
+        "summaries",
+        "created_at",
+    )
+
+    def __init__(self, bodies: PackFile) -> None:
+        self.bodies = bodies
+        self.ids: list[str] = []
+        self.document_ids: list[str] = []
+        self.titles: list[str] = []
+        self.classifications: list[str] = []
+        self.access_levels: list[str] = []
+        self.file_types: list[str] = []
+        self.file_sizes: list[int] = []
+        self.categories: list[str] = []
+        self.tags: list[tuple[str, ...]] = []
+        self.authors: list[str] = []
+        self.summaries: list[str] = []
+        self.created_at: list[str] = []
+
+    @classmethod
+    def from_pack(cls, pack: PackFile) -> "DocumentTable":
+        table = cls(pack)
+        intern = sys.intern
+        for meta in pack.iter_metadata():
+            table.ids.append(meta["id"])
+            table.document_ids.append(meta["document_id"])
+            table.titles.append(meta["title"])
+            table.classifications.append(intern(meta["classification"]))
+            table.access_levels.append(intern(meta["access_level"]))
+            table.file_types.append(intern(meta["file_type"]))
+            table.file_sizes.append(meta["file_size"])
+            table.categories.append(intern(meta["category"]))
+            table.tags.append(tuple(intern(tag) for tag in meta["tags"]))
+            table.authors.append(intern(meta["author"]))
+            table.summaries.append(meta["summary"])
+            table.created_at.append(meta["created_at"])
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, row):  # type: ignore[override]
+        if isinstance(row, slice):
+            return [ResearchDocument(self, index) for index in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return ResearchDocument(self, row)
+
+    def __iter__(self) -> Iterator["ResearchDocument"]:
+        for row in range(len(self.ids)):
+            yield ResearchDocument(self, row)
+
+
+class ResearchDocument:
+    """Lightweight row view over a :class:`DocumentTable`."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: DocumentTable, row: int) -> None:
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> str:
+        return self._table.ids[self._row]
+
+    @property
+    def document_id(self) -> str:
+        return self._table.document_ids[self._row]
+
+    @property
+    def title(self) -> str:
+        return self._table.titles[self._row]
+
+    @property
+    def content(self) -> str:
+        return self._table.bodies.body(self._row)
+
+    @property
+    def classification(self) -> str:
+        return self._table.classifications[self._row]
+
+    @property
+    def access_level(self) -> TierLevel:
+        return self._table.access_levels[self._row]  # type: ignore[return-value]
+
+    @property
+    def file_type(self) -> str:
+        return self._table.file_types[self._row]
+
+    @property
+    def file_size(self) -> int:
+        return self._table.file_sizes[self._row]
+
+    @property
+    def category(self) -> Category:
+        return self._table.categories[self._row]  # type: ignore[return-value]
+
+    @property
+    def tags(self) -> tuple[str, ...]:
+        return self._table.tags[self._row]
+
+    @property
+    def author(self) -> str:
+        return self._table.authors[self._row]
+
+    @property
+    def summary(self) -> str:
+        return self._table.summaries[self._row]
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromisoformat(self._table.created_at[self._row])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ResearchDocument):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"ResearchDocument(id={self.id!r}, title={self.title!r})"
+
+
+def pack_override() -> Optional[Path]:
+    """The external pack named by ``SHADOWOPS_ARCHIVE_PACK``; unset or empty means none."""
+    override = os.environ.get(PACK_ENV, "").strip()
+    return Path(override).expanduser() if override else None
+
+
+def archive_pack_path() -> Path:
+    override = pack_override()
+    if override is not None:
+        return override
+    return Path.home() / ".shadowops" / "cli" / "research-archive.pack"
+
+
+def _fallback_pack_path(name: str) -> Path:
+    """Per-user pack location under the temp directory, reused across runs.
+
+    The directory is private to the user; if something else already owns that
+    name a fresh directory is used instead.
+    """
+
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    directory = Path(tempfile.gettempdir()) / f"shadowops-{user}"
+    try:
+        directory.mkdir(mode=0o700, exist_ok=True)
+        info = os.lstat(directory)
+        if directory.is_symlink() or (hasattr(os, "getuid") and info.st_uid != os.getuid()):
+            raise PermissionError(f"{directory} is not owned by this user")
+    except OSError:
+        directory = Path(tempfile.mkdtemp(prefix="shadowops-"))
+    return directory / name
+
+
+def _seed_fingerprint() -> str:
+    return hashlib.sha256(json.dumps(_SEED, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def build_seed_pack(path: Path) -> Path:
+    """Write the bundled documents to a pack file at ``path``."""
+    entries = (({key: value for key, value in item.items() if key != "content"}, item["content"]) for item in _SEED)
+    return write_pack(path, entries, fingerprint=_seed_fingerprint())
+
+
+@lru_cache(maxsize=None)
+def get_documents() -> DocumentTable:
+    """Return the archive table, building the bundled pack on first use.
+
+    Setting ``SHADOWOPS_ARCHIVE_PACK`` points the archive at an external pack
+    which is used as-is.
+    """
+
+    path = archive_pack_path()
+    if pack_override() is None and read_fingerprint(path) != _seed_fingerprint():
+        try:
+            build_seed_pack(path)
+        except OSError:
+            # Home is not writable: keep one pack per user in the temp directory.
+            path = _fallback_pack_path(path.name)
+            if read_fingerprint(path) != _seed_fingerprint():
+                build_seed_pack(path)
+    return DocumentTable.from_pack(PackFile(path))
+
+
 def iter_by_tier(tier: TierLevel) -> Iterable[ResearchDocument]:
-    tier_order = {"none": 0, "alpha": 1, "beta": 2, "theta": 3, "gamma": 4}
-    threshold = tier_order[tier]
-    for document in DOCUMENTS:
-        if tier_order[document.access_level] <= threshold:
+    threshold = TIER_ORDER[tier]
+    for document in get_documents():
+        if TIER_ORDER[document.access_level] <= threshold:
             yield document
+
+
+def __getattr__(name: str) -> Any:
+    if name == "DOCUMENTS":
+        return get_documents()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,35 @@
-"""Remote viewing target catalog."""
+"""Remote viewing target catalog.
+
+The bundled targets can be extended with external catalogs named in
+``SHADOWOPS_RV_TARGETS`` (paths separated by ``os.pathsep``). Each file is a
+JSON array, an object with a ``targets`` array, or JSON Lines with one target
+per line. A target whose ``target_id`` is already known replaces the earlier
+definition.
+"""
 
 from __future__ import annotations
 
+import json
+import os
+import random
 from dataclasses import dataclass
-from random import choice
-from typing import Iterable, Literal, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal, Mapping, Optional, Sequence
+
+from ..utils.io import iter_json_array
 
 RvDifficulty = Literal["novice", "intermediate", "advanced"]
 RvCategory = Literal["geographic", "structure", "object", "symbol"]
 
+DIFFICULTIES: tuple[RvDifficulty, ...] = ("novice", "intermediate", "advanced")
+CATALOG_ENV = "SHADOWOPS_RV_TARGETS"
+
 
 @dataclass(frozen=True)
 class RemoteViewingTarget:
+    __slots__ = ("id", "target_id", "name", "description", "category", "difficulty", "correct_elements")
+
     id: str
     target_id: str
     name: str
@@ -20,6 +38,21 @@ class RemoteViewingTarget:
     difficulty: RvDifficulty
     correct_elements: tuple[str, ...]
 
+    def __reduce__(self):  # frozen slotted instances cannot restore state via setattr
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> "RemoteViewingTarget":
+        return cls(
+            id=str(payload.get("id") or payload["target_id"]),
+            target_id=str(payload["target_id"]),
+            name=str(payload["name"]),
+            description=str(payload.get("description", "")),
+            category=payload.get("category", "object"),
+            difficulty=payload.get("difficulty", "novice"),
+            correct_elements=tuple(str(element) for element in payload.get("correct_elements", ())),
+        )
+
 
 TARGETS: tuple[RemoteViewingTarget, ...] = (
     RemoteViewingTarget(
@@ -70,16 +103,106 @@ TARGETS: tuple[RemoteViewingTarget, ...] = (
 )
 
 
-def filter_targets(*, difficulty: RvDifficulty | None = None) -> Sequence[RemoteViewingTarget]:
-    if difficulty is None:
-        return TARGETS
-    return tuple(target for target in TARGETS if target.difficulty == difficulty)
+class TargetCatalog(Sequence[RemoteViewingTarget]):
+    """Targets with precomputed id, difficulty and category indexes.
+
+    Index values are tuples of positions, so filtering is a dictionary lookup
+    and random selection within any filter is O(1).
+    """
+
+    __slots__ = ("targets", "by_id", "by_difficulty", "by_category", "_positions")
+
+    def __init__(self, targets: Iterable[RemoteViewingTarget]) -> None:
+        merged: dict[str, RemoteViewingTarget] = {}
+        for target in targets:
+            merged[target.target_id] = target
+        self.targets: tuple[RemoteViewingTarget, ...] = tuple(merged.values())
+        self.by_id: dict[str, RemoteViewingTarget] = merged
+        by_difficulty: dict[str, list[int]] = {}
+        by_category: dict[str, list[int]] = {}
+        for position, target in enumerate(self.targets):
+            by_difficulty.setdefault(target.difficulty, []).append(position)
+            by_category.setdefault(target.category, []).append(position)
+        self.by_difficulty = {key: tuple(value) for key, value in by_difficulty.items()}
+        self.by_category = {key: tuple(value) for key, value in by_category.items()}
+        self._positions: dict[tuple[Optional[str], Optional[str]], tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        return self.targets[index]
+
+    def __iter__(self) -> Iterator[RemoteViewingTarget]:
+        return iter(self.targets)
+
+    def get(self, target_id: str) -> Optional[RemoteViewingTarget]:
+        return self.by_id.get(target_id)
+
+    def positions(self, *, difficulty: Optional[str] = None, category: Optional[str] = None) -> Sequence[int]:
+        """Catalog positions matching the filters; intersections are cached."""
+        if difficulty is None and category is None:
+            return range(len(self.targets))
+        if category is None:
+            return self.by_difficulty.get(difficulty, ())  # type: ignore[arg-type]
+        if difficulty is None:
+            return self.by_category.get(category, ())
+        key = (difficulty, category)
+        cached = self._positions.get(key)
+        if cached is None:
+            wanted = set(self.by_category.get(category, ()))
+            cached = self._positions[key] = tuple(p for p in self.by_difficulty.get(difficulty, ()) if p in wanted)
+        return cached
+
+    def filter(self, *, difficulty: Optional[str] = None, category: Optional[str] = None) -> Sequence[RemoteViewingTarget]:
+        if difficulty is None and category is None:
+            return self.targets
+        return tuple(self.targets[position] for position in self.positions(difficulty=difficulty, category=category))
+
+    def choose(
+        self, *, difficulty: Optional[str] = None, category: Optional[str] = None, rng: Optional[random.Random] = None
+    ) -> RemoteViewingTarget:
+        randrange = rng.randrange if rng is not None else random.randrange
+        positions = self.positions(difficulty=difficulty, category=category)
+        if not positions:
+            raise LookupError(f"No targets match difficulty={difficulty!r} category={category!r}")
+        return self.targets[positions[randrange(len(positions))]]
+
+
+def load_targets(path: Path) -> list[RemoteViewingTarget]:
+    """Read targets from JSON Lines (``.jsonl``/``.ndjson``) or a JSON document
+    holding an array or ``{"targets": [...]}``."""
+
+    with path.open("r", encoding="utf-8") as handle:
+        if path.suffix in {".jsonl", ".ndjson"}:
+            return [RemoteViewingTarget.from_dict(json.loads(line)) for line in handle if line.strip()]
+        top_level_array = handle.read(4096).lstrip().startswith("[")
+    items = iter_json_array(path, None if top_level_array else "targets")
+    return [RemoteViewingTarget.from_dict(item) for item in items]
+
+
+def catalog_paths() -> list[Path]:
+    return [Path(item).expanduser() for item in os.environ.get(CATALOG_ENV, "").split(os.pathsep) if item.strip()]
+
+
+@lru_cache(maxsize=None)
+def get_catalog() -> TargetCatalog:
+    """Return the bundled targets merged with any external catalogs."""
+    targets: list[RemoteViewingTarget] = list(TARGETS)
+    for path in catalog_paths():
+        targets.extend(load_targets(path))
+    return TargetCatalog(targets)
+
+
+def filter_targets(*, difficulty: RvDifficulty | None = None, category: RvCategory | None = None) -> Sequence[RemoteViewingTarget]:
+    return get_catalog().filter(difficulty=difficulty, category=category)
 
 
 def choose_target(*, difficulty: RvDifficulty | None = None) -> RemoteViewingTarget:
-    candidates = filter_targets(difficulty=difficulty)
-    return choice(candidates)
+    return get_catalog().choose(difficulty=difficulty)
 
 
 def list_categories(targets: Iterable[RemoteViewingTarget]) -> set[RvCategory]:
+    if isinstance(targets, TargetCatalog):
+        return set(targets.by_category)  # type: ignore[arg-type]
     return {target.category for target in targets}
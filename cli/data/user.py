@@ -7,6 +7,8 @@ from typing import Literal
 
 TierLevel = Literal["none", "alpha", "beta", "theta", "gamma"]
 
+TIER_ORDER: dict[TierLevel, int] = {"none": 0, "alpha": 1, "beta": 2, "theta": 3, "gamma": 4}
+
 
 @dataclass(frozen=True)
 class DemoUser:
@@ -2,21 +2,82 @@
 
 from __future__ import annotations
 
-from .menu import Menu, MenuItem
-from .navigation import ENTRIES
+import sys
+from typing import TYPE_CHECKING, Optional, Sequence
+
+if TYPE_CHECKING:  # imported lazily at runtime to keep startup fast
+    from .menu import Menu, SelectionHandler
+    from .warmup import Warmup
+
+RUN_ALL_LABEL = "Run all modules"
 
 
 def run_all() -> None:
+    from .navigation import ENTRIES
+
     for entry in ENTRIES:
         print(f"\n=== {entry.label.upper()} ===\n")
         entry.handler()
 
 
-def main() -> None:
-    actions = [MenuItem(entry.label, entry.handler) for entry in ENTRIES]
-    actions.insert(0, MenuItem("Run all modules", run_all))
-    menu = Menu("ShadowOps Offline Toolkit", actions)
-    menu.show()
+def build_menu(warmup: Optional[Warmup] = None) -> Menu:
+    """Build the top-level menu; subsystems are imported only when selected.
+
+    With a running :class:`~cli.warmup.Warmup`, selecting an entry first
+    focuses the warm-up on that subsystem.
+    """
+
+    from .menu import Menu, MenuItem
+    from .navigation import ENTRIES
+
+    def focused(key: str, handler: SelectionHandler) -> SelectionHandler:
+        def run() -> None:
+            warmup.focus(key)
+            handler()
+
+        return run if warmup else handler
+
+    def palette() -> None:
+        from .palette import run
+
+        run()
+
+    actions = [MenuItem(entry.label, focused(entry.key, entry.handler)) for entry in ENTRIES]
+    actions.insert(0, MenuItem(RUN_ALL_LABEL, run_all))
+    actions.insert(1, MenuItem("Jump to… (command palette)", focused("palette", palette)))
+    return Menu("ShadowOps Offline Toolkit", actions)
+
+
+def interactive() -> None:
+    from .warmup import start_warmup, warmup_enabled
+
+    warmup = start_warmup() if warmup_enabled() else None
+    try:
+        build_menu(warmup).show()
+    finally:
+        if warmup is not None:
+            warmup.cancel()
+            warmup.wait(1.0)
+            print(warmup.format_report(), file=sys.stderr)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    from .profiling import configure, enabled
+
+    argv = configure(sys.argv[1:] if argv is None else list(argv))
+    if argv:
+        # Subcommands never touch the terminal menu layer. A running daemon
+        # answers them when available; otherwise they run in-process, which
+        # is also where profiling has to happen.
+        from .daemon import forward
+
+        status = None if enabled() else forward(argv, sys.stdout, sys.stderr)
+        if status is None:
+            from .commands import run_command
+
+            status = run_command(argv)
+        sys.exit(status)
+    interactive()
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,18 +1,52 @@
-"""Terminal menu helpers."""
+"""Terminal menu helpers.
+
+Long option lists are shown a page at a time and can be narrowed with a
+filter. The filter matches each query word against the start of a word in the
+label through a :class:`PrefixIndex` built once per menu, and on a terminal it
+is re-applied on every keystroke while the query is typed. Built terminal menus
+are cached per page and filter, and :meth:`Menu.lazy` creates a handler only
+for the entry that is selected.
+"""
 
 from __future__ import annotations
 
+import re
+import shutil
+import sys
+from bisect import bisect_left
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Callable, Iterable, List, Optional
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from .profiling import count, span
 
 try:
     from simple_term_menu import TerminalMenu
 except Exception:  # pragma: no cover - runtime guard if dependency missing
     TerminalMenu = None  # type: ignore
 
+try:  # pragma: no cover - not available on Windows
+    import termios
+    import tty
+except ImportError:  # pragma: no cover
+    termios = None  # type: ignore[assignment]
+
 
 SelectionHandler = Callable[[], None]
 
+PAGE_SIZE = 20
+MENU_CACHE_SIZE = 16  # built terminal menus kept per Menu
+PREVIOUS_LABEL = "« Previous page"
+NEXT_LABEL = "Next page »"
+FILTER_LABEL = "Filter…"
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> list[str]:
+    """Lower-cased words of ``text``, as the filter and the palette index them."""
+    return _WORD.findall(text.lower())
+
 
 @dataclass
 class MenuItem:
@@ -22,39 +56,249 @@ class MenuItem:
     handler: SelectionHandler
 
 
+class PrefixIndex:
+    """Sorted ``(word, position)`` pairs answering word-prefix queries by bisection.
+
+    A query matches a label when every query word is a prefix of some word in
+    the label. A query that extends the previous one only re-checks the
+    previous matches, so filtering keystroke by keystroke narrows instead of
+    starting over.
+    """
+
+    def __init__(self, labels: Sequence[str]) -> None:
+        self.label_words = [tuple(words(label)) for label in labels]
+        pairs = sorted({(word, position) for position, label_words in enumerate(self.label_words) for word in label_words})
+        self.words = [word for word, _ in pairs]
+        self.positions = [position for _, position in pairs]
+        self._last: tuple[tuple[str, ...], list[int]] = ((), [])
+
+    def _lookup(self, prefix: str) -> set[int]:
+        start = bisect_left(self.words, prefix)
+        stop = bisect_left(self.words, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        return set(self.positions[start:stop])
+
+    def _matches(self, position: int, terms: tuple[str, ...]) -> bool:
+        label_words = self.label_words[position]
+        return all(any(word.startswith(term) for word in label_words) for term in terms)
+
+    def search(self, query: str) -> Sequence[int]:
+        terms = tuple(words(query))
+        if not terms:
+            return range(len(self.label_words))
+        previous, found = self._last
+        if (
+            previous
+            and len(terms) >= len(previous)
+            and terms[: len(previous) - 1] == previous[:-1]
+            and terms[len(previous) - 1].startswith(previous[-1])
+        ):
+            result = [position for position in found if self._matches(position, terms)]
+        else:
+            hits = self._lookup(terms[0])
+            for term in terms[1:]:
+                hits &= self._lookup(term)
+            result = sorted(hits)
+        self._last = (terms, result)
+        return result
+
+
+@dataclass
+class _View:
+    query: str
+    matches: Sequence[int]  # label positions, in label order
+    page: int = 0
+
+
 class Menu:
     """Wrapper around :class:`simple_term_menu.TerminalMenu` with fallback logic."""
 
-    def __init__(self, title: str, items: Iterable[MenuItem], exit_label: str = "Exit") -> None:
+    def __init__(
+        self, title: str, items: Iterable[MenuItem], exit_label: str = "Exit", *, page_size: int = PAGE_SIZE
+    ) -> None:
+        items = list(items)
+        self._setup(title, [item.label for item in items], lambda index: items[index].handler, exit_label, page_size)
+
+    @classmethod
+    def lazy(
+        cls,
+        title: str,
+        labels: Sequence[str],
+        handler_for: Optional[Callable[[int], SelectionHandler]] = None,
+        exit_label: str = "Exit",
+        *,
+        page_size: int = PAGE_SIZE,
+    ) -> "Menu":
+        """A menu over ``labels`` whose handler is made by ``handler_for(index)`` on selection."""
+        menu = cls.__new__(cls)
+        menu._setup(title, labels, handler_for, exit_label, page_size)
+        return menu
+
+    def _setup(
+        self,
+        title: str,
+        labels: Sequence[str],
+        handler_for: Optional[Callable[[int], SelectionHandler]],
+        exit_label: str,
+        page_size: int,
+    ) -> None:
         self.title = title
-        self.items: List[MenuItem] = list(items)
+        self.labels = labels
         self.exit_label = exit_label
+        self.page_size = max(1, page_size)
+        self._handler_for = handler_for
+        self._index: Optional[PrefixIndex] = None
+        self._view = _View("", range(len(labels)))
+        self._built: OrderedDict[tuple[str, int], Any] = OrderedDict()
+
+    @property
+    def items(self) -> list[MenuItem]:
+        """Entries as :class:`MenuItem`; creates every handler of a lazy menu."""
+        handler_for = self._handler_for or (lambda index: lambda: None)
+        return [MenuItem(label, handler_for(position)) for position, label in enumerate(self.labels)]
+
+    @property
+    def paged(self) -> bool:
+        return len(self.labels) > self.page_size
 
-    def show(self) -> None:
+    def show(self, start: Optional[str] = None) -> None:
+        """Run the menu until exit; ``start`` names an entry to run before the first prompt."""
+        index = None if start is None else list(self.labels).index(start)
         while True:
-            options = [item.label for item in self.items] + [self.exit_label]
-            index = self._prompt(options)
-            if index is None or index == len(options) - 1:
+            if index is None:
+                index = self.pick()
+            if index is None:
                 return
-            self.items[index].handler()
+            if self._handler_for is not None:
+                with span(self.labels[index], "menu", menu=self.title):
+                    self._handler_for(index)()
+            index = None
+
+    def pick(self) -> Optional[int]:
+        """Let the user choose a label; returns its position or ``None`` on exit.
+
+        Paging and filtering are handled here and persist across calls.
+        """
+        while True:
+            action = self._prompt(self._view)
+            if action is None or isinstance(action, int):
+                return action
+            command, value = action
+            if command == "page":
+                pages = max(1, -(-len(self._view.matches) // self.page_size))
+                self._view.page = min(max(0, self._view.page + value), pages - 1)
+            elif command == "filter":
+                query = self._read_filter() if value is None else value
+                if query is not None:
+                    self.filter(query)
+
+    def _read_filter(self) -> Optional[str]:
+        """Type a filter, re-filtering on every keystroke; ``None`` if cancelled.
 
-    def _prompt(self, options: List[str]) -> Optional[int]:
+        Enter keeps the query and Escape restores the previous view. Without a
+        terminal the query is read as one line instead.
+        """
+        if termios is None or not sys.stdin.isatty():
+            return input("Filter (blank to clear): ").strip()
+        fd = sys.stdin.fileno()
+        saved, previous = termios.tcgetattr(fd), self._view
+        query = previous.query
+        try:
+            tty.setcbreak(fd)
+            while True:
+                self.filter(query)
+                self._show_filter(query)
+                char = sys.stdin.read(1)
+                if char in {"\r", "\n"}:
+                    return query.strip()
+                if char in {"\x1b", ""}:
+                    self._view = previous
+                    return None
+                if char in {"\x7f", "\b"}:
+                    query = query[:-1]
+                elif char == "\x15":  # Ctrl-U
+                    query = ""
+                elif char.isprintable():
+                    query += char
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+            sys.stdout.write("\n")
+
+    def _show_filter(self, query: str) -> None:
+        matches = self._view.matches
+        preview = ", ".join(self.labels[position] for position in matches[:5])
+        line = f"Filter: {query}  ({len(matches)} of {len(self.labels)}) {preview}"
+        width = shutil.get_terminal_size().columns - 1
+        sys.stdout.write("\r\x1b[2K" + (line if len(line) <= width else line[: width - 1] + "…"))
+        sys.stdout.flush()
+
+    def filter(self, query: str) -> None:
+        with span("menu.filter", "menu", menu=self.title):
+            if self._index is None:
+                self._index = PrefixIndex(self.labels)
+            self._view = _View(query, self._index.search(query))
+
+    def _page(self, view: _View) -> tuple[list[str], list[Any]]:
+        """Option labels for the current page and the action each one stands for."""
+        start = view.page * self.page_size
+        chosen = view.matches[start : start + self.page_size]
+        options = [self.labels[position] for position in chosen]
+        actions: list[Any] = list(chosen)
+        if view.page > 0:
+            options.append(PREVIOUS_LABEL)
+            actions.append(("page", -1))
+        if start + self.page_size < len(view.matches):
+            options.append(NEXT_LABEL)
+            actions.append(("page", 1))
+        if self.paged or view.query:
+            options.append(FILTER_LABEL)
+            actions.append(("filter", None))
+        options.append(self.exit_label)
+        actions.append(None)
+        return options, actions
+
+    def _heading(self, view: _View) -> str:
+        if not (self.paged or view.query):
+            return self.title
+        pages = max(1, -(-len(view.matches) // self.page_size))
+        status = f"page {view.page + 1}/{pages}, {len(view.matches)} of {len(self.labels)} items"
+        if view.query:
+            status += f", filter {view.query!r}"
+        return f"{self.title} ({status})"
+
+    def _prompt(self, view: _View) -> Any:
         if TerminalMenu is None:
-            return self._fallback_prompt(options)
+            return self._fallback_prompt(view)
 
-        menu = TerminalMenu(options, title=self.title + "\n")
+        key = (view.query, view.page)
+        if key in self._built:
+            count("menu.cache_hits")
+            self._built.move_to_end(key)
+            menu, actions = self._built[key]
+        else:
+            with span("menu.build", "menu", menu=self.title):
+                options, actions = self._page(view)
+                menu = TerminalMenu(options, title=self._heading(view) + "\n")
+            self._built[key] = (menu, actions)
+            if len(self._built) > MENU_CACHE_SIZE:
+                self._built.popitem(last=False)
         selected_index = menu.show()
         if selected_index is None:
             return None
-        return int(selected_index)
+        return actions[int(selected_index)]
 
-    def _fallback_prompt(self, options: List[str]) -> Optional[int]:
-        print(self.title)
+    def _fallback_prompt(self, view: _View) -> Any:
+        options, actions = self._page(view)
+        print(self._heading(view))
         for idx, option in enumerate(options, start=1):
             print(f"{idx}. {option}")
-        raw = input("Select an option (blank to exit): ").strip()
+        hint = " (n/p page, /text filter, blank to exit)" if self.paged or view.query else " (blank to exit)"
+        raw = input(f"Select an option{hint}: ").strip()
         if not raw:
             return None
+        if raw.startswith("/"):
+            return ("filter", raw[1:].strip())
+        if raw.lower() in {"n", "p"} and (self.paged or view.query):
+            return ("page", 1 if raw.lower() == "n" else -1)
         try:
             value = int(raw)
         except ValueError:
@@ -63,4 +307,9 @@ class Menu:
         if value < 1 or value > len(options):
             print("Selection out of range.")
             return None
-        return value - 1
+        return actions[value - 1]
+
+
+def select(title: str, options: Sequence[str], exit_label: str = "Cancel") -> Optional[int]:
+    """Pick one of ``options`` with paging and filtering; ``None`` if cancelled."""
+    return Menu.lazy(title, options, exit_label=exit_label).pick()
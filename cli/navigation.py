@@ -3,23 +3,39 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from importlib import import_module
 from typing import Callable
 
-from .audio import lab as audio_lab
-from .operations import run as ops_manual
-from .research import archive as research_archive
-from .rv import cli as rv_cli
-
 
 @dataclass(frozen=True)
 class NavigationEntry:
+    """A top-level subsystem.
+
+    A subsystem module may export ``ACTIONS``, the ``(label, handler)`` pairs
+    its menu is built from, and then accepts ``run(action)`` to open that menu
+    with the labelled action already run; the command palette lists them.
+    """
+
     label: str
-    handler: Callable[[], None]
+    target: str  # ".module:callable" relative to this package, imported on first use
+    key: str  # subsystem name used by the warm-up stage
+
+    def resolve(self) -> Callable[[], None]:
+        module_name, _, attribute = self.target.partition(":")
+        return getattr(import_module(module_name, __package__), attribute or "run")
+
+    def handler(self) -> None:
+        self.resolve()()
+
+    def actions(self) -> tuple[str, ...]:
+        """Labels of the subsystem's ``ACTIONS``; imports the subsystem module."""
+        module = import_module(self.target.partition(":")[0], __package__)
+        return tuple(label for label, _ in getattr(module, "ACTIONS", ()))
 
 
 ENTRIES: tuple[NavigationEntry, ...] = (
-    NavigationEntry("Operations Manual", ops_manual),
-    NavigationEntry("Research Archive", research_archive.run),
-    NavigationEntry("Audio Frequency Lab", audio_lab.run),
-    NavigationEntry("Remote Viewing Training", rv_cli.run),
+    NavigationEntry("Operations Manual", ".operations:run", "operations"),
+    NavigationEntry("Research Archive", ".research.archive:run", "archive"),
+    NavigationEntry("Audio Frequency Lab", ".audio.lab:run", "audio"),
+    NavigationEntry("Remote Viewing Training", ".rv.cli:run", "rv"),
 )
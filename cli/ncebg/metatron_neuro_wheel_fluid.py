@@ -1,7 +1,9 @@
 # metatron_neuro_wheel_fluid.py
 # Metatron lines reworked for FLUID growth & glow, ray-seeded activation.
 # Based on prior build; same features (bands, nested sub-cycles, curved links, etc.)
-import math, random, time, sys
+import argparse, math, multiprocessing, os, random, sys, time, traceback
+from queue import Empty
+import numpy as np
 import pygame
 
 # ---------------- CONFIG (unchanged basics) ----------------
@@ -53,19 +55,58 @@ GLYPH_KINDS=6
 SEED=None
 if SEED is not None: random.seed(SEED)
 
-pygame.init()
-screen=pygame.display.set_mode((W,H), pygame.SCALED|pygame.RESIZABLE)
-pygame.display.set_caption("Metatron Neuro Wheel — FLUID Lines & Rays")
-clock=pygame.time.Clock()
-font_small=pygame.font.SysFont("Arial",22)
+screen=None; font_small=None
+def setup_display(headless=False):
+    # headless renders go through SDL's dummy video driver: no window, same pixels
+    global screen, font_small
+    if headless: os.environ["SDL_VIDEODRIVER"]="dummy"
+    pygame.init()
+    if headless: screen=pygame.display.set_mode((W,H))
+    else:
+        screen=pygame.display.set_mode((W,H), pygame.SCALED|pygame.RESIZABLE)
+        pygame.display.set_caption("Metatron Neuro Wheel — FLUID Lines & Rays")
+    font_small=pygame.font.SysFont("Arial",22)
+
+# ---------------- Clocks ----------------
+# run() takes any object whose tick() waits for the next frame and returns the seconds it covers.
+class LiveClock:
+    # wall-clock time, frames paced by pygame
+    def __init__(self): self.clock=pygame.time.Clock()
+    def tick(self): return self.clock.tick(FPS_CAP)/1000.0
+class FixedClock:
+    # exactly 1/fps per frame, immediately; offline renders never read the wall clock
+    def __init__(self,fps): self.fps=fps
+    def tick(self): return 1.0/self.fps
+
+# ---------------- Layer pool ----------------
+class LayerPool:
+    # Full-window SRCALPHA layers reused across frames instead of a fresh Surface per draw call.
+    # take() -> draw (mark() the rects pygame.draw returns) -> composite(); the next take()
+    # clears only the marked area. Layers are recreated when the window size changes.
+    def __init__(self): self.size=None; self.layers={}; self.dirty={}
+    def take(self,size,name="fx"):
+        if size!=self.size: self.size=size; self.layers.clear(); self.dirty.clear()
+        layer=self.layers.get(name)
+        if layer is None: layer=self.layers[name]=pygame.Surface(size, pygame.SRCALPHA)
+        r=self.dirty.get(name)
+        if r is not None: layer.fill((0,0,0,0),r)
+        self.dirty[name]=None
+        return layer
+    def mark(self,rect,name="fx"):
+        r=self.dirty[name]; self.dirty[name]=rect if r is None else r.union(rect)
+        return rect
+    def composite(self,surf,name="fx"):
+        r=self.dirty[name]
+        if r is not None: surf.blit(self.layers[name],r,r)  # one blit of the union: no double blending
+POOL=LayerPool()
 
 def cxcy(): return screen.get_width()//2, screen.get_height()//2
 def ring_points(cx,cy,r,n,phase=0.0):
     return [(cx+r*math.cos(2*math.pi*i/n+phase), cy+r*math.sin(2*math.pi*i/n+phase)) for i in range(n)]
 def draw_circle(surf,color,center,r,width=1,alpha=None):
-    s=pygame.Surface(surf.get_size(), pygame.SRCALPHA)
+    s=POOL.take(surf.get_size())
     col=color if alpha is None else (color[0],color[1],color[2],alpha)
-    pygame.draw.circle(s,col,center,r,width); surf.blit(s,(0,0))
+    POOL.mark(pygame.draw.circle(s,col,center,r,width)); POOL.composite(surf)
 def poly_points(x,y,sides,r,rot=0.0):
     return [(x+r*math.cos(2*math.pi*i/sides+rot), y+r*math.sin(2*math.pi*i/sides+rot)) for i in range(sides)]
 def quad_bezier(p0,p1,p2,samples):
@@ -74,53 +115,62 @@ def quad_bezier(p0,p1,p2,samples):
         t=i/float(samples); u=1-t
         pts.append((u*u*p0[0]+2*u*t*p1[0]+t*t*p2[0], u*u*p0[1]+2*u*t*p1[1]+t*t*p2[1]))
     return pts
-def angle_of_point(cx,cy,p): return math.atan2(p[1]-cy, p[0]-cx)
+def ring_array(cx,cy,r,n,phase=0.0):
+    # ring_points as an (n,2) array
+    a=2*math.pi*np.arange(n)/n+phase
+    return np.stack((cx+r*np.cos(a), cy+r*np.sin(a)),axis=1)
+def angles_of(cx,cy,pts): return np.arctan2(pts[:,1]-cy, pts[:,0]-cx)
+def ray_distance(ang,rays):
+    # angular distance from each angle in ang to the nearest ray: (len(ang),) array
+    diff=ang[:,None]-np.asarray(rays)[None,:]
+    return np.abs(np.arctan2(np.sin(diff), np.cos(diff))).min(axis=1)
 
 # ---------------- Background stack ----------------
-def draw_tundra(surf,t):
+def draw_tundra(surf):
     W,H=surf.get_width(), surf.get_height()
-    sky=pygame.Surface((W,H//2)); sky.fill((12,16,24))
-    ground=pygame.Surface((W,H//2)); ground.fill((16,20,24))
-    surf.blit(sky,(0,0)); surf.blit(ground,(0,H//2))
-    m=pygame.Surface((W,H//2), pygame.SRCALPHA)
+    surf.fill((12,16,24),(0,0,W,H//2)); surf.fill((16,20,24),(0,H//2,W,H//2))
+    m=POOL.take(surf.get_size())
+    m.set_clip((0,0,W,H//2))  # the mountains layer used to be half height
     for i in range(6):
         x0=int(W*(i/5)); h=int(H*0.16+0.06*H*math.sin(0.7*i))
-        pygame.draw.polygon(m,(150,160,170,24),[(x0-240,H//2),(x0+30,H//2-h),(x0+280,H//2)])
-    surf.blit(m,(0,0))
-    s=pygame.Surface((W,H), pygame.SRCALPHA)
+        POOL.mark(pygame.draw.polygon(m,(150,160,170,24),[(x0-240,H//2),(x0+30,H//2-h),(x0+280,H//2)]))
+    m.set_clip(None); POOL.composite(surf)
+def draw_stars(surf,t):
+    W,H=surf.get_width(), surf.get_height()
+    s=POOL.take(surf.get_size())
     for k in range(70):
         a=(k*0.9+0.2*t)%(2*math.pi); r=(t*35+k*28)%(min(W,H)//2)
         x=W//2+int(r*math.cos(a)); y=H//2+int(r*math.sin(a)*0.55)
-        pygame.draw.circle(s,(220,220,240,26),(x,y),2)
-    surf.blit(s,(0,0))
+        POOL.mark(pygame.draw.circle(s,(220,220,240,26),(x,y),2))
+    POOL.composite(surf)
 def draw_reticle(surf,t):
     cx,cy=cxcy(); a=60+int(30*math.sin(t*math.pi*0.8))
-    s=pygame.Surface(surf.get_size(), pygame.SRCALPHA)
-    pygame.draw.circle(s,(FG[0],FG[1],FG[2],a),(cx,cy),36,2)
-    pygame.draw.line(s,(FG[0],FG[1],FG[2],a),(cx-48,cy),(cx+48,cy),1)
-    pygame.draw.line(s,(FG[0],FG[1],FG[2],a),(cx,cy-48),(cx,cy+48),1)
-    surf.blit(s,(0,0))
+    s=POOL.take(surf.get_size())
+    POOL.mark(pygame.draw.circle(s,(FG[0],FG[1],FG[2],a),(cx,cy),36,2))
+    POOL.mark(pygame.draw.line(s,(FG[0],FG[1],FG[2],a),(cx-48,cy),(cx+48,cy),1))
+    POOL.mark(pygame.draw.line(s,(FG[0],FG[1],FG[2],a),(cx,cy-48),(cx,cy+48),1))
+    POOL.composite(surf)
 def draw_g_wheel(surf,t,g=0.60):
-    cx,cy=cxcy(); s=pygame.Surface(surf.get_size(), pygame.SRCALPHA)
+    cx,cy=cxcy(); s=POOL.take(surf.get_size())
     for i in range(6):
         R=int((100+70*i)*(1+0.18*math.sin(t*0.42)*g))
-        pygame.draw.circle(s,(210,30,30,22),(cx,cy),R,1)
-    surf.blit(s,(0,0))
+        POOL.mark(pygame.draw.circle(s,(210,30,30,22),(cx,cy),R,1))
+    POOL.composite(surf)
 def draw_channel_overlay(surf,t,hz,color,radius,alpha=28,boost=0.0):
-    cx,cy=cxcy(); s=pygame.Surface(surf.get_size(), pygame.SRCALPHA)
+    cx,cy=cxcy(); s=POOL.take(surf.get_size())
     r=int(radius*(1+0.10*math.sin(t*hz*math.tau)))
     a=int(alpha*(1+1.5*boost))
-    pygame.draw.circle(s,(color[0],color[1],color[2],a),(cx,cy),r,2); surf.blit(s,(0,0))
+    POOL.mark(pygame.draw.circle(s,(color[0],color[1],color[2],a),(cx,cy),r,2)); POOL.composite(surf)
 
 # ---------------- Base rosette ----------------
-def draw_base_rings():
+def draw_base_rings(surf):
     cx,cy=cxcy()
     for k,a in enumerate([ALPHA_SOFT]*3):
-        draw_circle(screen,FG,(cx,cy),int(BASE_RADIUS*(0.70+0.15*k)),RING_WIDTH,a)
+        draw_circle(surf,FG,(cx,cy),int(BASE_RADIUS*(0.70+0.15*k)),RING_WIDTH,a)
     petal_r=int(BASE_RADIUS*0.60); node_r=int(BASE_RADIUS*0.36)
     for (x,y) in ring_points(cx,cy,petal_r,6,0.0):
-        draw_circle(screen,FG,(int(x),int(y)),node_r,RING_WIDTH,ALPHA_SOFT+8)
-    draw_circle(screen,FG,(cx,cy),node_r,RING_WIDTH,ALPHA_SOFT+14)
+        draw_circle(surf,FG,(int(x),int(y)),node_r,RING_WIDTH,ALPHA_SOFT+8)
+    draw_circle(surf,FG,(cx,cy),node_r,RING_WIDTH,ALPHA_SOFT+14)
 
 # ---------------- Fluid Metatron ----------------
 def metatron_points(cx,cy,r):
@@ -139,85 +189,95 @@ def all_segments(pts):
     return segs
 
 class FluidMetatron:
-    def __init__(self):
-        self.cx,self.cy=cxcy()
+    def __init__(self,cx,cy):
+        self.cx,self.cy=cx,cy
         self.base_r=int(BASE_RADIUS*0.58)
         self.pts=metatron_points(self.cx,self.cy,self.base_r)
         self.segs=all_segments(self.pts)
+        # segment geometry as arrays; midpoints are fixed, so their ray angle and weight are too
+        seg=np.array(self.segs,dtype=float)
+        self.seg_a=seg[:,0]; self.seg_d=seg[:,1]-seg[:,0]
+        mid=(seg[:,0]+seg[:,1])/2.0
+        self.mid_ang=angles_of(self.cx,self.cy,mid)
+        # more weight near the center (shorter segs = less visual clutter)
+        dist=((mid[:,0]-self.cx)**2 + (mid[:,1]-self.cy)**2)**0.5
+        self.weight=0.65 + 0.35*np.maximum(0.0, 1.0 - dist/(self.base_r*1.4))
         # state per segment: progress in [0..1] of visible length
-        self.state=[0.0]*len(self.segs)
-        self.target=[0.0]*len(self.segs)    # desired progress
-        self.ray_angles=[i*math.tau/RAY_COUNT for i in range(RAY_COUNT)]
-        self.smooth_angles=self.ray_angles[:]
+        self.state=np.zeros(len(self.segs))
+        self.target=np.zeros(len(self.segs))    # desired progress
+        self.ray_angles=np.arange(RAY_COUNT)*math.tau/RAY_COUNT
+        self.smooth_angles=self.ray_angles.copy()
 
     def update_rays(self, t):
         # desired angles (pure sweep)
         base = t*RAY_SWEEP_HZ*math.tau
-        desired=[(base+i*math.tau/RAY_COUNT)% (2*math.pi) for i in range(RAY_COUNT)]
-        # low-pass + micro jitter
-        for i in range(RAY_COUNT):
-            jitter=(random.random()-0.5)*RAY_MICRO_JITTER
-            d=math.atan2(math.sin(desired[i]-self.smooth_angles[i]), math.cos(desired[i]-self.smooth_angles[i]))
-            self.smooth_angles[i]=(self.smooth_angles[i]+d*RAY_SMOOTH + jitter)%(2*math.pi)
-
-    def gate(self, p):
-        # distance (angle) to nearest smoothed ray
-        ang=angle_of_point(self.cx,self.cy,p)
-        d=min(abs(math.atan2(math.sin(ang-r), math.cos(ang-r))) for r in self.smooth_angles)
-        return d < math.radians(RAY_SPREAD_DEG), 1.0 - min(1.0, d/math.radians(RAY_SPREAD_DEG))
+        desired=(base+self.ray_angles)%(2*math.pi)
+        # low-pass + micro jitter (drawn one ray at a time, as before, to keep seeded runs stable)
+        jitter=(np.array([random.random() for _ in range(RAY_COUNT)])-0.5)*RAY_MICRO_JITTER
+        diff=desired-self.smooth_angles
+        d=np.arctan2(np.sin(diff), np.cos(diff))
+        self.smooth_angles=(self.smooth_angles+d*RAY_SMOOTH + jitter)%(2*math.pi)
 
     def step_targets(self):
-        # for each segment, set target visibility by whether its midpoint is near any ray
-        for i,(a,b) in enumerate(self.segs):
-            mid=((a[0]+b[0])/2.0, (a[1]+b[1])/2.0)
-            ok,k=self.gate(mid)
-            # more weight near the center (shorter segs = less visual clutter)
-            dist=( (mid[0]-self.cx)**2 + (mid[1]-self.cy)**2 )**0.5
-            w=0.65 + 0.35*max(0.0, 1.0 - dist/(self.base_r*1.4))
-            self.target[i]=k*w if ok else 0.0
+        # target visibility of each segment by how close its midpoint is to the nearest ray
+        spread=math.radians(RAY_SPREAD_DEG)
+        d=ray_distance(self.mid_ang,self.smooth_angles)
+        k=1.0 - np.minimum(1.0, d/spread)
+        self.target=np.where(d<spread, k*self.weight, 0.0)
 
     def ease(self,x):
         # smoothstep-ish; sharper with SEG_EASE
-        a=max(0.0,min(1.0,x))
-        return a**(1+SEG_EASE*2) / (a**(1+SEG_EASE*2) + (1-a)**(1+SEG_EASE*2) + 1e-6)
+        a=np.clip(x,0.0,1.0); e=1+SEG_EASE*2
+        return a**e / (a**e + (1-a)**e + 1e-6)
 
     def update_progress(self, dt):
         # grow/decay toward target smoothly
-        for i in range(len(self.segs)):
-            trg=self.target[i]; cur=self.state[i]
-            if trg>cur:
-                cur=min(1.0, cur + SEG_GROW_SPEED*dt*self.ease(1-cur))
-            else:
-                cur=max(0.0, cur - SEG_DECAY_SPEED*dt*self.ease(cur))
-            self.state[i]=cur
-
-    def draw(self, surf):
-        base = pygame.Surface(surf.get_size(), pygame.SRCALPHA)
-        # faint net (very soft)
+        cur=self.state
+        self.state=np.where(self.target>cur,
+                            np.minimum(1.0, cur + SEG_GROW_SPEED*dt*self.ease(1-cur)),
+                            np.maximum(0.0, cur - SEG_DECAY_SPEED*dt*self.ease(cur)))
+
+    def draw_net(self, surf):
+        # faint net (very soft); static, so it is baked into the StaticScene
+        base = POOL.take(surf.get_size())
         for a,b in self.segs:
-            pygame.draw.line(base,(FG[0],FG[1],FG[2],22),a,b,1)
-        surf.blit(base,(0,0))
-
-        hi = pygame.Surface(surf.get_size(), pygame.SRCALPHA)
-        for (a,b), prog in zip(self.segs, self.state):
-            if prog<=0: continue
-            # draw partial line A -> lerp(A,B,prog)
-            px = a[0] + (b[0]-a[0])*prog
-            py = a[1] + (b[1]-a[1])*prog
-            p_end=(px,py)
+            POOL.mark(pygame.draw.line(base,(FG[0],FG[1],FG[2],22),a,b,1))
+        POOL.composite(surf)
+
+    def draw(self, surf, progress=None):
+        # progress: per-segment progress to show (interpolated between steps); defaults to state
+        progress=self.state if progress is None else progress
+        hi = POOL.take(surf.get_size())
+        # partial lines A -> lerp(A,B,prog)
+        ends=self.seg_a + self.seg_d*progress[:,None]
+        for i in np.flatnonzero(progress>0):
+            a=self.segs[i][0]; p_end=tuple(ends[i])
             # halo + glow + core strokes
             widths=SEG_GLOW_WIDTHS
             alphas=(SEG_SOFT_ALPHA, int(SEG_SOFT_ALPHA*1.8), SEG_GLOW_ALPHA)
             for w,al in zip(widths, alphas):
-                pygame.draw.line(hi,(255,180,180,al),a,p_end,w)
-        surf.blit(hi,(0,0))
+                POOL.mark(pygame.draw.line(hi,(255,180,180,al),a,p_end,w))
+        POOL.composite(surf)
+
+# ---------------- Static scene cache ----------------
+class StaticScene:
+    # BG, sky/ground, mountains, base rosette and the faint Metatron net pre-rendered into one
+    # opaque surface. Rebuilt only when the window size or the config they read changes.
+    def __init__(self): self.key=None; self.surf=None
+    def blit(self,surf,fm):
+        key=(surf.get_size(),BG,FG,BASE_RADIUS,RING_WIDTH,ALPHA_SOFT,fm.cx,fm.cy,fm.base_r)
+        if key!=self.key:
+            self.key=key; self.surf=pygame.Surface(surf.get_size()); self.surf.fill(BG)
+            draw_tundra(self.surf); draw_base_rings(self.surf); fm.draw_net(self.surf)
+        surf.blit(self.surf,(0,0))
+STATIC=StaticScene()
 
 # ---------------- Rings/Glyphs & links ----------------
 def draw_ring_icons(pts,size,kinds,alpha=108):
-    s=pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+    s=POOL.take(screen.get_size())
     for i,(x,y) in enumerate(pts):
         g=kinds[i]%GLYPH_KINDS; col=(FG[0],FG[1],FG[2],alpha)
-        pygame.draw.circle(s,col,(int(x),int(y)),size,2); rot=i*0.3
+        POOL.mark(pygame.draw.circle(s,col,(int(x),int(y)),size,2)); rot=i*0.3  # glyphs stay inside this circle
         if g==0: pygame.draw.polygon(s,col,poly_points(x,y,3,int(size*0.9),rot),2)
         elif g==1: pygame.draw.polygon(s,col,poly_points(x,y,6,int(size*0.9),rot),2)
         elif g==2:
@@ -232,25 +292,35 @@ def draw_ring_icons(pts,size,kinds,alpha=108):
                 pygame.draw.circle(s,col,(int(x+size*0.7*math.cos(a)), int(y+size*0.7*math.sin(a))),2,2)
         else:
             pygame.draw.arc(s,col,(x-size,y-size,2*size,2*size),rot,rot+math.pi*0.8,2)
-    screen.blit(s,(0,0))
-def draw_links(surf,links):
-    now=time.time(); s=pygame.Surface(surf.get_size(), pygame.SRCALPHA); cx,cy=cxcy()
-    for ev in list(links):
-        life=(now-ev["t0"])/LINK_TTL
-        if life>=1.0: links.remove(ev); continue
+    POOL.composite(screen)
+def handoff_candidates(inner_pts,pts,phi_inner,cx,cy,rays):
+    # for each point of pts: the nearest inner slot, and whether it is close enough and lit by a ray
+    ang=angles_of(cx,cy,pts)
+    ni=np.round(((ang - phi_inner)%(2*math.pi))/(2*math.pi/INNER_N)).astype(int)%INNER_N
+    near=inner_pts[ni]; diff=ang-angles_of(cx,cy,near)
+    ok=np.abs(np.arctan2(np.sin(diff), np.cos(diff)))<HANDOFF_ANG_THRESH
+    if RAYS_ON:
+        ok&=ray_distance(angles_of(cx,cy,(near+pts)/2),rays)<math.radians(RAY_SPREAD_DEG) if len(rays) else False
+    return ni, ok
+def prune_links(links,now): links[:]=[ev for ev in links if (now-ev["t0"])/LINK_TTL<1.0]
+def draw_links(surf,links,now):
+    s=POOL.take(surf.get_size()); cx,cy=cxcy()
+    for ev in links:
+        life=max(0.0,(now-ev["t0"])/LINK_TTL)  # a link born this step starts at full strength
+        if life>=1.0: continue
         p0=ev["p_in"]; p2=ev["p_out"]; mid=((p0[0]+p2[0])/2.0,(p0[1]+p2[1])/2.0)
         ctrl=(mid[0]+(cx-mid[0])*LINK_INNER_PULL, mid[1]+(cy-mid[1])*LINK_INNER_PULL)
         pts=quad_bezier(p0,ctrl,p2,LINK_SAMPLES); a=int(150*(1.0-life))
         for i in range(len(pts)-1):
-            pygame.draw.line(s,(FG[0],FG[1],FG[2],a),pts[i],pts[i+1],2)
-    surf.blit(s,(0,0))
+            POOL.mark(pygame.draw.line(s,(FG[0],FG[1],FG[2],a),pts[i],pts[i+1],2))
+    POOL.composite(surf)
 
 def draw_center_pulse(surf,t,hz):
     cx,cy=cxcy()
     r=int(104+26*math.sin(t*hz*math.tau))
     a=max(0,min(255,int(CENTER_ALPHA+60*math.sin(t*hz*math.tau+math.pi/2))))
-    s=pygame.Surface(surf.get_size(), pygame.SRCALPHA)
-    pygame.draw.circle(s,(200,40,40,a),(cx,cy),max(34,r)); surf.blit(s,(0,0))
+    s=POOL.take(surf.get_size())
+    POOL.mark(pygame.draw.circle(s,(200,40,40,a),(cx,cy),max(34,r))); POOL.composite(surf)
 
 # ---------------- Band scheduler (same logic as previous) ----------------
 BAND_SCHEDULE=[("gamma",40.0,15.0), ("alpha",10.0,60.0), ("beta",14.0,60.0), ("theta",8.0,60.0)]
@@ -263,21 +333,126 @@ def band_params(name):
     else:               inner=0.18; mid=0.18*0.95; outer=-0.18*1.05; ch=(False,True,True)
     return inner,mid,outer,ch
 
-# ---------------- Main ----------------
-def run():
-    global CENTER_PULSE_HZ, SPEED_TRIM
-    start=time.time()
-    inner_kinds=[i%GLYPH_KINDS for i in range(INNER_N)]
-    mid_kinds=[(i*3)%GLYPH_KINDS for i in range(MID_N)]
-    outer_kinds=[(i*2)%GLYPH_KINDS for i in range(OUTER_N)]
-    inner_last=[0.0]*INNER_N; mid_last=[0.0]*MID_N; outer_last=[0.0]*OUTER_N
-    links=[]
+# ---------------- Simulation ----------------
+SIM_HZ=120               # fixed simulation rate, independent of the frame rate
+SIM_DT=1.0/SIM_HZ
+MAX_FRAME_DT=0.25        # longer stalls are dropped (the scene pauses) rather than caught up
+
+class WheelSim:
+    # Everything the scene animates: band schedule, ring phases, Metatron rays/segments,
+    # glyph handoffs and links. Advanced only by step(), SIM_DT at a time; reads the config
+    # globals (SPEED_TRIM, RAYS_ON, ...) but never pygame or the wall clock.
+    def __init__(self,center=(W//2,H//2)):
+        self.cx,self.cy=center
+        self.ticks=0; self.t=0.0
+        self.inner_kinds=[i%GLYPH_KINDS for i in range(INNER_N)]
+        self.mid_kinds=[(i*3)%GLYPH_KINDS for i in range(MID_N)]
+        self.outer_kinds=[(i*2)%GLYPH_KINDS for i in range(OUTER_N)]
+        self.inner_last=[-math.inf]*INNER_N  # no cooldown pending at start
+        self.links=[]
+        self.schedule_index=0; self.sub_phase=None; self.sub_index=0; self.sub_start=0.0
+        self.band_start_t=0.0; self.burst_until=BURST_LEN
+        self.center_hz=BAND_SCHEDULE[0][1]; self.chmask=band_params(BAND_SCHEDULE[0][0])[3]; self.burst_boost=1.0
+        self.FM=FluidMetatron(self.cx,self.cy)
+        self.phis=(0.0,0.0,0.0)
+        self.prev_phis=self.phis; self.prev_progress=self.FM.state
+
+    def band(self): return BAND_SCHEDULE[self.schedule_index][0]
+
+    def step(self):
+        self.prev_phis=self.phis; self.prev_progress=self.FM.state  # update_progress makes a new array
+        self.ticks+=1; now=self.t=self.ticks*SIM_DT  # from the tick count: no drift over long runs
+
+        band_name,band_freq,band_dur=BAND_SCHEDULE[self.schedule_index]
+        self.center_hz=band_freq
+        time_in_band=now-self.band_start_t
+        self.burst_boost=max(0.0, min(1.0,(self.burst_until-now)/BURST_LEN)) if now<self.burst_until else 0.0
+
+        if band_name=="theta":
+            if self.sub_phase is None:
+                self.sub_phase="outer"; self.sub_index=0; self.sub_start=now
+            sub_list = SUBCYCLE_OUTER if self.sub_phase=="outer" else SUBCYCLE_MID
+            s_name,s_freq,s_dur=sub_list[self.sub_index]
+            if now-self.sub_start>=s_dur:
+                self.sub_index+=1
+                if self.sub_index>=len(sub_list):
+                    if self.sub_phase=="outer":
+                        self.sub_phase="mid"; self.sub_index=0
+                    else:
+                        self.sub_phase="done"
+                self.sub_start=now
+            base_inner,base_mid,base_outer,chmask=band_params("theta")
+            if self.sub_phase=="outer": _,_,o,_=band_params(s_name); base_outer=o
+            elif self.sub_phase=="mid": _,m,_,_=band_params(s_name); base_mid=m
+            inner_hz=base_inner*SPEED_TRIM; mid_hz=base_mid*SPEED_TRIM; outer_hz=base_outer*SPEED_TRIM
+        else:
+            inner_hz,mid_hz,outer_hz,chmask=band_params(band_name)
+            inner_hz*=SPEED_TRIM; mid_hz*=SPEED_TRIM; outer_hz*=SPEED_TRIM
+        self.chmask=chmask
 
-    schedule_index=0; sub_phase=None; sub_index=0
-    band_start_t=time.time(); burst_until=band_start_t+BURST_LEN
+        if time_in_band>=band_dur and band_name!="theta":
+            self.schedule_index=min(len(BAND_SCHEDULE)-1, self.schedule_index+1)
+            self.band_start_t=now; self.burst_until=now+BURST_LEN
+        if band_name=="theta" and self.sub_phase=="done" and time_in_band>=band_dur:
+            self.schedule_index=0; self.band_start_t=now; self.sub_phase=None; self.burst_until=now+BURST_LEN
 
-    # Fluid Metatron instance
-    FM=FluidMetatron()
+        self.phis=(2*math.pi*inner_hz*now, 2*math.pi*mid_hz*now, 2*math.pi*outer_hz*now)
+
+        # --- FLUID METATRON ---
+        if RAYS_ON:
+            self.FM.update_rays(now)
+        self.FM.step_targets()
+        self.FM.update_progress(SIM_DT)
+
+        # handoffs: inner↔outer, then inner↔mid; the cooldown check stays sequential as they share inner slots
+        cx,cy=self.cx,self.cy; phi_inner,phi_mid,phi_outer=self.phis
+        inner_pts=ring_array(cx,cy,INNER_R,INNER_N,phi_inner)
+        for pts,kinds in ((ring_array(cx,cy,OUTER_R,OUTER_N,phi_outer),self.outer_kinds),
+                          (ring_array(cx,cy,MID_R,MID_N,phi_mid),self.mid_kinds)):
+            near,ok=handoff_candidates(inner_pts,pts,phi_inner,cx,cy,self.FM.smooth_angles)
+            for oi in np.flatnonzero(ok):
+                ni=int(near[oi])
+                if (now-self.inner_last[ni])>HANDOFF_COOLDOWN:
+                    kinds[oi]=self.inner_kinds[ni]; self.inner_kinds[ni]=(self.inner_kinds[ni]+1)%GLYPH_KINDS
+                    self.inner_last[ni]=now; self.links.append({"t0":now,"p_in":tuple(inner_pts[ni]),"p_out":tuple(pts[oi])})
+        prune_links(self.links,now)
+
+    # rendering state, alpha of the way from the previous step to the current one
+    def render_time(self,alpha): return max(0.0,(self.ticks-1+alpha)*SIM_DT)
+    def phases(self,alpha): return tuple(p+(c-p)*alpha for p,c in zip(self.prev_phis,self.phis))
+    def progress(self,alpha): return self.prev_progress+(self.FM.state-self.prev_progress)*alpha
+
+# ---------------- Drawing ----------------
+def draw_scene(surf,sim,alpha):
+    t=sim.render_time(alpha); phi_inner,phi_mid,phi_outer=sim.phases(alpha); cx,cy=sim.cx,sim.cy
+    ch10,ch25,ch50=sim.chmask
+    STATIC.blit(surf,sim.FM)  # animated layers below are composited on top
+    draw_stars(surf,t); draw_g_wheel(surf,t,G_VISUAL)
+    if SHOW_CH_10 and ch10: draw_channel_overlay(surf,t,1.0,(200,200,200),100,24,sim.burst_boost)
+    if SHOW_CH_25 and ch25: draw_channel_overlay(surf,t,10.0,(0,200,200),180,30,sim.burst_boost)
+    if SHOW_CH_50 and ch50: draw_channel_overlay(surf,t,8.0,(200,0,200),260,36,sim.burst_boost)
+
+    sim.FM.draw(surf,sim.progress(alpha))
+
+    draw_ring_icons(ring_array(cx,cy,INNER_R,INNER_N,phi_inner),INNER_SIZE,sim.inner_kinds,alpha=104)
+    draw_ring_icons(ring_array(cx,cy,MID_R,  MID_N,  phi_mid),  MID_SIZE,  sim.mid_kinds,  alpha=98)
+    draw_ring_icons(ring_array(cx,cy,OUTER_R,OUTER_N,phi_outer),OUTER_SIZE,sim.outer_kinds,alpha=132)
+
+    draw_links(surf,sim.links,t)
+    draw_center_pulse(surf,t,sim.center_hz); draw_reticle(surf,t)
+
+    hint=font_small.render(f"{sim.band().upper()}   speed x{SPEED_TRIM:.2f}", True,(120,120,135))
+    surf.blit(hint,(16,surf.get_height()-36))
+
+# ---------------- Main ----------------
+def run(clock=None, frames=None, on_frame=None):
+    # Live window when frames is None. Offline: the clock drives every frame up to frames.stop,
+    # only those in frames are drawn, and each is handed to on_frame(index).
+    # The simulation always advances in SIM_DT steps: a slow frame runs several steps before the
+    # next draw (frames are skipped, not the simulation) and drawing interpolates between steps.
+    global CENTER_PULSE_HZ, SPEED_TRIM
+    live=frames is None; clock=clock or LiveClock()
+    sim=WheelSim(cxcy()); acc=0.0
 
     def hud():
         return font_small.render(
@@ -285,11 +460,12 @@ def run():
             True,(120,120,135))
     hint=hud()
 
+    frame=-1
     while True:
-        dt=clock.tick(FPS_CAP)/1000.0
-        now=time.time(); t=now-start
+        if not live and frame+1>=frames.stop: return
+        acc+=min(clock.tick(),MAX_FRAME_DT); frame+=1
 
-        for e in pygame.event.get():
+        for e in (pygame.event.get() if live else ()):
             if e.type==pygame.QUIT: pygame.quit(); sys.exit(0)
             if e.type==pygame.KEYDOWN:
                 if e.key==pygame.K_ESCAPE: pygame.quit(); sys.exit(0)
@@ -308,106 +484,97 @@ def run():
                         if f.type==pygame.KEYDOWN and f.key==pygame.K_r: return
                 elif e.key==pygame.K_r: return
 
-        band_name,band_freq,band_dur=BAND_SCHEDULE[schedule_index]
-        CENTER_PULSE_HZ=band_freq
-        time_in_band=now-band_start_t
-        burst_boost=max(0.0, min(1.0,(burst_until-now)/BURST_LEN)) if now<burst_until else 0.0
+        while acc>=SIM_DT:
+            sim.step(); acc-=SIM_DT
+        if not (live or frame in frames): continue
 
-        if band_name=="theta":
-            if sub_phase is None:
-                sub_phase="outer"; sub_index=0; sub_start=now
-            sub_list = SUBCYCLE_OUTER if sub_phase=="outer" else SUBCYCLE_MID
-            s_name,s_freq,s_dur=sub_list[sub_index]
-            if now-sub_start>=s_dur:
-                sub_index+=1
-                if sub_index>=len(sub_list):
-                    if sub_phase=="outer":
-                        sub_phase="mid"; sub_index=0
-                    else:
-                        sub_phase="done"
-                sub_start=now
-            base_inner,base_mid,base_outer,chmask=band_params("theta")
-            if sub_phase=="outer": _,_,o,_=band_params(s_name); base_outer=o
-            elif sub_phase=="mid": _,m,_,_=band_params(s_name); base_mid=m
-            inner_hz=base_inner*SPEED_TRIM; mid_hz=base_mid*SPEED_TRIM; outer_hz=base_outer*SPEED_TRIM
-            ch10,ch25,ch50=chmask
-        else:
-            inner_hz,mid_hz,outer_hz,chmask=band_params(band_name)
-            inner_hz*=SPEED_TRIM; mid_hz*=SPEED_TRIM; outer_hz*=SPEED_TRIM
-            ch10,ch25,ch50=chmask
-
-        if time_in_band>=band_dur and band_name!="theta":
-            schedule_index=min(len(BAND_SCHEDULE)-1, schedule_index+1)
-            band_start_t=now; burst_until=now+BURST_LEN
-        if band_name=="theta" and sub_phase=="done" and time_in_band>=band_dur:
-            schedule_index=0; band_start_t=now; sub_phase=None; burst_until=now+BURST_LEN
-
-        phi_inner=2*math.pi*inner_hz*(now-start)
-        phi_mid  =2*math.pi*mid_hz  *(now-start)
-        phi_outer=2*math.pi*outer_hz*(now-start)
-
-        # DRAW
-        screen.fill(BG)
-        draw_tundra(screen,t); draw_g_wheel(screen,t,G_VISUAL)
-        if SHOW_CH_10 and ch10: draw_channel_overlay(screen,t,1.0,(200,200,200),100,24,burst_boost)
-        if SHOW_CH_25 and ch25: draw_channel_overlay(screen,t,10.0,(0,200,200),180,30,burst_boost)
-        if SHOW_CH_50 and ch50: draw_channel_overlay(screen,t,8.0,(200,0,200),260,36,burst_boost)
-
-        draw_base_rings()
-
-        # --- FLUID METATRON ---
-        if RAYS_ON:
-            FM.update_rays(now-start)
-        FM.step_targets()
-        FM.update_progress(dt)
-        FM.draw(screen)
-        lit_ray_angles = FM.smooth_angles if RAYS_ON else []
-
-        # RINGS
-        cx,cy=cxcy()
-        inner_pts=ring_points(cx,cy,INNER_R,INNER_N,phi_inner)
-        mid_pts  =ring_points(cx,cy,MID_R,  MID_N,  phi_mid)
-        outer_pts=ring_points(cx,cy,OUTER_R,OUTER_N,phi_outer)
-
-        draw_ring_icons(inner_pts,INNER_SIZE,inner_kinds,alpha=104)
-        draw_ring_icons(mid_pts,  MID_SIZE,  mid_kinds,  alpha=98)
-        draw_ring_icons(outer_pts,OUTER_SIZE,outer_kinds,alpha=132)
-
-        def gate_by_rays(p):
-            if not RAYS_ON: return True
-            ang=angle_of_point(cx,cy,p)
-            d=min(abs(math.atan2(math.sin(ang-r), math.cos(ang-r))) for r in lit_ray_angles) if lit_ray_angles else 10.0
-            return d < math.radians(RAY_SPREAD_DEG)
-
-        nowT=time.time()
-        # inner↔outer
-        for oi,(ox,oy) in enumerate(outer_pts):
-            o_ang=math.atan2(oy-cy,ox-cx)
-            ni=round(((o_ang - phi_inner)%(2*math.pi))/(2*math.pi/INNER_N))%INNER_N
-            ix,iy=inner_pts[ni]; i_ang=math.atan2(iy-cy,ix-cx)
-            d=math.atan2(math.sin(o_ang-i_ang), math.cos(o_ang-i_ang))
-            if abs(d)<HANDOFF_ANG_THRESH and (nowT-inner_last[ni])>HANDOFF_COOLDOWN and gate_by_rays(((ix+ox)/2,(iy+oy)/2)):
-                outer_kinds[oi]=inner_kinds[ni]; inner_kinds[ni]=(inner_kinds[ni]+1)%GLYPH_KINDS
-                inner_last[ni]=nowT; links.append({"t0":nowT,"p_in":(ix,iy),"p_out":(ox,oy)})
-        # inner↔mid
-        for mi,(mx,my) in enumerate(mid_pts):
-            m_ang=math.atan2(my-cy,mx-cx)
-            ni=round(((m_ang - phi_inner)%(2*math.pi))/(2*math.pi/INNER_N))%INNER_N
-            ix,iy=inner_pts[ni]; i_ang=math.atan2(iy-cy,ix-cx)
-            d=math.atan2(math.sin(m_ang-i_ang), math.cos(m_ang-i_ang))
-            if abs(d)<HANDOFF_ANG_THRESH and (nowT-inner_last[ni])>HANDOFF_COOLDOWN and gate_by_rays(((ix+mx)/2,(iy+my)/2)):
-                mid_kinds[mi]=inner_kinds[ni]; inner_kinds[ni]=(inner_kinds[ni]+1)%GLYPH_KINDS
-                inner_last[ni]=nowT; links.append({"t0":nowT,"p_in":(ix,iy),"p_out":(mx,my)})
-
-        draw_links(screen,links)
-        draw_center_pulse(screen,t,CENTER_PULSE_HZ); draw_reticle(screen,t)
-
-        hint=font_small.render(
-            f"{BAND_SCHEDULE[schedule_index][0].upper()}   speed x{SPEED_TRIM:.2f}", True,(120,120,135))
-        screen.blit(hint,(16,screen.get_height()-36))
+        draw_scene(screen,sim,acc/SIM_DT)
+        if not live:
+            on_frame(frame); continue
         pygame.display.flip()
 
-        if t>=SCENE_SECONDS: break
+        if sim.t>=SCENE_SECONDS: break
+
+# ---------------- Offline render ----------------
+RENDER_BATCH=4   # frames per batch; workers take batches round-robin
+RENDER_QUEUE=1   # raw batches a worker may have waiting for the parent; bounds memory per worker
+
+class FrameStride:
+    # the frames a worker draws: batches k, k+n, k+2n, ... of `batch` frames, below stop
+    def __init__(self,k,n,batch,stop): self.k=k; self.n=n; self.batch=batch; self.stop=stop
+    def __contains__(self,i): return i<self.stop and (i//self.batch)%self.n==self.k
+
+def render_worker(k,workers,batch,total,fps,seed,fmt,out,queue):
+    # Simulates the whole timeline with the shared seed, so every worker sees the same run, and
+    # draws only its own batches: PNGs are written directly, raw RGB24 batches go to the parent.
+    try:
+        setup_display(headless=True); random.seed(seed)
+        pending=[]
+        def emit(i):
+            if fmt=="png":
+                pygame.image.save(screen, os.path.join(out,f"frame_{i:06d}.png")); return
+            pending.append(pygame.image.tostring(screen,"RGB"))
+            if i%batch==batch-1 or i==total-1:
+                queue.put(("frames",b"".join(pending))); pending.clear()
+        run(FixedClock(fps), FrameStride(k,workers,batch,total), emit)
+        queue.put(("done",None))
+    except Exception:
+        queue.put(("error",traceback.format_exc()))
+
+def receive(queue,process):
+    while True:
+        try: return queue.get(timeout=1.0)
+        except Empty:
+            if process.is_alive(): continue
+            try: return queue.get(timeout=1.0)  # anything it sent before exiting
+            except Empty: return ("error",f"{process.name} exited with status {process.exitcode}")
+
+def render(out,seconds,fps,workers,seed,fmt="png",batch=RENDER_BATCH):
+    total=int(round(min(seconds,SCENE_SECONDS)*fps))
+    if total<1: sys.exit("nothing to render: --seconds and --fps must be positive")
+    batches=-(-total//batch); workers=max(1,min(workers,batches))
+    if fmt=="png": os.makedirs(out,exist_ok=True)
+    ctx=multiprocessing.get_context("spawn")
+    queues=[ctx.Queue(maxsize=RENDER_QUEUE) for _ in range(workers)]
+    procs=[ctx.Process(target=render_worker,args=(k,workers,batch,total,fps,seed,fmt,out,queues[k]),
+                       name=f"render-{k}",daemon=True) for k in range(workers)]
+    sink=None; began=time.perf_counter()
+    try:
+        for proc in procs: proc.start()
+        if fmt=="raw":
+            # batches arrive in timeline order, one worker after another, and are written straight out
+            sink=sys.stdout.buffer if out=="-" else open(out,"wb")
+            for b in range(batches):
+                kind,payload=receive(queues[b%workers],procs[b%workers])
+                if kind!="frames": sys.exit(f"render failed:\n{payload}")
+                sink.write(payload)
+            sink.flush()
+        for k in range(workers):
+            kind,payload=receive(queues[k],procs[k])
+            if kind!="done": sys.exit(f"render failed:\n{payload}")
+    finally:
+        for proc in procs:
+            if proc.is_alive(): proc.terminate()
+            proc.join()
+        if sink is not None and sink is not sys.stdout.buffer: sink.close()
+    took=time.perf_counter()-began
+    print(f"{total} frames {W}x{H} @ {fps}fps ({total/fps:.1f}s) in {took:.1f}s with {workers} workers, "
+          f"{total/fps/took:.2f}x real time", file=sys.stderr)
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(description="Metatron Neuro Wheel")
+    ap.add_argument("--render",metavar="OUT",help="render offline without a window: a PNG directory, or a file/'-' for --format raw")
+    ap.add_argument("--format",choices=("png","raw"),default="png",help="raw writes packed RGB24 frames back to back")
+    ap.add_argument("--fps",type=int,default=60)
+    ap.add_argument("--seconds",type=float,default=SCENE_SECONDS)
+    ap.add_argument("--workers",type=int,default=os.cpu_count() or 1)
+    ap.add_argument("--seed",type=int,default=SEED if SEED is not None else 0)
+    args=ap.parse_args(argv)
+    if args.render:
+        render(args.render,args.seconds,args.fps,args.workers,args.seed,args.format); return
+    setup_display()
+    while True:
+        run()
 
-while True:
-    run()
+if __name__=="__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Global jump palette over every menu action and content item.
+
+Menu actions, content documents and sections, archive documents, RV targets
+and audio presets are indexed by the words of their labels with the same
+:class:`~cli.menu.PrefixIndex` the menus filter with. Actions come from each
+subsystem's ``ACTIONS``, the list its own menu is built from. The palette is
+built on first use and cached. Entries only name their handler, which is
+imported when the entry is dispatched.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+
+from .menu import PrefixIndex, words
+
+RESULT_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class PaletteEntry:
+    label: str
+    kind: str  # menu, action, content, section, preset, target or document
+    target: str  # ".module:callable" relative to this package, imported on dispatch
+    args: tuple[str, ...] = ()
+
+    def resolve(self) -> Callable[..., None]:
+        module_name, _, attribute = self.target.partition(":")
+        return getattr(import_module(module_name, __package__), attribute)
+
+    def dispatch(self) -> None:
+        self.resolve()(*self.args)
+
+
+class Palette:
+    def __init__(self, entries: Iterable[PaletteEntry]) -> None:
+        self.entries: list[PaletteEntry] = list(entries)
+        self.index = PrefixIndex([f"{entry.label} {entry.kind}" for entry in self.entries])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, query: str, limit: int = RESULT_LIMIT) -> list[PaletteEntry]:
+        if not words(query):
+            return []
+        # Positions come back in entry order, which is rank order.
+        return [self.entries[position] for position in islice(self.index.search(query), limit)]
+
+    def resolve(self, query: str, limit: int = RESULT_LIMIT) -> tuple[Optional[PaletteEntry], list[PaletteEntry]]:
+        """The entry to dispatch straight away, if the query settles it, plus all matches."""
+        matches = self.search(query, limit)
+        wanted = query.strip().lower()
+        exact = [entry for entry in matches if entry.label.lower() == wanted]
+        if len(matches) == 1 or len(exact) == 1:
+            return (exact or matches)[0], matches
+        return None, matches
+
+
+def _menu_entries() -> Iterator[PaletteEntry]:
+    from .main import RUN_ALL_LABEL
+    from .navigation import ENTRIES
+
+    yield PaletteEntry(RUN_ALL_LABEL, "action", ".main:run_all")
+    for entry in ENTRIES:
+        yield PaletteEntry(entry.label, "menu", entry.target)
+    for entry in ENTRIES:
+        for label in entry.actions():
+            yield PaletteEntry(label, "action", entry.target, (label,))
+
+
+def _content_entries() -> Iterator[PaletteEntry]:
+    from .content import content_catalog, markdown_headings
+
+    for name in content_catalog():
+        headings = markdown_headings(name)
+        title = headings[0] if headings else name
+        yield PaletteEntry(title, "content", ".content:show_document", (name,))
+        for heading in headings[1:]:
+            yield PaletteEntry(f"{heading} — {title}", "section", ".content:show_section", (name, heading))
+
+
+def _preset_entries() -> Iterator[PaletteEntry]:
+    from .audio.presets import iter_presets
+
+    for preset in iter_presets():
+        yield PaletteEntry(preset.name, "preset", ".audio.lab:play_preset", (preset.name,))
+
+
+def _target_entries() -> Iterator[PaletteEntry]:
+    from .data.rv_targets import get_catalog
+
+    for target in get_catalog():
+        yield PaletteEntry(f"{target.name} ({target.target_id})", "target", ".rv.cli:show_target", (target.target_id,))
+
+
+def _document_entries() -> Iterator[PaletteEntry]:
+    from .data.user import DEMO_USER
+    from .research.index import get_index
+
+    index = get_index()
+    for position in sorted(index.by_tier.get(DEMO_USER.subscription_tier, ())):
+        document = index.documents[position]
+        yield PaletteEntry(document.title, "document", ".research.archive:show_document", (document.id,))
+
+
+# Sources in rank order: earlier kinds are listed first for the same prefix.
+SOURCES: tuple[Callable[[], Iterable[PaletteEntry]], ...] = (
+    _menu_entries,
+    _content_entries,
+    _preset_entries,
+    _target_entries,
+    _document_entries,
+)
+
+
+@lru_cache(maxsize=None)
+def get_palette() -> Palette:
+    return Palette(entry for source in SOURCES for entry in source())
+
+
+def _describe(entry: PaletteEntry) -> str:
+    return f"{entry.label}  [{entry.kind}]"
+
+
+def run() -> None:
+    from .menu import select
+
+    palette = get_palette()
+    query = input("Jump to (blank to cancel): ").strip()
+    if not query:
+        return
+    entry, matches = palette.resolve(query)
+    if entry is None:
+        if not matches:
+            print(f"Nothing matches {query!r}.\n")
+            return
+        chosen = select(f"Matches for {query!r}", [_describe(match) for match in matches])
+        if chosen is None:
+            return
+        entry = matches[chosen]
+    print(f"\n=== {entry.label.upper()} ===\n")
+    entry.dispatch()
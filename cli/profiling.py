@@ -0,0 +1,240 @@
+"""Opt-in tracing of menu handlers and hot paths.
+
+Run ``shadowops --profile[=PATH] ...`` or set ``SHADOWOPS_PROFILE`` (``1`` or
+a trace path) to record spans and counters. On exit the trace is written as
+Chrome trace-event JSON, loadable in ``chrome://tracing`` or Perfetto, and a
+per-span percentile summary is printed to stderr.
+
+While profiling is off, :func:`span` returns a shared no-op context manager,
+:func:`count` returns immediately and functions wrapped by :func:`traced`
+pay one global lookup per call.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+PROFILE_ENV = "SHADOWOPS_PROFILE"
+PROFILE_FLAG = "--profile"
+MAX_EVENTS = 500_000  # spans beyond this still count towards the summary
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_NULL = nullcontext()
+_tracer: Optional["Tracer"] = None
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Tracer:
+    """Collects complete-span and counter events from every thread."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.origin = time.perf_counter_ns()
+        self.events: list[dict[str, Any]] = []
+        self.durations: dict[str, list[float]] = {}
+        self.counters: dict[str, float] = {}
+        self.dropped = 0
+        self._threads: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _tid(self) -> int:
+        ident = threading.get_ident()
+        tid = self._threads.get(ident)
+        if tid is None:
+            tid = self._threads[ident] = len(self._threads) + 1
+            self.events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                }
+            )
+        return tid
+
+    def _add(self, event: dict[str, Any]) -> None:
+        if len(self.events) < MAX_EVENTS:
+            self.events.append(event)
+        else:
+            self.dropped += 1
+
+    def complete(self, name: str, cat: str, start_ns: int, end_ns: int, args: Optional[dict[str, Any]] = None) -> None:
+        with self._lock:
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start_ns - self.origin) / 1000,
+                "dur": (end_ns - start_ns) / 1000,
+                "pid": os.getpid(),
+                "tid": self._tid(),
+            }
+            if args:
+                event["args"] = args
+            self._add(event)
+            self.durations.setdefault(name, []).append((end_ns - start_ns) / 1e6)
+
+    def count(self, name: str, value: float) -> None:
+        with self._lock:
+            total = self.counters[name] = self.counters.get(name, 0) + value
+            self._add(
+                {
+                    "name": name,
+                    "ph": "C",
+                    "ts": (time.perf_counter_ns() - self.origin) / 1000,
+                    "pid": os.getpid(),
+                    "tid": self._tid(),
+                    "args": {"value": total},
+                }
+            )
+
+    def summary(self) -> list[dict[str, Any]]:
+        with self._lock:
+            durations = {name: sorted(values) for name, values in self.durations.items()}
+        rows = [
+            {
+                "span": name,
+                "count": len(values),
+                "total_ms": round(sum(values), 3),
+                **{
+                    key: round(percentile(values, fraction), 3)
+                    for key, fraction in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99), ("max_ms", 1.0))
+                },
+            }
+            for name, values in durations.items()
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def format_summary(self) -> str:
+        from .utils.text import format_table
+
+        columns = ("total_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+        rows = [(row["span"], str(row["count"]), *(f"{row[key]:.3f}" for key in columns)) for row in self.summary()]
+        rows += [(f"counter {name}", f"{value:g}", "", "", "", "", "") for name, value in sorted(self.counters.items())]
+        header = ("Span", "Count", "Total ms", "p50", "p95", "p99", "Max")
+        return "Profile summary\n" + format_table([header] + rows)
+
+    def write(self) -> Path:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {
+                "traceEvents": list(self.events),
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": self.dropped, "argv": sys.argv},
+            }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(tmp, self.path)
+        return self.path
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.tracer.complete(self.name, self.cat, self.start, time.perf_counter_ns(), self.args)
+
+
+def span(name: str, cat: str = "app", **args: Any):
+    """Context manager recording ``name`` as a span while profiling is on."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL
+    return _Span(tracer, name, cat, args)
+
+
+def count(name: str, value: float = 1) -> None:
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(name, value)
+
+
+def traced(name: Optional[str] = None, cat: str = "hot") -> Callable[[F], F]:
+    """Decorator recording each call of the wrapped function as a span."""
+
+    def decorate(func: F) -> F:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.complete(label, cat, start, time.perf_counter_ns())
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def default_trace_path() -> Path:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return Path.home() / ".shadowops" / "cli" / "profiles" / f"trace-{stamp}-{os.getpid()}.json"
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def enable(path: Optional[Path] = None) -> Tracer:
+    """Start recording; the trace and summary are emitted at interpreter exit."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(path or default_trace_path())
+        atexit.register(_finish)
+    return _tracer
+
+
+def _finish() -> None:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return
+    path = tracer.write()
+    print(tracer.format_summary(), file=sys.stderr)
+    print(f"Trace written to {path}", file=sys.stderr)
+
+
+def configure(argv: list[str]) -> list[str]:
+    """Enable profiling from a leading ``--profile[=PATH]`` or the environment.
+
+    Returns ``argv`` without the flag.
+    """
+    setting = os.environ.get(PROFILE_ENV, "").strip()
+    remaining = list(argv)
+    while remaining and (remaining[0] == PROFILE_FLAG or remaining[0].startswith(PROFILE_FLAG + "=")):
+        setting = remaining.pop(0).partition("=")[2] or "1"
+    if setting and setting.lower() not in {"0", "false", "no", "off"}:
+        enable(None if setting.lower() in {"1", "true", "yes", "on"} else Path(setting).expanduser())
+    return remaining
@@ -1,5 +1,17 @@
 """Research module exports."""
 
-from .archive import run
+from __future__ import annotations
+
+from typing import Any
 
 __all__ = ["run"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved lazily so non-interactive callers can use the archive indexes
+    # without importing the terminal menu layer.
+    if name == "run":
+        from .archive import run
+
+        return run
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,43 +2,48 @@
 
 from __future__ import annotations
 
-from collections import Counter
-from dataclasses import dataclass
-from typing import Iterable, Sequence
-
-from ..data.research_documents import DOCUMENTS, ResearchDocument, iter_by_tier
-from ..data.user import DEMO_USER
-from ..menu import Menu, MenuItem
+from dataclasses import astuple, dataclass
+from functools import partial
+from typing import Callable, Sequence
+
+from ..data.research_documents import ResearchDocument
+from ..data.user import DEMO_USER, TierLevel
+from ..menu import Menu, MenuItem, select
+from ..profiling import traced
 from ..utils.text import format_table, get_terminal_width, wrap_paragraphs
+from .index import FacetIndex, TagTally, get_index
+from .prerender import PrerenderCache
+from .related import RelatedIndex, get_related_index
 
 
 @dataclass
 class FilterState:
     search: str = ""
     category: str | None = None
+    tag: str | None = None
+
+
+def _selection(index: FacetIndex, state: FilterState, tier: TierLevel) -> frozenset[int]:
+    return index.select(tier=tier, category=state.category, tags=(state.tag,) if state.tag else ())
+
 
+@traced("_filter_documents")
+def _filter_documents(index: FacetIndex, state: FilterState, tier: TierLevel) -> list[ResearchDocument]:
+    return index.resolve(index.search(_selection(index, state, tier), state.search))
 
-def _filter_documents(documents: Iterable[ResearchDocument], state: FilterState) -> list[ResearchDocument]:
-    results: list[ResearchDocument] = []
-    for document in documents:
-        if state.category and document.category != state.category:
-            continue
-        if state.search:
-            text = " ".join(
-                [
-                    document.title.lower(),
-                    document.summary.lower(),
-                    " ".join(document.tags).lower(),
-                ]
-            )
-            if state.search.lower() not in text:
-                continue
-        results.append(document)
-    return results
-
-
-def _describe_document(document: ResearchDocument) -> str:
-    width = get_terminal_width()
+
+def _related_documents(
+    index: FacetIndex, related: RelatedIndex, document: ResearchDocument, tier: TierLevel
+) -> list[ResearchDocument]:
+    visible = index.by_tier.get(tier, frozenset())
+    positions = [index.positions.get(doc_id) for doc_id, _ in related.related(document.id)]
+    return [index.documents[position] for position in positions if position in visible]
+
+
+def _describe_document(
+    document: ResearchDocument, width: int | None = None, related: Sequence[ResearchDocument] = ()
+) -> str:
+    width = width or get_terminal_width()
     header = f"{document.title}\n{'-' * min(len(document.title), width)}"
     meta = format_table(
         [
@@ -51,7 +56,10 @@ def _describe_document(document: ResearchDocument) -> str:
         ]
     )
     body = wrap_paragraphs(document.content, width)
-    return f"{header}\n\n{meta}\n\n{body}"
+    text = f"{header}\n\n{meta}\n\n{body}"
+    if related:
+        text += "\n\nRelated documents:\n" + "\n".join(f"  - {doc.title}" for doc in related)
+    return text
 
 
 def _list_documents(documents: Sequence[ResearchDocument]) -> None:
@@ -66,77 +74,107 @@ def _print_filters(state: FilterState) -> None:
     print("Current filters:")
     print(f"  Search: {state.search or '—'}")
     print(f"  Category: {state.category or 'Any'}")
+    print(f"  Tag: {state.tag or 'Any'}")
 
 
-def run() -> None:
-    print("Research Archive — Gamma-tier access granted to demo user.\n")
-    state = FilterState()
-    tier_documents = list(iter_by_tier(DEMO_USER.subscription_tier))
-
-    def set_search() -> None:
-        state.search = input("Enter search text: ").strip()
-
-    def set_category() -> None:
-        categories = sorted({doc.category for doc in DOCUMENTS})
-        options = categories + ["Any"]
-        from ..menu import TerminalMenu
-
-        if TerminalMenu is not None:
-            menu = TerminalMenu(options, title="Select category\n")
-            selected = menu.show()
-            if selected is None:
-                return
-            choice = options[int(selected)]
-        else:
-            for idx, label in enumerate(options, start=1):
-                print(f"{idx}. {label}")
-            raw = input("Choose category: ").strip()
-            if not raw:
-                return
-            try:
-                choice = options[int(raw) - 1]
-            except Exception:
-                print("Invalid choice.")
-                return
-        state.category = None if choice == "Any" else choice
-
-    def view_document() -> None:
-        documents = _filter_documents(tier_documents, state)
+def show_document(document_id: str) -> None:
+    """Print one document, with related documents, as the archive viewer does."""
+    tier = DEMO_USER.subscription_tier
+    index = get_index()
+    document = index.find(document_id)
+    if document is None or index.positions[document_id] not in index.by_tier.get(tier, frozenset()):
+        print(f"Document {document_id} is not available.\n")
+        return
+    related = _related_documents(index, get_related_index(), document, tier)
+    print(_describe_document(document, related=related) + "\n")
+
+
+class ArchiveBrowser:
+    """Filters and caches for one visit to the archive menu."""
+
+    def __init__(self) -> None:
+        self.state = FilterState()
+        self.tier = DEMO_USER.subscription_tier
+        self.index = get_index()
+        self.tally = TagTally(self.index)
+        self.related = get_related_index()
+        self.prerender = PrerenderCache(
+            lambda doc, width: _describe_document(doc, width, _related_documents(self.index, self.related, doc, self.tier))
+        )
+
+    def refresh(self) -> list[ResearchDocument]:
+        documents = _filter_documents(self.index, self.state, self.tier)
+        self.prerender.schedule(astuple(self.state), documents, get_terminal_width())
+        return documents
+
+    def close(self) -> None:
+        self.prerender.close()
+
+    def _choose(self, title: str, values: list[str]) -> str | None:
+        options = values + ["Any"]
+        selected = select(f"Select {title}", options)
+        return None if selected is None else options[selected]
+
+    def list_documents(self) -> None:
+        _print_filters(self.state)
+        _list_documents(self.refresh())
+
+    def set_search(self) -> None:
+        self.state.search = input("Enter search text: ").strip()
+        self.refresh()
+
+    def set_category(self) -> None:
+        choice = self._choose("category", self.index.categories())
+        if choice is not None:
+            self.state.category = None if choice == "Any" else choice
+            self.refresh()
+
+    def set_tag(self) -> None:
+        self.tally.update(_selection(self.index, FilterState(category=self.state.category), self.tier))
+        choice = self._choose("tag", [tag for tag, _ in self.tally.rows()])
+        if choice is not None:
+            self.state.tag = None if choice == "Any" else choice
+            self.refresh()
+
+    def view_document(self) -> None:
+        documents = self.refresh()
         if not documents:
             print("No documents available for current selection.\n")
             return
-        menu = Menu(
+        menu = Menu.lazy(
             "Select document",
-            [
-                MenuItem(
-                    doc.title,
-                    lambda doc=doc: print(_describe_document(doc) + "\n"),
-                )
-                for doc in documents
-            ],
+            [doc.title for doc in documents],
+            lambda position: lambda: print(self.prerender.get(documents[position], get_terminal_width()) + "\n"),
         )
         menu.show()
 
-    def show_tag_cloud() -> None:
-        documents = _filter_documents(tier_documents, state)
-        tags = Counter(tag for doc in documents for tag in doc.tags)
-        if not tags:
+    def show_tag_cloud(self) -> None:
+        selection = _selection(self.index, self.state, self.tier)
+        if self.state.search:
+            selection = frozenset(self.index.search(selection, self.state.search))
+        if not self.tally.update(selection):
             print("No tags in current selection.\n")
             return
-        rows = [(tag, str(count)) for tag, count in sorted(tags.items(), key=lambda item: (-item[1], item[0]))]
+        rows = [(tag, str(count)) for tag, count in self.tally.rows()]
         print(format_table([("Tag", "Count")] + rows) + "\n")
 
-    def list_documents() -> None:
-        _print_filters(state)
-        _list_documents(_filter_documents(tier_documents, state))
 
-    actions = [
-        MenuItem("List documents", list_documents),
-        MenuItem("Set search text", set_search),
-        MenuItem("Choose category", set_category),
-        MenuItem("View document", view_document),
-        MenuItem("Tag cloud", show_tag_cloud),
-    ]
+ACTIONS: tuple[tuple[str, Callable[[ArchiveBrowser], None]], ...] = (
+    ("List documents", ArchiveBrowser.list_documents),
+    ("Set search text", ArchiveBrowser.set_search),
+    ("Choose category", ArchiveBrowser.set_category),
+    ("Filter by tag", ArchiveBrowser.set_tag),
+    ("View document", ArchiveBrowser.view_document),
+    ("Tag cloud", ArchiveBrowser.show_tag_cloud),
+)
 
-    menu = Menu("Research Archive", actions)
-    menu.show()
+
+def run(action: str | None = None) -> None:
+    print("Research Archive — Gamma-tier access granted to demo user.\n")
+    browser = ArchiveBrowser()
+    browser.refresh()
+    menu = Menu("Research Archive", [MenuItem(label, partial(handler, browser)) for label, handler in ACTIONS])
+    try:
+        menu.show(action)
+    finally:
+        browser.close()
@@ -0,0 +1,136 @@
+"""Facet index for research archive filtering."""
+
+from __future__ import annotations
+
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Sequence
+
+from ..data.research_documents import ResearchDocument, get_documents
+from ..data.user import TIER_ORDER, TierLevel
+
+EMPTY: frozenset[int] = frozenset()
+
+
+class FacetIndex:
+    """Posting sets for the category, access tier and tag facets.
+
+    Documents are addressed by their position in :attr:`documents`. Each facet
+    value maps to the set of positions carrying it, so combined filters are
+    plain set intersections and never rescan the archive.
+    """
+
+    def __init__(self, documents: Iterable[ResearchDocument]) -> None:
+        self.documents: list[ResearchDocument] = list(documents)
+        self.all: frozenset[int] = frozenset(range(len(self.documents)))
+        self.tags: list[tuple[str, ...]] = []
+        self.search_text: list[str] = []
+        self.positions: dict[str, int] = {}
+
+        categories: dict[str, set[int]] = {}
+        levels: dict[str, set[int]] = {}
+        tags: dict[str, set[int]] = {}
+        for position, document in enumerate(self.documents):
+            self.positions[document.id] = position
+            categories.setdefault(document.category, set()).add(position)
+            levels.setdefault(document.access_level, set()).add(position)
+            for tag in document.tags:
+                tags.setdefault(tag, set()).add(position)
+            self.tags.append(document.tags)
+            self.search_text.append(
+                " ".join([document.title.lower(), document.summary.lower(), " ".join(document.tags).lower()])
+            )
+
+        self.by_category: dict[str, frozenset[int]] = {key: frozenset(value) for key, value in categories.items()}
+        self.by_tag: dict[str, frozenset[int]] = {key: frozenset(value) for key, value in tags.items()}
+        # Tier access is cumulative: a tier sees its own documents and every lower tier's.
+        self.by_tier: dict[str, frozenset[int]] = {}
+        visible: set[int] = set()
+        for tier, _ in sorted(TIER_ORDER.items(), key=lambda item: item[1]):
+            visible |= levels.get(tier, set())
+            self.by_tier[tier] = frozenset(visible)
+
+    def categories(self) -> list[str]:
+        return sorted(self.by_category)
+
+    def select(
+        self,
+        *,
+        tier: TierLevel | None = None,
+        category: str | None = None,
+        tags: Sequence[str] = (),
+    ) -> frozenset[int]:
+        postings = []
+        if tier is not None:
+            postings.append(self.by_tier.get(tier, EMPTY))
+        if category:
+            postings.append(self.by_category.get(category, EMPTY))
+        postings.extend(self.by_tag.get(tag, EMPTY) for tag in tags)
+        if not postings:
+            return self.all
+        postings.sort(key=len)
+        selection = postings[0]
+        for posting in postings[1:]:
+            if not selection:
+                break
+            selection = selection & posting
+        return selection
+
+    def search(self, selection: Iterable[int], text: str) -> list[int]:
+        positions = sorted(selection)
+        if not text:
+            return positions
+        needle = text.lower()
+        haystacks = self.search_text
+        return [position for position in positions if needle in haystacks[position]]
+
+    def find(self, document_id: str) -> ResearchDocument | None:
+        position = self.positions.get(document_id)
+        return None if position is None else self.documents[position]
+
+    def resolve(self, positions: Iterable[int]) -> list[ResearchDocument]:
+        return [self.documents[position] for position in positions]
+
+
+class TagTally:
+    """Tag counts for the current selection, updated from selection deltas."""
+
+    def __init__(self, index: FacetIndex) -> None:
+        self.index = index
+        self.selection: frozenset[int] = EMPTY
+        self.counts: Counter[str] = Counter()
+        self._rows: list[tuple[str, int]] | None = None
+
+    def update(self, selection: frozenset[int]) -> Counter[str]:
+        if selection is self.selection or selection == self.selection:
+            return self.counts
+        removed = self.selection - selection
+        added = selection - self.selection
+        tags = self.index.tags
+        if len(removed) + len(added) > len(selection):
+            self.counts = Counter(tag for position in selection for tag in tags[position])
+        else:
+            counts = self.counts
+            for position in removed:
+                for tag in tags[position]:
+                    remaining = counts[tag] - 1
+                    if remaining:
+                        counts[tag] = remaining
+                    else:
+                        del counts[tag]
+            for position in added:
+                counts.update(tags[position])
+        self.selection = selection
+        self._rows = None
+        return self.counts
+
+    def rows(self) -> list[tuple[str, int]]:
+        if self._rows is None:
+            self._rows = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        return self._rows
+
+
+@lru_cache(maxsize=None)
+def get_index() -> FacetIndex:
+    """Return the shared facet index over the bundled archive."""
+    return FacetIndex(get_documents())
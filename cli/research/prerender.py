@@ -0,0 +1,114 @@
+"""Background pre-rendering of archive documents."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Sequence
+
+from ..data.research_documents import ResearchDocument
+from ..profiling import count
+
+Renderer = Callable[[ResearchDocument, int], str]
+CacheKey = tuple[str, int]
+
+_STOP = object()
+
+
+class PrerenderCache:
+    """Bounded LRU of rendered documents, filled ahead of time by a worker thread.
+
+    :meth:`schedule` queues the leading documents of the current filter for the
+    given terminal width. When the filter key changes, entries rendered for the
+    previous filter are evicted and queued work for it is abandoned.
+    """
+
+    def __init__(self, render: Renderer, *, capacity: int = 32, prefetch: int = 8) -> None:
+        self.render = render
+        self.capacity = max(1, capacity)
+        self.prefetch = max(0, min(prefetch, self.capacity))
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[CacheKey, tuple[Hashable, str]] = OrderedDict()
+        self._filter_key: Hashable = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def schedule(self, filter_key: Hashable, documents: Sequence[ResearchDocument], width: int) -> None:
+        wanted = documents[: self.prefetch]
+        with self._lock:
+            if filter_key != self._filter_key:
+                self._generation += 1
+                self._filter_key = filter_key
+                keep = {(document.id, width) for document in wanted}
+                for key in [key for key, (owner, _) in self._entries.items() if owner != filter_key]:
+                    if key in keep:
+                        self._entries[key] = (filter_key, self._entries[key][1])
+                    else:
+                        del self._entries[key]
+            generation = self._generation
+            pending = [document for document in wanted if (document.id, width) not in self._entries]
+        if not pending:
+            return
+        self._ensure_worker()
+        for document in pending:
+            self._queue.put((generation, document, width))
+
+    def get(self, document: ResearchDocument, width: int) -> str:
+        key = (document.id, width)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                count("prerender.hits")
+                return entry[1]
+            self.misses += 1
+            count("prerender.misses")
+            owner = self._filter_key
+        rendered = self.render(document, width)
+        self._store(key, owner, rendered)
+        return rendered
+
+    def close(self) -> None:
+        with self._lock:
+            self._generation += 1
+            worker = self._worker
+            self._worker = None
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join(timeout=1.0)
+
+    def _store(self, key: CacheKey, owner: Hashable, rendered: str) -> None:
+        with self._lock:
+            self._entries[key] = (owner, rendered)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run, name="archive-prerender", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            generation, document, width = item
+            key = (document.id, width)
+            with self._lock:
+                if generation != self._generation or key in self._entries:
+                    continue
+                owner = self._filter_key
+            rendered = self.render(document, width)
+            with self._lock:
+                if generation != self._generation:
+                    continue
+            self._store(key, owner, rendered)
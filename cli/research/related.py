@@ -0,0 +1,256 @@
+"""Related-document recommendations from sparse TF-IDF vectors."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from ..data.research_documents import ResearchDocument, get_documents
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also an and any are as at be because been before being between both but by
+    can could did do does doing down during each few for from further had has have having he her here hers him his how
+    i if in into is it its itself just me more most my no nor not of off on once only or other our ours out over own
+    same she should so some such than that the their theirs them then there these they this those through to too under
+    until up very was we were what when where which while who whom why will with would you your yours
+    """.split()
+)
+FORMAT_VERSION = 1
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+
+def document_text(document: ResearchDocument) -> str:
+    return "\n".join([document.title, document.summary, " ".join(document.tags), document.content])
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class RelatedIndex:
+    """TF-IDF vectors with precomputed top-``k`` neighbour lists.
+
+    Neighbours are scored through a term → document posting map so a document
+    is only compared against documents it shares terms with. Vectors keep their
+    ``max_terms`` heaviest terms, and terms whose posting list is longer than
+    ``max_postings`` carry too little signal to be worth scoring.
+    """
+
+    def __init__(self, *, k: int = 5, max_terms: int = 32, max_postings: int = 512) -> None:
+        self.k = k
+        self.max_terms = max_terms
+        self.max_postings = max_postings
+        self.counts: dict[str, dict[str, int]] = {}
+        self.hashes: dict[str, str] = {}
+        self.df: Counter[str] = Counter()
+        self.vectors: dict[str, dict[str, float]] = {}
+        self.postings: dict[str, dict[str, float]] = {}
+        self.neighbours: dict[str, list[tuple[str, float]]] = {}
+        self.referrers: dict[str, set[str]] = {}
+
+    @classmethod
+    def build(cls, documents: Iterable[tuple[str, str]], **options: Any) -> "RelatedIndex":
+        index = cls(**options)
+        for doc_id, text in documents:
+            index._add_counts(doc_id, text)
+        for doc_id in index.counts:
+            index._set_vector(doc_id)
+        for doc_id in index.counts:
+            index._set_neighbours(doc_id, index._rank(index._scores(doc_id)))
+        return index
+
+    def related(self, doc_id: str) -> list[tuple[str, float]]:
+        return self.neighbours.get(doc_id, [])
+
+    def upsert(self, doc_id: str, text: str) -> None:
+        """Add or replace a document and update the neighbour lists it affects.
+
+        Documents that previously listed ``doc_id`` are re-ranked; every other
+        document only has the new similarity offered to its list. Inverse
+        document frequencies are updated but other vectors are not re-weighted;
+        :meth:`build` recomputes everything from scratch.
+        """
+
+        digest = _digest(text)
+        if self.hashes.get(doc_id) == digest:
+            return
+        stale = self._drop(doc_id)
+        self._add_counts(doc_id, text, digest)
+        self._set_vector(doc_id)
+        scores = self._scores(doc_id)
+        self._set_neighbours(doc_id, self._rank(scores))
+        for other, score in scores.items():
+            if other not in stale:
+                self._offer(other, doc_id, score)
+        for other in stale:
+            self._set_neighbours(other, self._rank(self._scores(other)))
+
+    def remove(self, doc_id: str) -> None:
+        for other in self._drop(doc_id):
+            self._set_neighbours(other, self._rank(self._scores(other)))
+
+    def sync(self, documents: Iterable[tuple[str, str]]) -> int:
+        """Bring the index in line with ``documents``; return how many changed."""
+        seen: set[str] = set()
+        changed = 0
+        for doc_id, text in documents:
+            seen.add(doc_id)
+            if self.hashes.get(doc_id) != _digest(text):
+                self.upsert(doc_id, text)
+                changed += 1
+        for doc_id in [doc_id for doc_id in self.counts if doc_id not in seen]:
+            self.remove(doc_id)
+            changed += 1
+        return changed
+
+    def save(self, path: Path, fingerprint: str) -> None:
+        payload = {
+            "version": FORMAT_VERSION,
+            "fingerprint": fingerprint,
+            "options": {"k": self.k, "max_terms": self.max_terms, "max_postings": self.max_postings},
+            "counts": self.counts,
+            "hashes": self.hashes,
+            "neighbours": self.neighbours,
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> tuple["RelatedIndex", str]:
+        with path.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        if payload.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported related index version in {path}")
+        index = cls(**payload["options"])
+        index.counts = payload["counts"]
+        index.hashes = payload["hashes"]
+        for counts in index.counts.values():
+            index.df.update(counts.keys())
+        for doc_id in index.counts:
+            index._set_vector(doc_id)
+        for doc_id, pairs in payload["neighbours"].items():
+            index._set_neighbours(doc_id, [(other, score) for other, score in pairs])
+        return index, payload["fingerprint"]
+
+    def _add_counts(self, doc_id: str, text: str, digest: Optional[str] = None) -> None:
+        counts = dict(Counter(tokenize(text)))
+        self.counts[doc_id] = counts
+        self.hashes[doc_id] = digest or _digest(text)
+        self.df.update(counts.keys())
+
+    def _drop(self, doc_id: str) -> set[str]:
+        """Remove ``doc_id`` and return the documents that listed it as a neighbour."""
+        if doc_id not in self.counts:
+            return set()
+        for term in self.vectors.pop(doc_id, {}):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+        counts = self.counts.pop(doc_id)
+        self.df.subtract(counts.keys())
+        for term in counts:
+            if self.df[term] <= 0:
+                del self.df[term]
+        self.hashes.pop(doc_id, None)
+        self._set_neighbours(doc_id, [])
+        del self.neighbours[doc_id]
+        stale = self.referrers.pop(doc_id, set())
+        for other in stale:
+            self.neighbours[other] = [pair for pair in self.neighbours.get(other, []) if pair[0] != doc_id]
+        return stale
+
+    def _set_vector(self, doc_id: str) -> None:
+        total = len(self.counts)
+        weights = {
+            term: (1.0 + math.log(count)) * math.log((1 + total) / (1 + self.df[term])) + 1e-9
+            for term, count in self.counts[doc_id].items()
+        }
+        if len(weights) > self.max_terms:
+            weights = dict(heapq.nlargest(self.max_terms, weights.items(), key=lambda item: item[1]))
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        vector = {term: weight / norm for term, weight in weights.items()}
+        self.vectors[doc_id] = vector
+        for term, weight in vector.items():
+            self.postings.setdefault(term, {})[doc_id] = weight
+
+    def _scores(self, doc_id: str) -> dict[str, float]:
+        scores: dict[str, float] = {}
+        for term, weight in self.vectors.get(doc_id, {}).items():
+            posting = self.postings.get(term, {})
+            if len(posting) > self.max_postings:
+                continue
+            for other, other_weight in posting.items():
+                if other != doc_id:
+                    scores[other] = scores.get(other, 0.0) + weight * other_weight
+        return scores
+
+    def _rank(self, scores: dict[str, float]) -> list[tuple[str, float]]:
+        best = heapq.nlargest(self.k, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(other, round(score, 6)) for other, score in best]
+
+    def _set_neighbours(self, doc_id: str, pairs: list[tuple[str, float]]) -> None:
+        for other, _ in self.neighbours.get(doc_id, []):
+            referrers = self.referrers.get(other)
+            if referrers is not None:
+                referrers.discard(doc_id)
+        self.neighbours[doc_id] = pairs
+        for other, _ in pairs:
+            self.referrers.setdefault(other, set()).add(doc_id)
+
+    def _offer(self, doc_id: str, candidate: str, score: float) -> None:
+        pairs = self.neighbours.get(doc_id, [])
+        score = round(score, 6)
+        if len(pairs) >= self.k and (score, candidate) <= (pairs[-1][1], pairs[-1][0]):
+            return
+        merged = sorted(pairs + [(candidate, score)], key=lambda item: (item[1], item[0]), reverse=True)
+        self._set_neighbours(doc_id, merged[: self.k])
+
+
+def _fingerprint(documents: Any) -> str:
+    path = documents.bodies.path
+    stat = os.stat(path)
+    return f"{documents.bodies.fingerprint}:{len(documents)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+@lru_cache(maxsize=None)
+def get_related_index() -> RelatedIndex:
+    """Return the related-document index stored next to the archive pack.
+
+    A stored index whose fingerprint no longer matches the pack is synced
+    incrementally: only documents whose text changed are re-vectorised.
+    """
+
+    documents = get_documents()
+    path = Path(str(documents.bodies.path) + ".related.json")
+    fingerprint = _fingerprint(documents)
+    entries = ((document.id, document_text(document)) for document in documents)
+    try:
+        index, stored = RelatedIndex.load(path)
+    except (OSError, ValueError, KeyError, TypeError):
+        index, stored = RelatedIndex.build(entries), None
+    else:
+        if stored != fingerprint:
+            index.sync(entries)
+    if stored != fingerprint:
+        try:
+            index.save(path, fingerprint)
+        except OSError:
+            pass
+    return index
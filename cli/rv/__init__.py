@@ -1,5 +1,16 @@
 """Remote viewing exports."""
 
-from .cli import run
+from __future__ import annotations
+
+from typing import Any
 
 __all__ = ["run"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved lazily so session and history helpers import without the menu layer.
+    if name == "run":
+        from .cli import run
+
+        return run
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,169 @@
+"""Scripted remote viewing sessions for scorer evaluation and load testing.
+
+Each NDJSON line describes one session::
+
+    {"target_id": "2031-ALPHA", "perceptions": {"Stage 1 — Signal Line": ["tall stone"]}}
+    {"difficulty": "novice", "perceptions": [["tall"], ["cold stone"], ["pointed top"]]}
+
+``target_id`` picks a target; otherwise one is chosen at random from the
+``difficulty``/``category`` filter. ``perceptions`` maps stage names to lines,
+or is a list with one list of lines per stage. ``operator`` (a string),
+``started_at`` and ``completed_at`` (ISO 8601) are optional; ``started_at``
+defaults to ``completed_at`` and must not be later than it. Sessions go
+through the normal :class:`RvSession` scoring and are written to the store in
+batches.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from ..data.rv_targets import TargetCatalog, get_catalog
+from ..profiling import percentile
+from ..utils.io import ensure_directory
+from .history import STORAGE, open_store
+from .session import STAGES, RvSession
+
+STAGE_NAMES = tuple(stage for stage, _ in STAGES)
+MAX_REPORTED_ERRORS = 20
+
+
+class ScriptError(ValueError):
+    """A session script line that cannot be run."""
+
+
+@dataclass
+class BatchReport:
+    sessions: int = 0
+    rejected: int = 0
+    written: int = 0
+    seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)  # per-session seconds
+    write_latencies: list[float] = field(default_factory=list)  # per-batch seconds
+    errors: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        writes = sorted(self.write_latencies)
+        return {
+            "sessions": self.sessions,
+            "rejected": self.rejected,
+            "written": self.written,
+            "seconds": round(self.seconds, 3),
+            "sessions_per_second": round(self.sessions / self.seconds, 1) if self.seconds else 0.0,
+            "latency_ms": {
+                name: round(percentile(latencies, fraction) * 1000, 3)
+                for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+            },
+            "write_batches": len(writes),
+            "write_ms": {
+                name: round(percentile(writes, fraction) * 1000, 3)
+                for name, fraction in (("p50", 0.5), ("p95", 0.95), ("max", 1.0))
+            },
+            "errors": self.errors,
+        }
+
+
+def _lines(value: Any) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list):
+        raise ScriptError("stage perceptions must be a string or a list of strings")
+    return [str(line) for line in value]
+
+
+def _timestamp(script: Mapping[str, Any], name: str) -> Optional[datetime]:
+    value = script.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ScriptError(f"{name} must be an ISO 8601 string")
+    return datetime.fromisoformat(value)
+
+
+def build_session(script: Mapping[str, Any], catalog: TargetCatalog, rng: random.Random) -> RvSession:
+    """Turn one decoded script line into a session ready to be finished."""
+    if not isinstance(script, Mapping):
+        raise ScriptError("expected a JSON object")
+    target_id = script.get("target_id")
+    if target_id is not None:
+        target = catalog.get(str(target_id))
+        if target is None:
+            raise ScriptError(f"unknown target_id {target_id!r}")
+    else:
+        try:
+            target = catalog.choose(difficulty=script.get("difficulty"), category=script.get("category"), rng=rng)
+        except LookupError as exc:
+            raise ScriptError(str(exc)) from exc
+    raw = script.get("perceptions", {})
+    perceptions: dict[str, list[str]] = {stage: [] for stage in STAGE_NAMES}
+    if isinstance(raw, Mapping):
+        for stage, lines in raw.items():
+            perceptions.setdefault(str(stage), []).extend(_lines(lines))
+    elif isinstance(raw, list) and len(raw) <= len(STAGE_NAMES):
+        for stage, lines in zip(STAGE_NAMES, raw):
+            perceptions[stage].extend(_lines(lines))
+    else:
+        raise ScriptError(f"perceptions must be an object or a list of at most {len(STAGE_NAMES)} stages")
+    started_at = _timestamp(script, "started_at") or _timestamp(script, "completed_at")
+    if started_at is None:
+        return RvSession(target, perceptions)
+    return RvSession(target, perceptions, started_at=started_at)
+
+
+def run_batch(
+    lines: Iterable[str],
+    storage: Path = STORAGE,
+    *,
+    batch_size: int = 500,
+    seed: Optional[int] = None,
+    dry_run: bool = False,
+) -> BatchReport:
+    """Score every scripted session in ``lines`` and store them in batches."""
+    report = BatchReport()
+    catalog = get_catalog()
+    rng = random.Random(seed)
+    store = None if dry_run else open_store(ensure_directory(storage))
+    pending: list[dict[str, Any]] = []
+
+    def flush() -> None:
+        if pending and store is not None:
+            started = time.perf_counter()
+            report.written += store.append_many(pending)
+            report.write_latencies.append(time.perf_counter() - started)
+        pending.clear()
+
+    started = time.perf_counter()
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        began = time.perf_counter()
+        try:
+            script = json.loads(line)
+            session = build_session(script, catalog, rng)
+            operator = script.get("operator")
+            if operator is not None and not isinstance(operator, str):
+                raise ScriptError("operator must be a string")
+            completed_at = _timestamp(script, "completed_at")
+            if completed_at is not None and completed_at < session.started_at:
+                raise ScriptError("completed_at is before started_at")
+            record = session.finish(operator=operator, completed_at=completed_at)
+        except (ValueError, TypeError) as exc:  # JSONDecodeError and ScriptError included
+            report.rejected += 1
+            if len(report.errors) < MAX_REPORTED_ERRORS:
+                report.errors.append(f"line {number}: {exc}")
+            continue
+        pending.append(asdict(record))
+        report.sessions += 1
+        report.latencies.append(time.perf_counter() - began)
+        if len(pending) >= batch_size:
+            flush()
+    flush()
+    report.seconds = time.perf_counter() - started
+    return report
@@ -2,17 +2,18 @@
 
 from __future__ import annotations
 
-from pathlib import Path
 from random import choice
 from typing import List
 
-from ..data.rv_targets import RvDifficulty, choose_target, filter_targets
-from ..menu import Menu, MenuItem
-from ..utils.io import ensure_directory, load_json
+from ..data.rv_targets import RvDifficulty, filter_targets, get_catalog
+from ..menu import Menu, MenuItem, SelectionHandler
+from ..utils.io import ensure_directory
 from ..utils.text import format_table
+from .history import STORAGE, iter_pages, legacy_pending, summarize, using_sqlite
+from .sampler import draw_target
 from .session import RvSession
 
-STORAGE = ensure_directory(Path.home() / ".shadowops" / "cli")
+PAGE_SIZE = 20
 
 
 def _choose_difficulty() -> RvDifficulty | None:
@@ -46,12 +47,12 @@ def _choose_difficulty() -> RvDifficulty | None:
 
 def _start_session() -> None:
     difficulty = _choose_difficulty()
-    target = choose_target(difficulty=difficulty)
+    target = draw_target(difficulty=difficulty)
     session = RvSession(target)
     print(f"\nTarget assigned — difficulty: {target.difficulty.upper()}. Stage prompts will guide your data capture.\n")
     for idx in range(len(session.perceptions)):
         session.record(idx)
-    record = session.complete(STORAGE)
+    record = session.complete(ensure_directory(STORAGE))
     print("\nSession complete!\n")
     print(f"Target: {record.target_name} ({record.target_id})")
     print(f"Accuracy: {record.accuracy}%")
@@ -75,29 +76,81 @@ def _list_targets() -> None:
     print(format_table([("Name", "ID", "Category", "Difficulty", "Elements")] + rows))
 
 
-def _history() -> None:
-    history = load_json(STORAGE / "rv-history.json", default={"sessions": []})
-    sessions = history.get("sessions", [])
-    if not sessions:
+def _history(target_id: str | None = None) -> None:
+    if not using_sqlite() and legacy_pending(STORAGE):
+        print("Migrating older history in the background; sessions are listed oldest first until it finishes.\n")
+    pages = iter_pages(STORAGE, PAGE_SIZE, target_id=target_id)
+    shown = 0
+    for page in pages:
+        rows = [
+            (
+                item["target_name"],
+                item["target_id"],
+                f"{item['accuracy']}%",
+                item["completed_at"].split("T")[0],
+            )
+            for item in page
+        ]
+        print(format_table([("Target", "ID", "Accuracy", "Date")] + rows))
+        shown += len(page)
+        if len(page) < PAGE_SIZE or input(f"\nShowing {shown} — Enter for more, q to stop: ").strip().lower() == "q":
+            break
+        print()
+    if not shown:
         print("No sessions recorded yet. Complete a run to build history.\n")
+
+
+def show_target(target_id: str) -> None:
+    """Describe one target and page through the sessions recorded against it."""
+    target = get_catalog().get(target_id)
+    if target is None:
+        print(f"Unknown target {target_id}.\n")
         return
     rows = [
-        (
-            item["target_name"],
-            item["target_id"],
-            f"{item['accuracy']}%",
-            item["completed_at"].split("T")[0],
-        )
-        for item in sessions
+        ("Name", target.name),
+        ("ID", target.target_id),
+        ("Category", target.category.title()),
+        ("Difficulty", target.difficulty.title()),
+        ("Elements", ", ".join(target.correct_elements)),
+        ("Description", target.description),
     ]
-    print(format_table([("Target", "ID", "Accuracy", "Date")] + rows))
+    print(format_table(rows) + "\n")
+    _history(target_id)
 
 
-def run() -> None:
-    actions = [
-        MenuItem("Start training session", _start_session),
-        MenuItem("List available targets", _list_targets),
-        MenuItem("Review history", _history),
+def _summary() -> None:
+    summary = summarize(STORAGE)
+    if not summary.sessions:
+        print("No sessions recorded yet. Complete a run to build history.\n")
+        return
+    print(
+        format_table(
+            [
+                ("Sessions", str(summary.sessions)),
+                ("Mean accuracy", f"{summary.mean_accuracy}%"),
+                ("Best accuracy", f"{summary.best}%"),
+                ("Current streak", f"{summary.streak} day(s)"),
+            ]
+        )
+        + "\n"
+    )
+    rows = [
+        (stats.target_name, stats.target_id, str(stats.sessions), f"{stats.mean_accuracy}%", f"{stats.best}%")
+        for stats in summary.targets
     ]
-    menu = Menu("Remote Viewing Training", actions)
-    menu.show()
+    print(format_table([("Target", "ID", "Sessions", "Mean", "Best")] + rows) + "\n")
+    rows = [(day.day, str(day.sessions), f"{day.mean_accuracy}%") for day in summary.recent_days]
+    print(format_table([("Day", "Sessions", "Mean")] + rows) + "\n")
+
+
+ACTIONS: tuple[tuple[str, SelectionHandler], ...] = (
+    ("Start training session", _start_session),
+    ("List available targets", _list_targets),
+    ("Review history", _history),
+    ("History summary", _summary),
+)
+
+
+def run(action: str | None = None) -> None:
+    menu = Menu("Remote Viewing Training", [MenuItem(label, handler) for label, handler in ACTIONS])
+    menu.show(action)
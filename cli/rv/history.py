@@ -0,0 +1,441 @@
+"""Remote viewing history storage helpers."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import date
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+from ..data.user import DEMO_USER
+from ..utils.io import ensure_directory, file_lock, iter_json_array, read_json_array
+from .journal import SessionJournal, ShardedJournal
+
+STORAGE = Path.home() / ".shadowops" / "cli"
+HISTORY_FILE = "rv-history.json"
+JOURNAL_FILE = "rv-history.jsonl"
+SHARD_DIR = "rv-history.d"
+STORE_ENV = "SHADOWOPS_RV_STORE"
+OPERATOR_ENV = "SHADOWOPS_OPERATOR"
+RECENT_DAYS = 30
+MIGRATE_BATCH = 1000
+
+# Parsed shard per path: (inode, parsed offset, sessions in file order,
+# session_id -> position, sessions ordered by completion time).
+_CACHE: dict[Path, tuple[int, int, list[dict[str, Any]], dict[str, int], list[dict[str, Any]]]] = {}
+# Merged sessions per shard directory, keyed by the shard states they came from.
+_MERGED: dict[Path, tuple[tuple[tuple[Path, int, int], ...], list[dict[str, Any]]]] = {}
+_CACHE_LOCK = threading.Lock()
+_JOURNALS: dict[Path, ShardedJournal] = {}
+_STORES: dict[Path, Any] = {}
+
+
+@dataclass(frozen=True)
+class TargetStats:
+    target_id: str
+    target_name: str
+    sessions: int
+    accuracy_sum: float
+    best: float
+
+    @property
+    def mean_accuracy(self) -> float:
+        return round(self.accuracy_sum / self.sessions, 2) if self.sessions else 0.0
+
+
+@dataclass(frozen=True)
+class DailyStats:
+    day: str
+    sessions: int
+    accuracy_sum: float
+
+    @property
+    def mean_accuracy(self) -> float:
+        return round(self.accuracy_sum / self.sessions, 2) if self.sessions else 0.0
+
+
+@dataclass(frozen=True)
+class HistorySummary:
+    sessions: int
+    accuracy_sum: float
+    targets: list[TargetStats]
+    recent_days: list[DailyStats]  # newest first
+    streak: int  # consecutive training days ending with the most recent one, over all history
+
+    @property
+    def mean_accuracy(self) -> float:
+        return round(self.accuracy_sum / self.sessions, 2) if self.sessions else 0.0
+
+    @property
+    def best(self) -> float:
+        return max((target.best for target in self.targets), default=0.0)
+
+
+def count_streak(days: Iterable[str]) -> int:
+    """Length of the run of consecutive days at the start of ``days``.
+
+    ``days`` are distinct ISO dates, newest first; iteration stops at the
+    first gap.
+    """
+    streak = 0
+    previous: Optional[date] = None
+    for day in days:
+        current = date.fromisoformat(day)
+        if previous is not None and (previous - current).days != 1:
+            break
+        streak += 1
+        previous = current
+    return streak
+
+
+def legacy_session_id(item: dict[str, Any]) -> str:
+    digest = hashlib.sha1(json.dumps(item, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"legacy-{digest[:20]}"
+
+
+def current_operator() -> str:
+    """Operator whose shard new sessions are written to."""
+    return os.environ.get(OPERATOR_ENV, "").strip() or DEMO_USER.id
+
+
+def migrate_legacy(storage: Path, journal: ShardedJournal) -> int:
+    """Move pre-sharding history into the default operator's shard.
+
+    Handles both the whole-file ``rv-history.json`` and the single
+    ``rv-history.jsonl`` journal; each is renamed to ``*.migrated`` afterwards.
+    """
+
+    migrated = 0
+    with file_lock(ensure_directory(storage) / ".rv-migrate.lock"):
+        resumed = journal.shard().path.exists()
+        legacy = storage / HISTORY_FILE
+        if legacy.exists():
+            # Streamed in batches: legacy files can be far larger than memory allows.
+            sessions = iter_json_array(legacy, "sessions")
+            while True:
+                batch = [{"session_id": legacy_session_id(item), **item} for item in islice(sessions, MIGRATE_BATCH)]
+                if not batch:
+                    break
+                migrated += journal.append_many(batch)
+            legacy.replace(legacy.with_name(HISTORY_FILE + ".migrated"))
+        single = storage / JOURNAL_FILE
+        if single.exists():
+            records, _, _ = SessionJournal(single).read_from(0)
+            migrated += journal.append_many(records)
+            single.replace(single.with_name(JOURNAL_FILE + ".migrated"))
+    if migrated and resumed:
+        journal.compact()  # drop duplicates from an interrupted earlier migration
+    return migrated
+
+
+def legacy_pending(storage: Path = STORAGE) -> bool:
+    """Whether pre-sharding history is still waiting to be migrated."""
+    return (storage / HISTORY_FILE).exists() or (storage / JOURNAL_FILE).exists()
+
+
+def _sharded(storage: Path) -> ShardedJournal:
+    directory = storage / SHARD_DIR
+    with _CACHE_LOCK:
+        journal = _JOURNALS.get(directory)
+        if journal is None:
+            journal = _JOURNALS[directory] = ShardedJournal(directory, current_operator())
+    return journal
+
+
+def open_journal(storage: Path = STORAGE) -> ShardedJournal:
+    """Return the sharded session journal for ``storage``, migrating legacy history first."""
+    journal = _sharded(storage)
+    if legacy_pending(storage):
+        migrate_legacy(storage, journal)
+    return journal
+
+
+def migrate_in_background(storage: Path = STORAGE) -> threading.Thread:
+    """Run the legacy migration on a daemon thread.
+
+    An interrupted migration is resumed, and its duplicates compacted away,
+    the next time the journal is opened.
+    """
+
+    thread = threading.Thread(target=open_journal, args=(storage,), name="rv-migrate", daemon=True)
+    thread.start()
+    return thread
+
+
+def _completed(record: dict[str, Any]) -> str:
+    return record.get("completed_at", "")
+
+
+def _load_shard(journal: SessionJournal) -> tuple[tuple[Path, int, int], list[dict[str, Any]]]:
+    """Parse one shard, reading only what was appended since the last call.
+
+    Returns the shard's sessions ordered by completion time. Shards are in
+    append order, and rescoring or scripted batches append old timestamps, so
+    the ordered view is re-sorted whenever an append breaks it.
+    """
+
+    path = journal.path
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _CACHE.pop(path, None)
+        return (path, 0, 0), []
+    with _CACHE_LOCK:
+        cached = _CACHE.get(path)
+        if cached is not None and cached[0] == stat.st_ino and cached[1] <= stat.st_size:
+            _, offset, sessions, positions, ordered = cached
+            if offset == stat.st_size:
+                return (path, stat.st_ino, offset), ordered
+        else:
+            offset, sessions, positions = 0, [], {}
+            ordered = sessions
+        records, offset, damaged = journal.read_from(offset)
+        previous = _completed(ordered[-1]) if ordered else ""
+        superseded = 0
+        added: list[dict[str, Any]] = []
+        for record in records:
+            session_id = record.get("session_id")
+            if session_id is not None and session_id in positions:
+                sessions[positions[session_id]] = record
+                superseded += 1
+                continue
+            if session_id is not None:
+                positions[session_id] = len(sessions)
+            sessions.append(record)
+            added.append(record)
+        in_order = True
+        for record in added:
+            if _completed(record) < previous:
+                in_order = False
+                break
+            previous = _completed(record)
+        if superseded or not in_order:
+            ordered = sorted(sessions, key=_completed)
+        elif ordered is not sessions:
+            ordered.extend(added)
+        _CACHE[path] = (stat.st_ino, offset, sessions, positions, ordered)
+    if damaged or superseded:
+        journal.compact_in_background()
+    return (path, stat.st_ino, offset), ordered
+
+
+def load_sessions(storage: Path = STORAGE) -> list[dict[str, Any]]:
+    """Return every recorded session across operator shards, oldest first.
+
+    Shards are parsed incrementally, each ordered by completion time, and
+    merged only when one of them has changed since the last call. A session that appears in
+    more than one shard keeps the version from the later shard.
+    """
+
+    journal = open_journal(storage)
+    loaded = [_load_shard(shard) for shard in journal.journals()]
+    signature = tuple(state for state, _ in loaded)
+    with _CACHE_LOCK:
+        merged = _MERGED.get(journal.directory)
+        if merged is not None and merged[0] == signature:
+            return merged[1]
+    sessions: list[dict[str, Any]] = []
+    if len(loaded) == 1:
+        sessions = loaded[0][1]
+    elif loaded:
+        positions: dict[str, int] = {}
+        for record in heapq.merge(*(items for _, items in loaded), key=_completed):
+            session_id = record.get("session_id")
+            if session_id is not None and session_id in positions:
+                sessions[positions[session_id]] = record
+                continue
+            if session_id is not None:
+                positions[session_id] = len(sessions)
+            sessions.append(record)
+    with _CACHE_LOCK:
+        _MERGED[journal.directory] = (signature, sessions)
+    return sessions
+
+
+def _legacy_records(handle: TextIO) -> Iterator[tuple[int, dict[str, Any]]]:
+    with handle:
+        for index, item in enumerate(read_json_array(handle, "sessions")):
+            yield index, {"session_id": legacy_session_id(item), **item}
+
+
+def _keyed(records: Iterable[tuple[int, dict[str, Any]]], rank: int) -> Iterator[tuple[str, tuple[int, int], dict[str, Any]]]:
+    for offset, record in records:
+        yield _completed(record), (rank, offset), record
+
+
+def _latest_versions(merged: Iterable[tuple[str, tuple[int, int], dict[str, Any]]]) -> Iterator[dict[str, Any]]:
+    """Drop superseded copies of a session from a merged stream.
+
+    Every version of a session keeps its completion time, so copies always
+    meet within one run of equal keys; the one from the later source, or
+    further into the same source, wins.
+    """
+
+    run: list[tuple[tuple[int, int], dict[str, Any]]] = []
+    run_key: Optional[str] = None
+    for key, order, record in merged:
+        if key != run_key:
+            yield from _run_winners(run)
+            run, run_key = [], key
+        run.append((order, record))
+    yield from _run_winners(run)
+
+
+def _run_winners(run: list[tuple[tuple[int, int], dict[str, Any]]]) -> Iterator[dict[str, Any]]:
+    if len(run) == 1:
+        yield run[0][1]
+        return
+    winners: dict[str, tuple[int, int]] = {}
+    for order, record in run:
+        session_id = record.get("session_id")
+        if session_id is not None and order > winners.get(session_id, (-1, -1)):
+            winners[session_id] = order
+    for order, record in run:
+        session_id = record.get("session_id")
+        if session_id is None or winners[session_id] == order:
+            yield record
+
+
+def stream_sessions(storage: Path = STORAGE, *, newest_first: bool = False) -> Iterator[dict[str, Any]]:
+    """Stream every session across shards oldest first, or ``newest_first``.
+
+    Unlike :func:`load_sessions` nothing is loaded up front: every source is
+    opened before this returns and then read lazily, one line (or one legacy
+    array element) at a time, and merged by completion time. A shard marked
+    unsorted is compacted first. Legacy history that is not migrated yet is
+    read in place and in file order, which only works oldest first.
+    """
+
+    journal = _sharded(storage)
+    sources: list[Iterator[tuple[int, dict[str, Any]]]] = []
+    if legacy_pending(storage):
+        if newest_first:
+            raise ValueError("legacy history can only be streamed oldest first until it is migrated")
+        try:
+            legacy = (storage / HISTORY_FILE).open("r", encoding="utf-8")
+        except FileNotFoundError:
+            pass  # migrated meanwhile; the shards opened below hold it
+        else:
+            sources.append(_legacy_records(legacy))
+        sources.append(SessionJournal(storage / JOURNAL_FILE).records())
+    for shard in journal.journals():
+        if shard.unsorted:
+            shard.compact()
+        sources.append(shard.records(reverse=newest_first))
+    keyed = [_keyed(records, rank) for rank, records in enumerate(sources)]
+    return _latest_versions(heapq.merge(*keyed, key=itemgetter(0), reverse=newest_first))
+
+
+def using_sqlite() -> bool:
+    return os.environ.get(STORE_ENV, "journal").strip().lower() == "sqlite"
+
+
+def open_store(storage: Path = STORAGE) -> Any:
+    """Return the configured session store: the journal, or SQLite when
+    ``SHADOWOPS_RV_STORE=sqlite``. A new SQLite store imports the journal."""
+
+    if not using_sqlite():
+        return open_journal(storage)
+    path = storage / SHARD_DIR
+    with _CACHE_LOCK:
+        store = _STORES.get(path)
+    if store is None:
+        from .sqlite_store import open_sqlite_store
+
+        def journal_records() -> Iterator[dict[str, Any]]:
+            for item in stream_sessions(storage):
+                yield item if "session_id" in item else {"session_id": legacy_session_id(item), **item}
+
+        store = open_sqlite_store(storage, journal_records())
+        with _CACHE_LOCK:
+            store = _STORES.setdefault(path, store)
+    return store
+
+
+def summarize_sessions(sessions: list[dict[str, Any]], *, recent_days: int = RECENT_DAYS) -> HistorySummary:
+    targets: dict[str, list[Any]] = {}
+    days: dict[str, list[Any]] = {}
+    total = 0.0
+    for item in sessions:
+        accuracy = float(item["accuracy"])
+        total += accuracy
+        target = targets.setdefault(item["target_id"], [item["target_name"], 0, 0.0, 0.0])
+        target[1] += 1
+        target[2] += accuracy
+        target[3] = max(target[3], accuracy)
+        day = days.setdefault(item["completed_at"][:10], [0, 0.0])
+        day[0] += 1
+        day[1] += accuracy
+    ordered = sorted(days, reverse=True)
+    return HistorySummary(
+        sessions=len(sessions),
+        accuracy_sum=total,
+        targets=sorted(
+            (TargetStats(target_id, *values) for target_id, values in targets.items()),
+            key=lambda stats: (-stats.sessions, stats.target_id),
+        ),
+        recent_days=[DailyStats(day, *days[day]) for day in ordered[:recent_days]],
+        streak=count_streak(ordered),
+    )
+
+
+def summarize(storage: Path = STORAGE) -> HistorySummary:
+    """Summary statistics; served from maintained aggregates with the SQLite store."""
+    if using_sqlite():
+        return open_store(storage).summary(recent_days=RECENT_DAYS)
+    return summarize_sessions(load_sessions(storage))
+
+
+def iter_pages(storage: Path = STORAGE, page_size: int = 20, *, target_id: Optional[str] = None) -> Iterator[list[dict[str, Any]]]:
+    """Yield pages of sessions, newest first.
+
+    While legacy history is still pending (see :func:`legacy_pending`) pages
+    come oldest first straight from the legacy files and the migration runs
+    in the background, so the first page never waits for it.
+    """
+
+    if using_sqlite():
+        store = open_store(storage)
+        before = None
+        while True:
+            page = store.page(page_size, before=before, target_id=target_id)
+            if not page:
+                return
+            yield page
+            before = (page[-1]["completed_at"], page[-1]["session_id"])
+    pending = legacy_pending(storage)
+    sessions = stream_sessions(storage, newest_first=not pending)
+    if pending:
+        migrate_in_background(storage)
+    if target_id is not None:
+        sessions = (item for item in sessions if item.get("target_id") == target_id)
+    while True:
+        page = list(islice(sessions, page_size))
+        if not page:
+            return
+        yield page
+
+
+def iter_sessions(
+    storage: Path = STORAGE,
+    *,
+    since: str | None = None,
+    target_id: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield stored sessions oldest first, optionally completed at or after ``since`` (ISO 8601)."""
+    if using_sqlite():
+        yield from open_store(storage).iter_sessions(since=since, target_id=target_id)
+        return
+    for item in stream_sessions(storage):
+        if since and item["completed_at"] < since:
+            continue
+        if target_id and item["target_id"] != target_id:
+            continue
+        yield item
@@ -0,0 +1,312 @@
+"""Append-only JSON Lines journal for remote viewing session history."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Mapping, Optional
+
+from ..utils.io import ensure_directory, file_lock
+
+FSYNC_ENV = "SHADOWOPS_RV_FSYNC"
+SHARD_SUFFIX = ".jsonl"
+READ_BLOCK = 1 << 16  # bytes per read when streaming a journal backwards
+
+
+def _fsync_default() -> bool:
+    return os.environ.get(FSYNC_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+class SessionJournal:
+    """One JSON object per line, only ever appended to.
+
+    Appends are a single ``O_APPEND`` write of whole lines, optionally followed by
+    ``fsync``, so a crash can at worst leave one torn trailing line. Readers skip
+    lines that do not parse and the next append starts on a fresh line.
+    :meth:`compact` rewrites the journal without damaged lines, keeps only the
+    latest record per ``session_id`` and orders records by ``completed_at``.
+    An append that breaks that order creates ``<journal>.unsorted`` until the
+    next compaction, so readers that stream in order know to compact first.
+    Appends and the swap-in of a compacted file hold an advisory lock on
+    ``<journal>.lock`` so several processes can share one journal.
+    """
+
+    def __init__(self, path: Path, *, fsync: Optional[bool] = None) -> None:
+        self.path = path
+        self.lock_path = path.with_name(path.name + ".lock")
+        self.unsorted_path = path.with_name(path.name + ".unsorted")
+        self.fsync = _fsync_default() if fsync is None else fsync
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        self.append_many([record])
+
+    @property
+    def unsorted(self) -> bool:
+        return self.unsorted_path.exists()
+
+    def append_many(self, records: Iterable[Mapping[str, Any]]) -> int:
+        records = list(records)
+        payload = b"".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n" for record in records
+        )
+        if not payload:
+            return 0
+        keys = [record.get("completed_at", "") for record in records]
+        in_order = all(older <= newer for older, newer in zip(keys, keys[1:]))
+        with self._lock, file_lock(self.lock_path):
+            fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b"\n":
+                    payload = b"\n" + payload  # isolate a torn line left by a crash
+                if in_order and size and not self.unsorted:
+                    last = _last_completed(fd, size)
+                    in_order = last is not None and last <= keys[0]
+                if not in_order:
+                    self.unsorted_path.touch()
+                view = memoryview(payload)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+                if self.fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+        return payload.count(b"\n")
+
+    def read_from(self, offset: int = 0) -> tuple[list[dict[str, Any]], int, int]:
+        """Parse complete lines from ``offset``.
+
+        Returns ``(records, next_offset, damaged)`` where ``next_offset`` points
+        just past the last complete line, so callers can resume incrementally.
+        """
+
+        records: list[dict[str, Any]] = []
+        damaged = 0
+        try:
+            handle = self.path.open("rb")
+        except FileNotFoundError:
+            return records, 0, 0
+        with handle:
+            handle.seek(offset)
+            position = offset
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break  # torn or still being written; resume here next time
+                position += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    damaged += 1
+        return records, position, damaged
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self.read_from(0)[0])
+
+    def records(self, *, reverse: bool = False) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Stream ``(offset, record)`` for the complete lines, last first with ``reverse``.
+
+        The file is opened before this returns and read only up to its current
+        size, so later appends and a compacted file swapped in are not seen.
+        Damaged lines are skipped; only one read block is held in memory.
+        """
+
+        try:
+            handle = self.path.open("rb")
+        except FileNotFoundError:
+            return iter(())
+        size = os.fstat(handle.fileno()).st_size
+        return _parse_lines(handle, _lines_reversed(handle, size) if reverse else _lines(handle, size))
+
+    def compact(self) -> int:
+        """Rewrite the journal atomically; return the number of records kept."""
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return 0
+        # Appends from here on are either in ``records`` or re-mark the journal.
+        was_unsorted = self.unsorted
+        self.unsorted_path.unlink(missing_ok=True)
+        records, offset, _ = self.read_from(0)
+        latest: dict[str, int] = {}
+        kept: list[dict[str, Any]] = []
+        for record in records:
+            session_id = record.get("session_id")
+            if session_id is not None and session_id in latest:
+                kept[latest[session_id]] = record
+                continue
+            if session_id is not None:
+                latest[session_id] = len(kept)
+            kept.append(record)
+        kept.sort(key=lambda record: record.get("completed_at", ""))
+        fd, tmp = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".compact", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for record in kept:
+                    handle.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+                with self._lock, file_lock(self.lock_path):
+                    if os.stat(self.path).st_ino != inode:
+                        if was_unsorted:
+                            self.unsorted_path.touch()  # not ours to clear
+                        return 0  # another process compacted first; its result stands
+                    # Carry over anything appended while we were rewriting.
+                    with self.path.open("rb") as source:
+                        source.seek(offset)
+                        tail = source.read()
+                    if tail and not tail.endswith(b"\n"):
+                        tail = tail[: tail.rfind(b"\n") + 1]
+                    if tail and not _follows(kept, tail):
+                        self.unsorted_path.touch()
+                    handle.write(tail)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    os.chmod(tmp, 0o644)
+                    os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        return len(kept) + tail.count(b"\n")
+
+    def compact_in_background(self) -> threading.Thread:
+        """Run :meth:`compact` on a daemon thread unless one is already running."""
+        if self._compactor is not None and self._compactor.is_alive():
+            return self._compactor
+        self._compactor = threading.Thread(target=self.compact, name="rv-journal-compact", daemon=True)
+        self._compactor.start()
+        return self._compactor
+
+
+def _last_completed(fd: int, size: int) -> Optional[str]:
+    """``completed_at`` of the last complete line, or None if it is not cheap to tell."""
+    start = max(0, size - READ_BLOCK)
+    tail = os.pread(fd, size - start, start)
+    end = tail.rfind(b"\n")
+    begin = tail.rfind(b"\n", 0, max(end, 0)) + 1
+    if end < 0 or (begin == 0 and start):
+        return None
+    try:
+        return json.loads(tail[begin:end]).get("completed_at", "")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _follows(kept: list[dict[str, Any]], tail: bytes) -> bool:
+    """Whether the lines in ``tail`` keep completion order after ``kept``."""
+    previous = kept[-1].get("completed_at", "") if kept else ""
+    for line in tail.splitlines():
+        try:
+            key = json.loads(line).get("completed_at", "")
+        except (ValueError, AttributeError):
+            continue
+        if key < previous:
+            return False
+        previous = key
+    return True
+
+
+def _lines(handle: BinaryIO, size: int) -> Iterator[tuple[int, bytes]]:
+    position = 0
+    for line in handle:
+        if position + len(line) > size or not line.endswith(b"\n"):
+            return  # appended after the snapshot, or torn
+        yield position, line
+        position += len(line)
+
+
+def _lines_reversed(handle: BinaryIO, size: int) -> Iterator[tuple[int, bytes]]:
+    position, pending, tail = size, b"", True
+    while position > 0:
+        start = max(0, position - READ_BLOCK)
+        handle.seek(start)
+        data = handle.read(position - start) + pending
+        position = start
+        parts = data.split(b"\n")
+        if tail:
+            if len(parts) == 1:
+                continue  # still inside a torn trailing line
+            parts.pop()  # whatever follows the last newline
+            tail = False
+        # The first part may continue in the block before this one.
+        pending = parts.pop(0) if start else b""
+        offset = start + len(pending) + 1 if start else 0
+        starts = []
+        for part in parts:
+            starts.append(offset)
+            offset += len(part) + 1
+        yield from zip(reversed(starts), reversed(parts))
+
+
+def _parse_lines(handle: BinaryIO, lines: Iterator[tuple[int, bytes]]) -> Iterator[tuple[int, dict[str, Any]]]:
+    with handle:
+        for offset, line in lines:
+            if not line.strip():
+                continue
+            try:
+                yield offset, json.loads(line)
+            except ValueError:
+                continue
+
+
+def shard_name(operator: str) -> str:
+    """File-system safe shard file name for ``operator``."""
+    if not isinstance(operator, str):
+        raise TypeError(f"operator must be a string, not {type(operator).__name__}")
+    return (re.sub(r"[^A-Za-z0-9._-]", "_", operator).strip(".") or "_") + SHARD_SUFFIX
+
+
+class ShardedJournal:
+    """Session journals sharded per operator under one directory.
+
+    Each operator appends to its own shard, so terminals recording for
+    different operators never contend, and writers sharing an operator are
+    serialised by the shard's lock. Records without an ``operator`` go to the
+    default operator's shard.
+    """
+
+    def __init__(self, directory: Path, default_operator: str) -> None:
+        self.directory = directory
+        self.default_operator = default_operator
+        self._shards: dict[str, SessionJournal] = {}
+        self._lock = threading.Lock()
+
+    def shard(self, operator: Optional[str] = None) -> SessionJournal:
+        name = shard_name(operator or self.default_operator)
+        with self._lock:
+            journal = self._shards.get(name)
+            if journal is None:
+                journal = self._shards[name] = SessionJournal(self.directory / name)
+        return journal
+
+    def journals(self) -> list[SessionJournal]:
+        """Existing shards ordered by file name."""
+        if not self.directory.is_dir():
+            return []
+        names = sorted(entry.name for entry in os.scandir(self.directory) if entry.name.endswith(SHARD_SUFFIX))
+        with self._lock:
+            return [self._shards.setdefault(name, SessionJournal(self.directory / name)) for name in names]
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Mapping[str, Any]]) -> int:
+        groups: dict[Optional[str], list[Mapping[str, Any]]] = {}
+        for record in records:
+            operator = record.get("operator")
+            if operator is not None and not isinstance(operator, str):
+                # Checked before anything is written so a bad record cannot leave a batch half stored.
+                raise TypeError(f"operator must be a string, not {type(operator).__name__}")
+            groups.setdefault(operator, []).append(record)
+        if groups:
+            ensure_directory(self.directory)
+        return sum(self.shard(operator).append_many(batch) for operator, batch in groups.items())
+
+    def compact(self) -> int:
+        return sum(journal.compact() for journal in self.journals())
@@ -0,0 +1,186 @@
+"""Bulk re-scoring of stored remote viewing sessions.
+
+Stored ``matches`` and ``accuracy`` go stale whenever the scorer or a target's
+element list changes. :func:`rescore` streams every stored session through
+the current scorer in a process pool and writes changed results back through
+the configured store. Each record carries the ``score_key`` it was scored
+under, so sessions already scored by the current rules are skipped and
+identical perceptions are only scored once per run.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from ..data.rv_targets import get_catalog
+from .history import STORAGE, iter_sessions, open_store
+from .scoring import SCORER_VERSION, score_key, scorer_for
+
+BUCKETS = 10
+
+
+@dataclass
+class AccuracyDistribution:
+    buckets: list[int] = field(default_factory=lambda: [0] * BUCKETS)
+    count: int = 0
+    total: float = 0.0
+
+    def add(self, accuracy: float) -> None:
+        self.buckets[min(int(accuracy // (100 / BUCKETS)), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += accuracy
+
+    @property
+    def mean(self) -> float:
+        return round(self.total / self.count, 2) if self.count else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        width = 100 // BUCKETS
+        return {
+            "sessions": self.count,
+            "mean": self.mean,
+            "histogram": {f"{low}-{low + width}": count for low, count in zip(range(0, 100, width), self.buckets)},
+        }
+
+
+@dataclass
+class RescoreReport:
+    scorer_version: int = SCORER_VERSION
+    sessions: int = 0
+    scored: int = 0
+    memo_hits: int = 0
+    current: int = 0
+    changed: int = 0
+    written: int = 0
+    unknown_targets: int = 0
+    seconds: float = 0.0
+    before: AccuracyDistribution = field(default_factory=AccuracyDistribution)
+    after: AccuracyDistribution = field(default_factory=AccuracyDistribution)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "scorer_version": self.scorer_version,
+            "sessions": self.sessions,
+            "scored": self.scored,
+            "memo_hits": self.memo_hits,
+            "current": self.current,
+            "changed": self.changed,
+            "written": self.written,
+            "unknown_targets": self.unknown_targets,
+            "seconds": round(self.seconds, 3),
+            "before": self.before.as_dict(),
+            "after": self.after.as_dict(),
+        }
+
+
+def _score_batch(batch: list[tuple[str, str, dict[str, list[str]]]]) -> list[tuple[str, list[str], float]]:
+    """Worker entry point: score ``(key, target_id, perceptions)`` items."""
+    catalog = get_catalog()  # loaded and compiled once per worker process
+    results = []
+    for key, target_id, perceptions in batch:
+        target = catalog.by_id[target_id]
+        results.append((key, *scorer_for(target).score(target, perceptions)))
+    return results
+
+
+def rescore(
+    storage: Path = STORAGE,
+    *,
+    workers: Optional[int] = None,
+    batch_size: int = 2000,
+    force: bool = False,
+    dry_run: bool = False,
+) -> RescoreReport:
+    """Re-score every stored session and write back those whose result moved.
+
+    Sessions whose ``score_key`` matches the current rules are counted as
+    current and skipped unless ``force`` is set. With ``workers`` above one
+    (default: CPU count) scoring runs in a process pool with a bounded number
+    of batches in flight; otherwise it runs in this process.
+    """
+
+    started = time.perf_counter()
+    report = RescoreReport()
+    store = open_store(storage)
+    catalog = get_catalog()
+    memo: dict[str, tuple[list[str], float]] = {}
+    waiting: dict[str, list[dict[str, Any]]] = {}
+    updates: list[dict[str, Any]] = []
+    batch: list[tuple[str, str, dict[str, list[str]]]] = []
+    in_flight: deque[Future[list[tuple[str, list[str], float]]]] = deque()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def settle(record: dict[str, Any], key: str, matches: list[str], accuracy: float) -> None:
+        report.after.add(accuracy)
+        if matches != record.get("matches") or accuracy != record.get("accuracy"):
+            report.changed += 1
+        elif record.get("score_key") == key:
+            return
+        updates.append({**record, "matches": matches, "accuracy": accuracy, "score_key": key})
+        if len(updates) >= batch_size:
+            flush()
+
+    def flush() -> None:
+        if updates and not dry_run:
+            report.written += store.append_many(updates)
+        updates.clear()
+
+    def collect(results: list[tuple[str, list[str], float]]) -> None:
+        for key, matches, accuracy in results:
+            memo[key] = (matches, accuracy)
+            for record in waiting.pop(key):
+                settle(record, key, matches, accuracy)
+
+    def submit() -> None:
+        report.scored += len(batch)
+        if pool is None:
+            collect(_score_batch(batch))
+        else:
+            in_flight.append(pool.submit(_score_batch, list(batch)))
+            while len(in_flight) > workers * 2:
+                collect(in_flight.popleft().result())
+        batch.clear()
+
+    try:
+        for record in iter_sessions(storage):
+            report.sessions += 1
+            report.before.add(float(record["accuracy"]))
+            target = catalog.get(record["target_id"])
+            if target is None:
+                report.unknown_targets += 1
+                report.after.add(float(record["accuracy"]))
+                continue
+            key = score_key(target, record.get("perceptions", {}))
+            if key == record.get("score_key") and not force:
+                report.current += 1
+                report.after.add(float(record["accuracy"]))
+            elif key in memo:
+                report.memo_hits += 1
+                settle(record, key, *memo[key])
+            elif key in waiting:
+                report.memo_hits += 1
+                waiting[key].append(record)
+            else:
+                waiting[key] = [record]
+                batch.append((key, target.target_id, record.get("perceptions", {})))
+                if len(batch) >= batch_size:
+                    submit()
+        if batch:
+            submit()
+        while in_flight:
+            collect(in_flight.popleft().result())
+        flush()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    if report.written and hasattr(store, "compact"):
+        store.compact()  # the journal keeps only the rescored version of each session
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,105 @@
+"""Per-operator shuffle-bag target selection.
+
+Each operator draws from every target pool (a difficulty/category filter) in
+a random order without repeats until the pool is exhausted, then starts a new
+order. An order is the affine permutation ``k -> (a * k + b) mod n`` with
+``gcd(a, n) == 1``, so the saved state per pool is four integers regardless
+of catalog size and no history needs to be scanned.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from ..data.rv_targets import RemoteViewingTarget, TargetCatalog, get_catalog
+from ..utils.io import ensure_directory, file_lock, load_json
+from .history import STORAGE, current_operator
+
+SHUFFLE_FILE = "rv-shuffle.json"
+
+_LOCK = threading.Lock()
+
+
+@dataclass
+class BagState:
+    size: int
+    multiplier: int
+    offset: int
+    drawn: int = 0
+
+    @classmethod
+    def shuffled(cls, size: int, rng: random.Random, avoid: Optional[int] = None) -> "BagState":
+        multiplier = 1
+        if size > 2:
+            multiplier = rng.randrange(1, size)
+            while math.gcd(multiplier, size) != 1:
+                multiplier = rng.randrange(1, size)
+        offset = rng.randrange(size)
+        if avoid is not None and size > 1 and offset == avoid:
+            offset = (offset + 1 + rng.randrange(size - 1)) % size  # never repeat across a reshuffle
+        return cls(size, multiplier, offset)
+
+    def position(self, index: int) -> int:
+        return (self.multiplier * index + self.offset) % self.size
+
+
+def _pool_key(difficulty: Optional[str], category: Optional[str]) -> str:
+    return f"{difficulty or '*'}/{category or '*'}"
+
+
+class ShuffleBag:
+    """No-repeat sampler for one operator, persisted under ``storage``."""
+
+    def __init__(
+        self, operator: Optional[str] = None, storage: Path = STORAGE, *, rng: Optional[random.Random] = None
+    ) -> None:
+        self.operator = operator or current_operator()
+        self.path = storage / SHUFFLE_FILE
+        self.rng = rng or random.Random()
+
+    def draw(
+        self,
+        catalog: Optional[TargetCatalog] = None,
+        *,
+        difficulty: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> RemoteViewingTarget:
+        catalog = catalog or get_catalog()
+        positions = catalog.positions(difficulty=difficulty, category=category)
+        if not positions:
+            raise LookupError(f"No targets match difficulty={difficulty!r} category={category!r}")
+        key = _pool_key(difficulty, category)
+        with _LOCK, file_lock(ensure_directory(self.path.parent) / (SHUFFLE_FILE + ".lock")):
+            payload: dict[str, Any] = load_json(self.path, default={})
+            bags = payload.setdefault(self.operator, {})
+            raw = bags.get(key)
+            state = BagState(**raw) if raw else None
+            if state is None or state.size != len(positions):
+                state = BagState.shuffled(len(positions), self.rng)  # new or resized pool
+            elif state.drawn >= state.size:
+                state = BagState.shuffled(state.size, self.rng, avoid=state.position(state.size - 1))
+            chosen = positions[state.position(state.drawn)]
+            state.drawn += 1
+            bags[key] = asdict(state)
+            self._save(payload)
+        return catalog[chosen]
+
+    def _save(self, payload: dict[str, Any]) -> None:
+        ensure_directory(self.path.parent)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+        os.replace(tmp, self.path)
+
+
+def draw_target(
+    *, difficulty: Optional[str] = None, category: Optional[str] = None, operator: Optional[str] = None
+) -> RemoteViewingTarget:
+    return ShuffleBag(operator).draw(difficulty=difficulty, category=category)
@@ -0,0 +1,250 @@
+"""Scoring engine matching target elements anywhere in recorded perceptions.
+
+Perceptions and target elements are normalised the same way: tokenised,
+lightly stemmed and mapped through a synonym table. Every element of a target
+catalog is compiled once into a token-level Aho-Corasick automaton, so scoring
+a session is a single pass over its tokens no matter how many elements the
+catalog holds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, Mapping, Sequence
+
+from ..data.rv_targets import RemoteViewingTarget, get_catalog
+from ..profiling import traced
+
+# Bump whenever normalisation or matching changes so stored scores can be
+# recognised as stale.
+SCORER_VERSION = 3
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+_VOWEL = re.compile(r"[aeiouy]")
+# Never produced by the tokenizer; separates entries so phrases cannot match
+# across them.
+_BOUNDARY = ""
+
+
+def stem(token: str) -> str:
+    """Strip common English inflections; deliberately conservative.
+
+    A silent final "e" is dropped too, so base forms meet their inflections:
+
+    >>> [stem(word) for word in ("balance", "balanced", "balancing")]
+    ['balanc', 'balanc', 'balanc']
+    >>> [stem(word) for word in ("circle", "circled", "circles")]
+    ['circl', 'circl', 'circl']
+    >>> [stem(word) for word in ("base", "based", "house", "housing", "houses")]
+    ['bas', 'bas', 'hous', 'hous', 'hous']
+    >>> [stem(word) for word in ("speed", "bleed", "tree", "planned", "running", "added")]
+    ['speed', 'bleed', 'tree', 'plan', 'run', 'add']
+    """
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith(("sses", "xes", "ches", "shes")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+    for suffix in ("ing", "ed"):
+        root = token[: -len(suffix)]
+        if not token.endswith(suffix) or len(root) < 3 or not _VOWEL.search(root):
+            continue
+        if suffix == "ed" and root[-1] in "aeiou":
+            continue  # speed, bleed, freed: the "ed" is part of the word
+        if root[-1] == root[-2] and root[-1] not in "lsz" and len(root) > 3:
+            root = root[:-1]  # running -> run, planned -> plan
+        return root
+    if len(token) >= 4 and token.endswith("e") and not token.endswith("ee"):
+        token = token[:-1]  # balance -> balanc, as balanced and balancing
+    return token
+
+
+# Word -> canonical word, both stemmed when the table is built. Perceptions and
+# elements pass through it, so an entry widens what counts as a match for
+# every target.
+_SYNONYM_WORDS: dict[str, str] = {
+    "rock": "stone",
+    "boulder": "stone",
+    "granite": "stone",
+    "marble": "stone",
+    "sea": "water",
+    "ocean": "water",
+    "lake": "water",
+    "river": "water",
+    "wet": "water",
+    "high": "tall",
+    "round": "circle",
+    "ring": "circle",
+    "circular": "circle",
+    "old": "ancient",
+    "prehistoric": "ancient",
+    "meadow": "field",
+    "grass": "field",
+    "steel": "metal",
+    "iron": "metal",
+    "aluminum": "metal",
+    "aluminium": "metal",
+    "metallic": "metal",
+    "spacecraft": "station",
+    "satellite": "station",
+    "orbital": "orbit",
+    "cliffside": "cliff",
+    "isle": "island",
+    "crater": "caldera",
+    "memorial": "monument",
+    "equilibrium": "balance",
+    "glyph": "symbol",
+    "emblem": "symbol",
+    "home": "house",
+    "cottage": "house",
+    "cabin": "house",
+    "hut": "house",
+    "dwell": "house",
+    "residence": "house",
+}
+SYNONYMS: dict[str, str] = {stem(word): stem(canonical) for word, canonical in _SYNONYM_WORDS.items()}
+
+
+@lru_cache(maxsize=1 << 16)
+def normalize(token: str) -> str:
+    stemmed = stem(token.lower())
+    return SYNONYMS.get(stemmed, stemmed)
+
+
+def tokenize(text: str) -> list[str]:
+    return [normalize(token) for token in TOKEN_PATTERN.findall(text)]
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over token sequences.
+
+    States are integers; ``_goto[state]`` maps a token to the next state and
+    ``_output[state]`` lists every pattern ending there, including those
+    inherited through failure links.
+    """
+
+    __slots__ = ("_goto", "_fail", "_output")
+
+    def __init__(self, patterns: Sequence[Sequence[str]]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        output: list[list[int]] = [[]]
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for token in pattern:
+                following = goto[state].get(token)
+                if following is None:
+                    following = len(goto)
+                    goto[state][token] = following
+                    goto.append({})
+                    output.append([])
+                state = following
+            if state:
+                output[state].append(pattern_id)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and token not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(token, 0)
+                fail[following] = target if target != following else 0
+                output[following].extend(output[fail[following]])
+        self._goto = goto
+        self._fail = fail
+        self._output = [tuple(ids) for ids in output]
+
+    def scan(self, tokens: Iterable[str]) -> set[int]:
+        """Return the ids of every pattern occurring in ``tokens``."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: set[int] = set()
+        state = 0
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class ElementScorer:
+    """Scores perceptions against the elements of a compiled target catalog."""
+
+    __slots__ = ("_automaton", "_elements")
+
+    def __init__(self, targets: Iterable[RemoteViewingTarget]) -> None:
+        pattern_ids: dict[tuple[str, ...], int] = {}
+        elements: dict[str, tuple[tuple[str, int], ...]] = {}
+        for target in targets:
+            compiled = []
+            for element in target.correct_elements:
+                phrase = tuple(tokenize(element))
+                if phrase:
+                    compiled.append((element, pattern_ids.setdefault(phrase, len(pattern_ids))))
+            elements[target.target_id] = tuple(compiled)
+        self._automaton = PhraseAutomaton(list(pattern_ids))
+        self._elements = elements
+
+    def __contains__(self, target: RemoteViewingTarget) -> bool:
+        return target.target_id in self._elements
+
+    def matches(self, target: RemoteViewingTarget, lines: Iterable[str]) -> list[str]:
+        tokens: list[str] = []
+        for line in lines:
+            tokens += tokenize(line)
+            tokens.append(_BOUNDARY)
+        found = self._automaton.scan(tokens)
+        return sorted({element for element, pattern_id in self._elements[target.target_id] if pattern_id in found})
+
+    def score(self, target: RemoteViewingTarget, perceptions: Mapping[str, Iterable[str]]) -> tuple[list[str], float]:
+        matches = self.matches(target, (line for values in perceptions.values() for line in values))
+        accuracy = 0.0
+        if target.correct_elements:
+            accuracy = round(len(matches) / len(target.correct_elements) * 100, 2)
+        return matches, accuracy
+
+
+@lru_cache(maxsize=8)
+def compile_scorer(targets: Iterable[RemoteViewingTarget]) -> ElementScorer:
+    """Compile ``targets`` (a catalog or a tuple of targets) once."""
+    return ElementScorer(targets)
+
+
+def scorer_for(target: RemoteViewingTarget) -> ElementScorer:
+    scorer = compile_scorer(get_catalog())
+    if target in scorer:
+        return scorer
+    return compile_scorer((target,))
+
+
+@lru_cache(maxsize=256)
+def _target_digest(elements: tuple[str, ...]) -> bytes:
+    payload = json.dumps([SCORER_VERSION, sorted(elements)], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
+def score_key(target: RemoteViewingTarget, perceptions: Mapping[str, Iterable[str]]) -> str:
+    """Memo key for a score: scorer version, target elements and perceptions."""
+    digest = hashlib.blake2b(_target_digest(target.correct_elements), digest_size=16)
+    for stage in sorted(perceptions):
+        digest.update(b"\x1d" + stage.encode("utf-8"))
+        for line in perceptions[stage]:
+            digest.update(b"\x1e" + line.encode("utf-8"))
+    return f"{SCORER_VERSION}:{digest.hexdigest()}"
+
+
+@traced("score_perceptions")
+def score_perceptions(
+    target: RemoteViewingTarget, perceptions: Mapping[str, Iterable[str]]
+) -> tuple[list[str], float]:
+    return scorer_for(target).score(target, perceptions)
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import uuid
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from ..data.rv_targets import RemoteViewingTarget
-from ..utils.io import dump_json, ensure_directory, load_json, prompt_multiline
+from ..profiling import span, traced
+from ..utils.io import ensure_directory, prompt_multiline
+from .history import current_operator, open_store
+from .scoring import score_key, score_perceptions
 
 STAGES = (
     ("Stage 1 — Signal Line", "Capture immediate impressions without censoring."),
@@ -26,6 +30,10 @@ class SessionRecord:
     perceptions: Dict[str, List[str]]
     matches: List[str]
     accuracy: float
+    difficulty: Optional[str] = None
+    score_key: Optional[str] = None
+    operator: Optional[str] = None
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
 
 
 @dataclass
@@ -40,17 +48,13 @@ class RvSession:
         self.perceptions[stage_name].extend(responses)
 
     def score(self) -> tuple[list[str], float]:
-        noted = {token.strip().lower() for values in self.perceptions.values() for token in values}
-        matches = sorted({word for word in self.target.correct_elements if word.lower() in noted})
-        accuracy = 0.0
-        if self.target.correct_elements:
-            accuracy = round(len(matches) / len(self.target.correct_elements) * 100, 2)
-        return matches, accuracy
+        return score_perceptions(self.target, self.perceptions)
 
-    def complete(self, storage: Path) -> SessionRecord:
+    def finish(self, *, operator: Optional[str] = None, completed_at: Optional[datetime] = None) -> SessionRecord:
+        """Score the session and build its record without storing it."""
         matches, accuracy = self.score()
-        completed_at = datetime.utcnow()
-        record = SessionRecord(
+        completed_at = completed_at or datetime.utcnow()
+        return SessionRecord(
             target_id=self.target.target_id,
             target_name=self.target.name,
             started_at=self.started_at.isoformat(),
@@ -58,10 +62,15 @@ class RvSession:
             perceptions=self.perceptions,
             matches=matches,
             accuracy=accuracy,
+            difficulty=self.target.difficulty,
+            score_key=score_key(self.target, self.perceptions),
+            operator=operator or current_operator(),
         )
+
+    @traced("RvSession.complete")
+    def complete(self, storage: Path) -> SessionRecord:
+        record = self.finish()
         ensure_directory(storage)
-        history_path = storage / "rv-history.json"
-        history = load_json(history_path, default={"sessions": []})
-        history.setdefault("sessions", []).append(record.__dict__)
-        dump_json(history_path, history)
+        with span("rv.store.append", "io"):
+            open_store(storage).append(asdict(record))
         return record
@@ -0,0 +1,283 @@
+"""Optional SQLite store for remote viewing history.
+
+Sessions are indexed by target, completion date and difficulty. Triggers keep
+per-target, per-day and overall aggregates current on every write, so summary
+statistics never scan the session table.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from ..utils.io import ensure_directory
+from .history import DailyStats, HistorySummary, TargetStats, count_streak
+
+DATABASE_FILE = "rv-history.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    target_id TEXT NOT NULL,
+    target_name TEXT NOT NULL,
+    difficulty TEXT,
+    started_at TEXT NOT NULL,
+    completed_at TEXT NOT NULL,
+    day TEXT NOT NULL,
+    accuracy REAL NOT NULL,
+    matches TEXT NOT NULL,
+    perceptions TEXT NOT NULL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS sessions_completed ON sessions (completed_at);
+CREATE INDEX IF NOT EXISTS sessions_target ON sessions (target_id, completed_at);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions (day);
+CREATE INDEX IF NOT EXISTS sessions_difficulty ON sessions (difficulty, completed_at);
+
+CREATE TABLE IF NOT EXISTS target_stats (
+    target_id TEXT PRIMARY KEY,
+    target_name TEXT NOT NULL,
+    sessions INTEGER NOT NULL,
+    accuracy_sum REAL NOT NULL,
+    best REAL NOT NULL,
+    last_completed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT PRIMARY KEY,
+    sessions INTEGER NOT NULL,
+    accuracy_sum REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    sessions INTEGER NOT NULL,
+    accuracy_sum REAL NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, sessions, accuracy_sum) VALUES (1, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS sessions_insert AFTER INSERT ON sessions BEGIN
+    INSERT INTO target_stats (target_id, target_name, sessions, accuracy_sum, best, last_completed_at)
+    VALUES (NEW.target_id, NEW.target_name, 1, NEW.accuracy, NEW.accuracy, NEW.completed_at)
+    ON CONFLICT (target_id) DO UPDATE SET
+        target_name = excluded.target_name,
+        sessions = sessions + 1,
+        accuracy_sum = accuracy_sum + excluded.accuracy_sum,
+        best = max(best, excluded.best),
+        last_completed_at = max(last_completed_at, excluded.last_completed_at);
+    INSERT INTO daily_stats (day, sessions, accuracy_sum) VALUES (NEW.day, 1, NEW.accuracy)
+    ON CONFLICT (day) DO UPDATE SET sessions = sessions + 1, accuracy_sum = accuracy_sum + excluded.accuracy_sum;
+    UPDATE totals SET sessions = sessions + 1, accuracy_sum = accuracy_sum + NEW.accuracy WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS sessions_delete AFTER DELETE ON sessions BEGIN
+    UPDATE target_stats SET
+        sessions = sessions - 1,
+        accuracy_sum = accuracy_sum - OLD.accuracy,
+        best = (SELECT coalesce(max(accuracy), 0) FROM sessions WHERE target_id = OLD.target_id),
+        last_completed_at = (SELECT coalesce(max(completed_at), '') FROM sessions WHERE target_id = OLD.target_id)
+    WHERE target_id = OLD.target_id;
+    DELETE FROM target_stats WHERE target_id = OLD.target_id AND sessions <= 0;
+    UPDATE daily_stats SET sessions = sessions - 1, accuracy_sum = accuracy_sum - OLD.accuracy WHERE day = OLD.day;
+    DELETE FROM daily_stats WHERE day = OLD.day AND sessions <= 0;
+    UPDATE totals SET sessions = sessions - 1, accuracy_sum = accuracy_sum - OLD.accuracy WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS sessions_update AFTER UPDATE OF target_id, day, accuracy, completed_at ON sessions BEGIN
+    UPDATE target_stats SET
+        sessions = sessions - 1,
+        accuracy_sum = accuracy_sum - OLD.accuracy,
+        best = (SELECT coalesce(max(accuracy), 0) FROM sessions WHERE target_id = OLD.target_id),
+        last_completed_at = (SELECT coalesce(max(completed_at), '') FROM sessions WHERE target_id = OLD.target_id)
+    WHERE target_id = OLD.target_id;
+    DELETE FROM target_stats WHERE target_id = OLD.target_id AND sessions <= 0;
+    INSERT INTO target_stats (target_id, target_name, sessions, accuracy_sum, best, last_completed_at)
+    VALUES (NEW.target_id, NEW.target_name, 1, NEW.accuracy, NEW.accuracy, NEW.completed_at)
+    ON CONFLICT (target_id) DO UPDATE SET
+        target_name = excluded.target_name,
+        sessions = sessions + 1,
+        accuracy_sum = accuracy_sum + excluded.accuracy_sum,
+        best = max(best, excluded.best),
+        last_completed_at = max(last_completed_at, excluded.last_completed_at);
+    UPDATE daily_stats SET sessions = sessions - 1, accuracy_sum = accuracy_sum - OLD.accuracy WHERE day = OLD.day;
+    DELETE FROM daily_stats WHERE day = OLD.day AND sessions <= 0;
+    INSERT INTO daily_stats (day, sessions, accuracy_sum) VALUES (NEW.day, 1, NEW.accuracy)
+    ON CONFLICT (day) DO UPDATE SET sessions = sessions + 1, accuracy_sum = accuracy_sum + excluded.accuracy_sum;
+    UPDATE totals SET accuracy_sum = accuracy_sum - OLD.accuracy + NEW.accuracy WHERE id = 1;
+END;
+"""
+
+_COLUMNS = ("session_id", "target_id", "target_name", "difficulty", "started_at", "completed_at", "accuracy", "matches", "perceptions")
+
+_UPSERT = """
+INSERT INTO sessions (
+    session_id, target_id, target_name, difficulty, started_at, completed_at, day, accuracy, matches, perceptions, extra
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (session_id) DO UPDATE SET
+    target_id = excluded.target_id,
+    target_name = excluded.target_name,
+    difficulty = excluded.difficulty,
+    started_at = excluded.started_at,
+    completed_at = excluded.completed_at,
+    day = excluded.day,
+    accuracy = excluded.accuracy,
+    matches = excluded.matches,
+    perceptions = excluded.perceptions,
+    extra = excluded.extra
+"""
+
+
+def _row_for(record: Mapping[str, Any]) -> tuple[Any, ...]:
+    extra = {key: value for key, value in record.items() if key not in _COLUMNS}
+    return (
+        record["session_id"],
+        record["target_id"],
+        record["target_name"],
+        record.get("difficulty"),
+        record["started_at"],
+        record["completed_at"],
+        record["completed_at"][:10],
+        float(record["accuracy"]),
+        json.dumps(record.get("matches", []), ensure_ascii=False),
+        json.dumps(record.get("perceptions", {}), ensure_ascii=False),
+        json.dumps(extra, ensure_ascii=False),
+    )
+
+
+def _record_for(row: sqlite3.Row) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "session_id": row["session_id"],
+        "target_id": row["target_id"],
+        "target_name": row["target_name"],
+        "started_at": row["started_at"],
+        "completed_at": row["completed_at"],
+        "perceptions": json.loads(row["perceptions"]),
+        "matches": json.loads(row["matches"]),
+        "accuracy": row["accuracy"],
+    }
+    if row["difficulty"] is not None:
+        record["difficulty"] = row["difficulty"]
+    record.update(json.loads(row["extra"]))
+    return record
+
+
+class SqliteSessionStore:
+    """Session history in SQLite with write-time aggregates."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Mapping[str, Any]]) -> int:
+        rows = [_row_for(record) for record in records]
+        if not rows:
+            return 0
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(_UPSERT, rows)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        return len(rows)
+
+    def count(self, *, target_id: Optional[str] = None) -> int:
+        with self._lock:
+            if target_id is None:
+                row = self._connection.execute("SELECT sessions FROM totals WHERE id = 1").fetchone()
+            else:
+                row = self._connection.execute(
+                    "SELECT sessions FROM target_stats WHERE target_id = ?", (target_id,)
+                ).fetchone()
+        return int(row[0]) if row else 0
+
+    def page(
+        self,
+        limit: int,
+        *,
+        before: Optional[tuple[str, str]] = None,
+        target_id: Optional[str] = None,
+        difficulty: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """Return up to ``limit`` sessions, newest first.
+
+        ``before`` is the ``(completed_at, session_id)`` of the last row of the
+        previous page; pagination seeks through the index instead of skipping rows.
+        """
+
+        clauses: list[str] = []
+        params: list[Any] = []
+        if target_id is not None:
+            clauses.append("target_id = ?")
+            params.append(target_id)
+        if difficulty is not None:
+            clauses.append("difficulty = ?")
+            params.append(difficulty)
+        if before is not None:
+            clauses.append("(completed_at, session_id) < (?, ?)")
+            params.extend(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT * FROM sessions {where} ORDER BY completed_at DESC, session_id DESC LIMIT ?"
+        with self._lock:
+            rows = self._connection.execute(query, (*params, limit)).fetchall()
+        return [_record_for(row) for row in rows]
+
+    def iter_sessions(
+        self, *, since: Optional[str] = None, target_id: Optional[str] = None, batch: int = 500
+    ) -> Iterator[dict[str, Any]]:
+        """Yield sessions in completion order without loading them all at once."""
+        cursor: tuple[str, str] = (since or "", "")
+        while True:
+            query = "SELECT * FROM sessions WHERE (completed_at, session_id) > (?, ?)"
+            params: list[Any] = list(cursor)
+            if target_id is not None:
+                query += " AND target_id = ?"
+                params.append(target_id)
+            query += " ORDER BY completed_at, session_id LIMIT ?"
+            with self._lock:
+                rows = self._connection.execute(query, (*params, batch)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _record_for(row)
+            cursor = (rows[-1]["completed_at"], rows[-1]["session_id"])
+
+    def summary(self, *, recent_days: int = 14) -> HistorySummary:
+        with self._lock:
+            connection = self._connection
+            sessions, accuracy_sum = connection.execute("SELECT sessions, accuracy_sum FROM totals WHERE id = 1").fetchone()
+            targets = [
+                TargetStats(row["target_id"], row["target_name"], row["sessions"], row["accuracy_sum"], row["best"])
+                for row in connection.execute("SELECT * FROM target_stats ORDER BY sessions DESC, target_id")
+            ]
+            days = [
+                DailyStats(row["day"], row["sessions"], row["accuracy_sum"])
+                for row in connection.execute("SELECT * FROM daily_stats ORDER BY day DESC LIMIT ?", (recent_days,))
+            ]
+            streak = count_streak(row["day"] for row in connection.execute("SELECT day FROM daily_stats ORDER BY day DESC"))
+        return HistorySummary(sessions=sessions, accuracy_sum=accuracy_sum, targets=targets, recent_days=days, streak=streak)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def open_sqlite_store(storage: Path, records: Optional[Iterable[Mapping[str, Any]]] = None) -> SqliteSessionStore:
+    """Open the store under ``storage``, importing ``records`` when it is new."""
+    path = ensure_directory(storage) / DATABASE_FILE
+    fresh = not path.exists()
+    store = SqliteSessionStore(path)
+    if fresh and records is not None:
+        store.append_many(records)
+    return store
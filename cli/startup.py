@@ -0,0 +1,105 @@
+"""Startup-time budget for the interactive entry point.
+
+:func:`measure` starts fresh interpreters that import the entry point and
+build the top-level menu, then reports median timings and any subsystem
+module that was imported eagerly. ``shadowops startup`` exits non-zero when
+a budget is exceeded so it can gate CI.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+MENU_BUDGET_MS = 150.0  # import of the entry point through a built menu
+PROCESS_BUDGET_MS = 400.0  # interpreter start to menu, as seen by the shell
+# Subsystems that must only be imported once their menu entry is selected.
+LAZY_MODULES = (
+    "audio.lab",
+    "commands",
+    "daemon",
+    "palette",
+    "data.research_documents",
+    "data.rv_targets",
+    "research.archive",
+    "research.index",
+    "rv.cli",
+    "rv.history",
+)
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from {package}.main import build_menu
+imported = time.perf_counter()
+build_menu()
+ready = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "menu_ms": (ready - started) * 1000,
+    "modules": sorted(name for name in sys.modules if name == "{package}" or name.startswith("{package}.")),
+}}))
+"""
+
+
+@dataclass
+class StartupReport:
+    runs: int
+    import_ms: float
+    menu_ms: float
+    process_ms: float
+    menu_budget_ms: float
+    process_budget_ms: float
+    eager_modules: list[str] = field(default_factory=list)
+
+    @property
+    def within_budget(self) -> bool:
+        return self.menu_ms <= self.menu_budget_ms and self.process_ms <= self.process_budget_ms and not self.eager_modules
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "import_ms": round(self.import_ms, 2),
+            "menu_ms": round(self.menu_ms, 2),
+            "process_ms": round(self.process_ms, 2),
+            "menu_budget_ms": self.menu_budget_ms,
+            "process_budget_ms": self.process_budget_ms,
+            "eager_modules": self.eager_modules,
+            "within_budget": self.within_budget,
+        }
+
+
+def measure(
+    runs: int = 5,
+    *,
+    menu_budget_ms: float = MENU_BUDGET_MS,
+    process_budget_ms: float = PROCESS_BUDGET_MS,
+    python: Optional[str] = None,
+) -> StartupReport:
+    """Time ``runs`` cold starts and return their medians."""
+    package = __package__ or "cli"
+    probe = _PROBE.format(package=package)
+    samples: list[dict[str, Any]] = []
+    process: list[float] = []
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [python or sys.executable, "-c", probe], capture_output=True, text=True, check=True
+        )
+        process.append((time.perf_counter() - started) * 1000)
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    loaded = set().union(*(sample["modules"] for sample in samples))
+    return StartupReport(
+        runs=len(samples),
+        import_ms=statistics.median(sample["import_ms"] for sample in samples),
+        menu_ms=statistics.median(sample["menu_ms"] for sample in samples),
+        process_ms=statistics.median(process),
+        menu_budget_ms=menu_budget_ms,
+        process_budget_ms=process_budget_ms,
+        eager_modules=sorted(f"{package}.{name}" for name in LAZY_MODULES if f"{package}.{name}" in loaded),
+    )
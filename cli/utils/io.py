@@ -3,8 +3,16 @@
 from __future__ import annotations
 
 import json
+import os
+import re
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Optional, TextIO
+
+try:  # pragma: no cover - not available on Windows
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
 
 
 def prompt_multiline(prompt: str) -> list[str]:
@@ -31,6 +39,140 @@ def load_json(path: Path, default: Any) -> Any:
         return json.load(handle)
 
 
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+# Longest token a decode error can point into while the token is merely cut off
+# by the end of the buffer ("-Infinity", or a "\uXXXX" escape).
+_TRUNCATED_TOKEN = 9
+
+
+class _JsonStream:
+    """Read buffer over a text handle that decodes one JSON value at a time."""
+
+    def __init__(self, handle: TextIO, chunk_size: int) -> None:
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        pending = len(self.buffer) - self.position
+        # Grow reads with the pending value so oversized values parse in
+        # linear rather than quadratic time.
+        chunk = self.handle.read(max(self.chunk_size, pending))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()  # type: ignore[union-attr]
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found or 'end of file'!r}")
+        self.position += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError as exc:
+                # Read on only if the value may just be cut off by the buffer;
+                # anything else is malformed and fails without reading further.
+                truncated = exc.pos >= len(self.buffer) - _TRUNCATED_TOKEN or exc.msg.startswith("Unterminated string")
+                if truncated and self.fill():
+                    continue
+                raise
+            if (
+                isinstance(value, (int, float))
+                and (end == len(self.buffer) or self.buffer[end] in _NUMBER_CHARS)
+                and self.fill()
+            ):
+                continue  # the number may continue past the buffer
+            self.position = end
+            return value
+
+
+def iter_json_array(path: Path, key: Optional[str] = None, *, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """Yield the elements of a JSON array one at a time.
+
+    The array is the top-level value, or with ``key`` the value of that member
+    of a top-level object; other members are decoded and discarded. Only a
+    read buffer and the current element are held in memory.
+    """
+
+    with path.open("r", encoding="utf-8") as handle:
+        yield from read_json_array(handle, key, chunk_size=chunk_size)
+
+
+def read_json_array(handle: TextIO, key: Optional[str] = None, *, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """:func:`iter_json_array` over an already open text handle, which is left open.
+
+    Opening the file up front lets a caller keep reading it even if the path
+    is renamed before the first element is pulled.
+    """
+
+    stream = _JsonStream(handle, chunk_size)
+    if key is not None:
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            name = stream.value()
+            stream.expect(":")
+            if name == key:
+                break
+            stream.value()
+            if stream.peek() != ",":
+                stream.expect("}")
+                return
+            stream.position += 1
+    stream.expect("[")
+    if stream.peek() == "]":
+        return
+    while True:
+        yield stream.value()
+        if stream.peek() != ",":
+            stream.expect("]")
+            return
+        stream.position += 1
+
+
 def dump_json(path: Path, payload: Any) -> None:
     with path.open("w", encoding="utf-8") as handle:
         json.dump(payload, handle, indent=2)
+
+
+@contextmanager
+def file_lock(path: Path, *, shared: bool = False) -> Iterator[None]:
+    """Hold an advisory ``flock`` on ``path`` (created if missing) for the block.
+
+    Lock a sidecar file rather than data that gets replaced atomically, since a
+    lock belongs to the inode it was taken on. Without ``fcntl`` the block runs
+    unlocked.
+    """
+
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # closing the descriptor releases the lock
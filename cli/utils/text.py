@@ -7,6 +7,8 @@ import textwrap
 from pathlib import Path
 from typing import Iterable, List
 
+from ..profiling import traced
+
 DEFAULT_WIDTH = 88
 
 
@@ -24,10 +26,14 @@ def wrap_paragraphs(text: str, width: int | None = None) -> str:
     return "\n\n".join(paragraphs)
 
 
+@traced("render_markdown")
 def render_markdown(path: Path) -> str:
     """Convert a very small subset of Markdown to wrapped plain text."""
-    width = get_terminal_width()
-    lines = path.read_text(encoding="utf-8").splitlines()
+    return render_markdown_lines(path.read_text(encoding="utf-8").splitlines())
+
+
+def render_markdown_lines(lines: Iterable[str], width: int | None = None) -> str:
+    width = width or get_terminal_width()
     rendered: List[str] = []
     for line in lines:
         stripped = line.strip()
@@ -0,0 +1,286 @@
+"""Background warm-up of subsystem state while the main menu is shown.
+
+Set ``SHADOWOPS_WARMUP=1`` to start it with the interactive menu. Tasks run
+on a small pool of daemon threads in priority order. Selecting a menu entry
+moves that subsystem's pending tasks to the front and waits briefly for its
+essential ones; while it has some outstanding, cancellable work for other
+subsystems is interrupted and queued again behind everything else. Audio
+pre-rendering is CPU bound, so each render runs in a low-priority child
+process that is terminated when the render is cancelled.
+Leaving the interactive menu cancels what is left and prints a timing report.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+WARMUP_ENV = "SHADOWOPS_WARMUP"
+FOCUS_TIMEOUT = 1.0  # after this the subsystem loads whatever is still missing itself
+RENDER_NICENESS = 10
+RENDER_POLL = 0.1
+
+
+def warmup_enabled() -> bool:
+    return os.environ.get(WARMUP_ENV, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+class Cancelled(Exception):
+    """Raised by a task that noticed its cancel event."""
+
+
+@dataclass
+class WarmupTask:
+    name: str
+    group: str  # navigation key of the subsystem the task prepares
+    priority: int
+    run: Callable[[threading.Event], Any]
+    essential: bool = True  # awaited when the subsystem is selected
+    status: str = "pending"
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+    cancel: threading.Event = field(default_factory=threading.Event)
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class Warmup:
+    """Priority-ordered task pool with per-subsystem focus and cancellation."""
+
+    def __init__(self, tasks: list[WarmupTask], *, workers: Optional[int] = None) -> None:
+        self.tasks = tasks
+        self.workers = workers or min(4, (os.cpu_count() or 1) + 1)
+        self._heap: list[tuple[int, int, WarmupTask]] = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._threads: list[threading.Thread] = []
+        self.started_at = 0.0
+
+    def start(self) -> "Warmup":
+        self.started_at = time.perf_counter()
+        with self._condition:
+            for task in self.tasks:
+                self._push(task, task.priority)
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"warmup-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def _push(self, task: WarmupTask, priority: int) -> None:
+        task.status = "pending"
+        task.cancel.clear()
+        heapq.heappush(self._heap, (priority, next(self._order), task))
+        self._condition.notify()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not self._heap and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                _, _, task = heapq.heappop(self._heap)
+                if task.status != "pending":
+                    continue  # a stale heap entry left behind by a promotion
+                task.status = "running"
+                task.started_at = time.perf_counter()
+                task.attempts += 1
+            try:
+                task.run(task.cancel)
+            except Cancelled:
+                outcome, error = "cancelled", None
+            except Exception as exc:  # warm-up is best effort
+                outcome, error = "failed", f"{type(exc).__name__}: {exc}"
+            else:
+                outcome, error = "done", None
+            with self._condition:
+                task.finished_at = time.perf_counter()
+                task.error = error
+                if outcome == "cancelled" and not self._stopped:
+                    self._push(task, task.priority + 100)  # resume after everything else
+                    continue
+                task.status = outcome
+                task.done.set()
+
+    def focus(self, group: str, *, timeout: float = FOCUS_TIMEOUT) -> None:
+        """Prioritise ``group`` and wait for its essential tasks to finish.
+
+        Cancellable tasks of other subsystems are interrupted only while
+        ``group`` still has essential work outstanding.
+        """
+        with self._condition:
+            waiting = False
+            for task in self.tasks:
+                if task.group == group and task.status == "pending":
+                    self._push(task, -1)
+                waiting = waiting or (task.group == group and task.essential and not task.done.is_set())
+            if waiting:  # make room by interrupting other subsystems' cancellable work
+                for task in self.tasks:
+                    if task.group != group and task.status == "running" and not task.essential:
+                        task.cancel.set()
+        deadline = time.perf_counter() + timeout
+        for task in self.tasks:
+            if task.group == group and task.essential:
+                task.done.wait(max(0.0, deadline - time.perf_counter()))
+
+    def cancel(self) -> None:
+        """Stop picking up tasks and interrupt cancellable running ones."""
+        with self._condition:
+            self._stopped = True
+            for task in self.tasks:
+                if task.status == "pending":
+                    task.status = "cancelled"
+                    task.done.set()
+                elif task.status == "running":
+                    task.cancel.set()
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for task in self.tasks:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not task.done.wait(remaining):
+                return False
+        return True
+
+    def report(self) -> list[dict[str, Any]]:
+        rows = []
+        for task in sorted(self.tasks, key=lambda item: (item.started_at or float("inf"), item.priority)):
+            ran = task.finished_at - task.started_at if task.finished_at and task.status != "running" else None
+            rows.append(
+                {
+                    "task": task.name,
+                    "group": task.group,
+                    "status": task.status,
+                    "start_ms": round((task.started_at - self.started_at) * 1000, 1) if task.started_at else None,
+                    "run_ms": round(ran * 1000, 1) if ran is not None else None,
+                    "attempts": task.attempts,
+                    "error": task.error,
+                }
+            )
+        return rows
+
+    def format_report(self) -> str:
+        from .utils.text import format_table
+
+        def ms(value: Optional[float]) -> str:
+            return "—" if value is None else f"{value:.1f}"
+
+        rows = [
+            (row["task"], row["group"], row["status"], ms(row["start_ms"]), ms(row["run_ms"])) for row in self.report()
+        ]
+        return "Warm-up timings (ms)\n" + format_table([("Task", "Subsystem", "Status", "Start", "Run")] + rows)
+
+
+def _content(cancel: threading.Event) -> None:
+    from .content import content_catalog, load_markdown_document
+
+    content_catalog()
+    load_markdown_document("ops-manual")
+
+
+def _archive(cancel: threading.Event) -> None:
+    from .research import archive  # noqa: F401 - import cost is part of the warm-up
+    from .research.index import get_index
+
+    get_index()
+
+
+def _related(cancel: threading.Event) -> None:
+    from .research.related import get_related_index
+
+    get_related_index()
+
+
+def _targets(cancel: threading.Event) -> None:
+    from .data.rv_targets import get_catalog
+    from .rv import cli  # noqa: F401
+    from .rv.scoring import compile_scorer
+
+    compile_scorer(get_catalog())
+
+
+def _history(cancel: threading.Event) -> None:
+    from .rv.history import load_sessions, open_store, using_sqlite
+
+    if using_sqlite():
+        open_store()
+    else:
+        load_sessions()
+
+
+def _palette(cancel: threading.Event) -> None:
+    from .palette import get_palette
+
+    get_palette()
+
+
+def _audio(cancel: threading.Event) -> None:
+    from .audio import lab  # noqa: F401
+
+
+def _prerender(name: str) -> None:
+    """Child process body: render one preset into the tone cache at low priority."""
+    from .audio.lab import prerender_preset
+    from .audio.presets import iter_presets
+
+    try:
+        os.nice(RENDER_NICENESS)
+    except (AttributeError, OSError):  # not available on every platform
+        pass
+    prerender_preset(next(preset for preset in iter_presets() if preset.name == name))
+
+
+def _preset(name: str) -> Callable[[threading.Event], None]:
+    def run(cancel: threading.Event) -> None:
+        from .audio.generators import cache_directory
+
+        process = multiprocessing.get_context("spawn").Process(
+            target=_prerender, args=(name,), name=f"render {name}", daemon=True
+        )
+        process.start()
+        while process.is_alive():
+            process.join(RENDER_POLL)
+            if cancel.is_set() and process.is_alive():
+                process.terminate()
+                process.join()
+                for partial in cache_directory().glob(f"*.{process.pid}.*.tmp"):
+                    partial.unlink(missing_ok=True)
+                raise Cancelled()
+        if process.exitcode:
+            raise RuntimeError(f"render process exited with status {process.exitcode}")
+
+    return run
+
+
+def default_tasks() -> list[WarmupTask]:
+    """Warm-up tasks keyed by the navigation entry each one prepares."""
+    from .audio.presets import iter_presets
+
+    tasks = [
+        WarmupTask("content catalog", "operations", 0, _content),
+        WarmupTask("archive index", "archive", 1, _archive),
+        WarmupTask("target catalog", "rv", 1, _targets),
+        WarmupTask("audio lab", "audio", 1, _audio),
+        WarmupTask("related documents", "archive", 2, _related),
+        WarmupTask("session history", "rv", 2, _history),
+        WarmupTask("command palette", "palette", 3, _palette),
+    ]
+    tasks.extend(
+        WarmupTask(f"render {preset.name}", "audio", 5, _preset(preset.name), essential=False)
+        for preset in iter_presets()
+    )
+    return tasks
+
+
+def start_warmup(*, workers: Optional[int] = None) -> Warmup:
+    return Warmup(default_tasks(), workers=workers).start()